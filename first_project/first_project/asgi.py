@@ -2,6 +2,7 @@
 ASGI config for first_project project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
+Serve it with an ASGI server to enable the live dashboard stream at /api/events/.
 
 For more information on this file, see
 https://docs.djangoproject.com/en/5.1/howto/deployment/asgi/
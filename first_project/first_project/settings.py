@@ -20,6 +20,10 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    # First, so its timings cover the rest of the stack.
+    'payments.middleware.RequestMetricsMiddleware',
+    # Before anything that reads the body; the request metrics above then see the encoded size.
+    'payments.middleware.CompressionMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -35,8 +39,15 @@ TEMPLATES = [
     {
         'BACKEND': 'django.template.backends.django.DjangoTemplates',
         'DIRS': [os.path.join(BASE_DIR, 'templates')],
-        'APP_DIRS': True,
         'OPTIONS': {
+            # Compile each template once per process and keep it in memory. In DEBUG the development server
+            # clears these when a template changes.
+            'loaders': [
+                ('django.template.loaders.cached.Loader', [
+                    'django.template.loaders.filesystem.Loader',
+                    'django.template.loaders.app_directories.Loader',
+                ]),
+            ],
             'context_processors': [
                 'django.template.context_processors.debug',
                 'django.template.context_processors.request',
@@ -48,11 +59,19 @@ TEMPLATES = [
 ]
 
 WSGI_APPLICATION = 'first_project.wsgi.application'
+# The live dashboard stream (/api/events/) is only served by the ASGI application.
+ASGI_APPLICATION = 'first_project.asgi.application'
 
 DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        # Workbook imports write from several threads; take the write lock up front and wait for it
+        # instead of failing with "database is locked".
+        'OPTIONS': {
+            'transaction_mode': 'IMMEDIATE',
+            'timeout': 20,
+        },
     }
 }
 
@@ -80,6 +99,18 @@ USE_I18N = True
 USE_TZ = True
 
 STATIC_URL = '/static/'
+STATIC_ROOT = BASE_DIR / 'staticfiles'
+
+# collectstatic writes content-hashed copies of every static file (plus .gz/.br siblings) to STATIC_ROOT,
+# so the web server can serve STATIC_URL with far-future cache headers.
+STORAGES = {
+    'default': {
+        'BACKEND': 'django.core.files.storage.FileSystemStorage',
+    },
+    'staticfiles': {
+        'BACKEND': 'payments.storage.CompressedManifestStaticFilesStorage',
+    },
+}
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
@@ -88,3 +119,58 @@ MEDIA_ROOT = BASE_DIR / 'media'
 
 LOGIN_URL = 'login'
 LOGIN_REDIRECT_URL = 'dashboard'
+
+# Excel imports run in a background worker: 'thread' uses an in-process pool, 'command' leaves jobs
+# queued for `manage.py process_import_jobs`.
+PAYMENTS_IMPORT_WORKER = 'thread'
+PAYMENTS_IMPORT_THREADS = 1
+PAYMENTS_IMPORT_CHUNK_SIZE = 5000
+# Sheets of a multi-sheet workbook that may load at the same time.
+PAYMENTS_IMPORT_SHEET_WORKERS = 4
+
+# Table versions and cached API responses. LocMemCache evicts the least recently used entries beyond
+# MAX_ENTRIES but is private to one process; with several worker processes use a shared backend such as
+# 'django.core.cache.backends.filebased.FileBasedCache' so every worker sees the same table versions.
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'payments',
+        'OPTIONS': {'MAX_ENTRIES': 1000},
+    },
+    # Rendered {% cache %} fragments of payments/base.html (sidebar and static page chrome). Kept apart so
+    # they never push API responses out of the default cache; per process, so a restart after a deploy
+    # starts from fresh static URLs.
+    'template_fragments': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'template-fragments',
+        'OPTIONS': {'MAX_ENTRIES': 1000},
+    },
+}
+PAYMENTS_RESPONSE_CACHE = 'default'
+PAYMENTS_RESPONSE_CACHE_TIMEOUT = 300
+
+# Seconds between checks of the shared lookup-table versions (see payments/lookups.py). Versions live in
+# the default cache, so processes only see each other's changes when that cache is shared.
+PAYMENTS_LOOKUP_CHECK_SECONDS = 5
+
+# Live dashboard events: seconds between keepalive comments, and how long to gather changes before
+# pushing recomputed totals (0 pushes them immediately).
+PAYMENTS_EVENTS_KEEPALIVE = 15
+PAYMENTS_EVENTS_TOTALS_DELAY = 1.0
+
+# Evaluate the independent sub-queries of the async detail APIs on separate connections so they overlap.
+# Off means they run one after another on the async ORM's shared thread.
+PAYMENTS_PARALLEL_QUERIES = True
+
+# Per-request query counts and timings (Server-Timing header and /api/metrics/requests/), and how many
+# recent requests each process keeps.
+PAYMENTS_REQUEST_METRICS = True
+PAYMENTS_REQUEST_LOG_SIZE = 500
+
+# HTML, JSON and CSV responses at least this large are compressed when the client accepts it: HTML only with
+# gzip (GZipMiddleware's BREACH padding), the API payloads with Brotli or gzip.
+PAYMENTS_COMPRESSION_MIN_SIZE = 1024
+
+# Bearer token Prometheus sends to scrape /metrics (staff sessions can always read it). For several worker
+# processes also set the PROMETHEUS_MULTIPROC_DIR environment variable, see payments/metrics.py.
+PAYMENTS_METRICS_TOKEN = os.environ.get('PAYMENTS_METRICS_TOKEN')
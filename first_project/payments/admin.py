@@ -1,5 +1,5 @@
 from django.contrib import admin
-from django.urls import path
+from django.urls import path, reverse
 from django.shortcuts import render, redirect
 from django.http import JsonResponse
 from django.contrib.auth.decorators import user_passes_test
@@ -8,9 +8,11 @@ from django.contrib.auth import views as auth_views
 from .models import (
     Person, BankAccount, PaymentMethod, PaymentType, Status,
     PaymentCategory, Payment, Student, Teacher, Olympiad, Course, Product,
-    StudentAgreement, TeacherAgreement, PaymentAgreement, Installment, InstallmentStatus, PaymentFile
+    StudentAgreement, TeacherAgreement, PaymentAgreement, Installment, InstallmentStatus, PaymentFile, ImportJob
 )
-import pandas as pd
+from .jobs import enqueue
+from .readers import SUPPORTED_EXTENSIONS, WORKBOOK_EXTENSIONS
+from .workbook import WORKBOOK
 
 
 def staff_or_superuser_required(view_func):
@@ -43,6 +45,11 @@ def custom_admin_logout(request):
 
 class ExcelUploadAdmin(admin.ModelAdmin):
     change_list_template = "admin/excel_upload_changelist.html"
+    allowed_extensions = SUPPORTED_EXTENSIONS
+    supports_dry_run = True
+
+    def import_target(self):
+        return self.model.__name__.lower()
 
     def get_urls(self):
         urls = super().get_urls()
@@ -61,232 +68,29 @@ class ExcelUploadAdmin(admin.ModelAdmin):
         if request.method == 'POST' and request.headers.get('x-requested-with') == 'XMLHttpRequest':
             excel_file = request.FILES.get('file')
             if excel_file:
-                try:
-                    df = pd.read_excel(excel_file)
-                    if df.empty:
-                        return JsonResponse({'success': False, 'message': 'The Excel file is empty.'})
-                    model = self.model
-                    self.process_excel_data(df, model)
-                    return JsonResponse(
-                        {'success': True, 'message': 'Excel file uploaded and data processed successfully!'})
-                except Exception as e:
-                    return JsonResponse({'success': False, 'message': f'Error processing Excel file: {e}'})
+                if not excel_file.name.lower().endswith(self.allowed_extensions):
+                    return JsonResponse({
+                        'success': False,
+                        'message': f"Unsupported file type. Upload one of: {', '.join(self.allowed_extensions)}",
+                    })
+                dry_run = self.supports_dry_run and bool(request.POST.get('dry_run'))
+                job = ImportJob.objects.create(model_name=self.import_target(), file=excel_file, dry_run=dry_run)
+                enqueue(job)
+                return JsonResponse({
+                    'success': True,
+                    'message': 'Excel file uploaded. The file is being validated in the background.' if dry_run
+                    else 'Excel file uploaded. The import is running in the background.',
+                    'job_id': job.id,
+                    'status_url': reverse('api_import_job', args=[job.id]),
+                })
             else:
                 return JsonResponse({'success': False, 'message': 'No file uploaded.'})
         else:
-            return render(request, 'admin/upload_excel.html', {'model_name': self.model.__name__.lower()})
-
-    def process_excel_data(self, df, model):
-        for index, row in df.iterrows():
-            if row.isnull().all():
-                continue
-            if model == Person:
-                self.process_person(row)
-            elif model == BankAccount:
-                self.process_bank_account(row)
-            elif model == PaymentMethod:
-                self.process_payment_method(row)
-            elif model == PaymentType:
-                self.process_payment_type(row)
-            elif model == Status:
-                self.process_status(row)
-            elif model == PaymentCategory:
-                self.process_payment_category(row)
-            elif model == Payment:
-                self.process_payment(row)
-            elif model == Student:
-                self.process_student(row)
-            elif model == Teacher:
-                self.process_teacher(row)
-            elif model == Olympiad:
-                self.process_olympiad(row)
-            elif model == Product:
-                self.process_product(row)
-            elif model == Course:
-                self.process_course(row)
-            elif model == StudentAgreement:
-                self.process_student_agreement(row)
-            elif model == TeacherAgreement:
-                self.process_teacher_agreement(row)
-            elif model == PaymentAgreement:
-                self.process_payment_agreement(row)
-            elif model == Installment:
-                self.process_installment(row)
-            elif model == InstallmentStatus:
-                self.process_installment_status(row)
-            elif model == PaymentFile:
-                self.process_payment_file(row)
-
-    def process_person(self, row):
-        person_name = row['person_name'] if pd.notna(row['person_name']) else None
-        person_national_id = row['person_national_id'] if pd.notna(row['person_national_id']) else None
-        if person_name and person_national_id:
-            Person.objects.get_or_create(name=person_name, national_id=person_national_id)
-
-    def process_bank_account(self, row):
-        bank_name = row['bank_name'] if pd.notna(row['bank_name']) else None
-        bank_number = row['bank_number'] if pd.notna(row['bank_number']) else None
-        bank_description = row['bank_description'] if pd.notna(row['bank_description']) else None
-        if bank_name and bank_number:
-            BankAccount.objects.get_or_create(name=bank_name, bank_number=bank_number,
-                                              defaults={'description': bank_description})
-
-    def process_payment_method(self, row):
-        title = row['title'] if pd.notna(row['title']) else None
-        description = row['description'] if pd.notna(row['description']) else None
-        if title:
-            PaymentMethod.objects.get_or_create(title=title, defaults={'description': description})
-
-    def process_payment_type(self, row):
-        title = row['title'] if pd.notna(row['title']) else None
-        description = row['description'] if pd.notna(row['description']) else None
-        if title:
-            PaymentType.objects.get_or_create(title=title, defaults={'description': description})
-
-    def process_status(self, row):
-        title = row['title'] if pd.notna(row['title']) else None
-        description = row['description'] if pd.notna(row['description']) else None
-        if title:
-            Status.objects.get_or_create(title=title, defaults={'description': description})
-
-    def process_payment_category(self, row):
-        name = row['name'] if pd.notna(row['name']) else None
-        type = row['type'] if pd.notna(row['type']) else None
-        if name:
-            PaymentCategory.objects.get_or_create(name=name, defaults={'type': type})
-
-    def process_payment(self, row):
-        name = row['name'] if pd.notna(row['name']) else None
-        amount = row['amount'] if pd.notna(row['amount']) else None
-        related_person = Person.objects.filter(id=row['related_person']).first() if pd.notna(
-            row['related_person']) else None
-        payment_method = PaymentMethod.objects.filter(id=row['payment_method']).first() if pd.notna(
-            row['payment_method']) else None
-        status = Status.objects.filter(id=row['status']).first() if pd.notna(row['status']) else None
-        category = PaymentCategory.objects.filter(id=row['category']).first() if pd.notna(row['category']) else None
-        payment_type = PaymentType.objects.filter(id=row['payment_type']).first() if pd.notna(
-            row['payment_type']) else None
-        related_bank_account = BankAccount.objects.filter(id=row['related_bank_account']).first() if pd.notna(
-            row['related_bank_account']) else None
-
-        if not payment_type:
-            raise ValueError(f"Payment type is missing or invalid for payment: {name}")
-
-        if name and amount:
-            Payment.objects.get_or_create(
-                name=name,
-                amount=amount,
-                related_person=related_person,
-                payment_method=payment_method,
-                status=status,
-                category=category,
-                payment_type=payment_type,
-                related_bank_account=related_bank_account
-            )
-
-    def process_student(self, row):
-        name = row['name'] if pd.notna(row['name']) else None
-        national_id = row['national_id'] if pd.notna(row['national_id']) else None
-        person = Person.objects.filter(id=row['person']).first() if pd.notna(row['person']) else None
-        if name and national_id and person:
-            Student.objects.get_or_create(name=name, national_id=national_id, person=person)
-
-    def process_teacher(self, row):
-        name = row['name'] if pd.notna(row['name']) else None
-        national_id = row['national_id'] if pd.notna(row['national_id']) else None
-        person = Person.objects.filter(id=row['person']).first() if pd.notna(row['person']) else None
-        if name and national_id and person:
-            Teacher.objects.get_or_create(name=name, national_id=national_id, person=person)
-
-    def process_olympiad(self, row):
-        title = row['title'] if pd.notna(row['title']) else None
-        if title:
-            Olympiad.objects.get_or_create(title=title)
-
-    def process_product(self, row):
-        title = row['title'] if pd.notna(row['title']) else None
-        description = row['description'] if pd.notna(row['description']) else None
-        amount = row['amount'] if pd.notna(row['amount']) else None
-        teacher = Teacher.objects.filter(id=row['teacher']).first() if pd.notna(row['teacher']) else None
-        if title and teacher:
-            Product.objects.get_or_create(title=title, teacher=teacher,
-                                          defaults={'description': description, 'amount': amount})
-
-    def process_course(self, row):
-        title = row['title'] if pd.notna(row['title']) else None
-        session_time = row['session_time'] if pd.notna(row['session_time']) else None
-        start_date = row['start_date'] if pd.notna(row['start_date']) else None
-        end_date = row['end_date'] if pd.notna(row['end_date']) else None
-        teacher = Teacher.objects.filter(id=row['teacher']).first() if pd.notna(row['teacher']) else None
-        olympiad = Olympiad.objects.filter(id=row['olympiad']).first() if pd.notna(row['olympiad']) else None
-        if title and teacher:
-            Course.objects.get_or_create(
-                title=title,
-                session_time=session_time,
-                start_date=start_date,
-                end_date=end_date,
-                teacher=teacher,
-                olympiad=olympiad
-            )
-
-    def process_student_agreement(self, row):
-        student = Student.objects.filter(id=row['student']).first() if pd.notna(row['student']) else None
-        course = Course.objects.filter(id=row['course']).first() if pd.notna(row['course']) else None
-        amount = row['amount'] if pd.notna(row['amount']) else None
-        attrs = row['attrs'] if pd.notna(row['attrs']) else None
-        if student and course:
-            StudentAgreement.objects.get_or_create(student=student, course=course,
-                                                   defaults={'amount': amount, 'attrs': attrs})
-
-    def process_teacher_agreement(self, row):
-        teacher = Teacher.objects.filter(id=row['teacher']).first() if pd.notna(row['teacher']) else None
-        product = Product.objects.filter(id=row['product']).first() if pd.notna(row['product']) else None
-        amount = row['amount'] if pd.notna(row['amount']) else None
-        attrs = row['attrs'] if pd.notna(row['attrs']) else None
-        if teacher and product:
-            TeacherAgreement.objects.get_or_create(teacher=teacher, product=product,
-                                                   defaults={'amount': amount, 'attrs': attrs})
-
-    def process_payment_agreement(self, row):
-        student_agreement = StudentAgreement.objects.filter(id=row['student_agreement']).first() if pd.notna(
-            row['student_agreement']) else None
-        teacher_agreement = TeacherAgreement.objects.filter(id=row['teacher_agreement']).first() if pd.notna(
-            row['teacher_agreement']) else None
-        payment_direction = row['payment_direction'] if pd.notna(row['payment_direction']) else 'in'
-        total_amount = row['total_amount'] if pd.notna(row['total_amount']) else None
-        if student_agreement or teacher_agreement:
-            PaymentAgreement.objects.get_or_create(
-                student_agreement=student_agreement,
-                teacher_agreement=teacher_agreement,
-                defaults={'payment_direction': payment_direction, 'total_amount': total_amount}
-            )
-
-    def process_installment(self, row):
-        payment_agreement = PaymentAgreement.objects.filter(id=row['payment_agreement']).first() if pd.notna(
-            row['payment_agreement']) else None
-        amount = row['amount'] if pd.notna(row['amount']) else None
-        due_date = row['due_date'] if pd.notna(row['due_date']) else None
-        received_date = row['received_date'] if pd.notna(row['received_date']) else None
-        status = InstallmentStatus.objects.filter(id=row['status']).first() if pd.notna(row['status']) else None
-        if payment_agreement and amount and due_date:
-            Installment.objects.get_or_create(
-                payment_agreement=payment_agreement,
-                amount=amount,
-                due_date=due_date,
-                defaults={'received_date': received_date, 'status': status}
-            )
-
-    def process_installment_status(self, row):
-        title = row['title'] if pd.notna(row['title']) else None
-        if title:
-            InstallmentStatus.objects.get_or_create(title=title)
-
-    def process_payment_file(self, row):
-        payment = Payment.objects.filter(id=row['payment']).first() if pd.notna(row['payment']) else None
-        file = row['file'] if pd.notna(row['file']) else None
-        if payment and file:
-            PaymentFile.objects.get_or_create(payment=payment, file=file)
-
+            return render(request, 'admin/upload_excel.html', {
+                'model_name': self.model.__name__.lower(),
+                'accept': ','.join(self.allowed_extensions),
+                'supports_dry_run': self.supports_dry_run,
+            })
 
 @admin.register(Person)
 class PersonAdmin(ExcelUploadAdmin):
@@ -330,6 +134,8 @@ class PaymentAdmin(ExcelUploadAdmin):
     list_filter = ['payment_type', 'status', 'category', 'payment_method']
     search_fields = ['name', 'related_person__name', 'related_bank_account__name']
     autocomplete_fields = ['related_person', 'related_bank_account', 'payment_method', 'payment_type', 'status']
+    # Filtered pages would otherwise also count the whole table.
+    show_full_result_count = False
 
 
 @admin.register(PaymentFile)
@@ -400,6 +206,28 @@ class InstallmentAdmin(ExcelUploadAdmin):
     search_fields = ['payment_agreement__id']
     list_filter = ['status', 'due_date']
     autocomplete_fields = ['payment_agreement']
+    show_full_result_count = False
+
+
+@admin.register(ImportJob)
+class ImportJobAdmin(ExcelUploadAdmin):
+    """Uploading here imports a whole workbook, one sheet per model, in foreign key order."""
+    allowed_extensions = WORKBOOK_EXTENSIONS
+    # Sheets reference rows created by earlier sheets, so they cannot be validated without loading them.
+    supports_dry_run = False
+
+    def import_target(self):
+        return WORKBOOK
+
+    list_display = ['id', 'model_name', 'dry_run', 'status', 'rows_processed', 'rows_failed', 'created_at',
+                    'finished_at']
+    list_filter = ['status', 'dry_run', 'model_name']
+    readonly_fields = ['model_name', 'file', 'dry_run', 'rows_processed', 'rows_created', 'rows_skipped',
+                       'rows_failed', 'errors', 'message', 'created_at', 'started_at', 'finished_at']
+
+    def has_add_permission(self, request):
+        # Jobs only run when the upload view enqueues them; a row added through the form would stay queued.
+        return False
 
 
 @admin.register(InstallmentStatus)
@@ -0,0 +1,80 @@
+from django.db.models import Count, Q, Sum
+from django.db.models.functions import TruncDay, TruncMonth, TruncWeek, TruncYear
+
+INCOMING = 'incoming'
+OUTGOING = 'outgoing'
+
+SCALES = {
+    'day': TruncDay,
+    'week': TruncWeek,
+    'month': TruncMonth,
+    'year': TruncYear,
+}
+
+
+def direction_sums(prefix=''):
+    """Sum of incoming, outgoing and other amounts, for use in ``aggregate``/``annotate``.
+
+    ``prefix`` is the path to the payments relation, e.g. ``'payments__'`` when annotating bank accounts.
+    """
+    type_title = f'{prefix}payment_type__title'
+    return {
+        'incoming': Sum(f'{prefix}amount', filter=Q(**{type_title: INCOMING}), default=0),
+        'outgoing': Sum(f'{prefix}amount', filter=Q(**{type_title: OUTGOING}), default=0),
+        'other': Sum(f'{prefix}amount', filter=~Q(**{f'{type_title}__in': [INCOMING, OUTGOING]}), default=0),
+        'count': Count(f'{prefix}id'),
+    }
+
+
+def overall_totals(payments):
+    return payments.aggregate(**direction_sums())
+
+
+def totals_by_payment_type(payments):
+    return list(
+        payments.values('payment_type_id', 'payment_type__title')
+        .annotate(total=Sum('amount'), count=Count('id'))
+        .order_by('payment_type__title')
+    )
+
+
+def totals_by_category(payments):
+    return list(
+        payments.values('category_id', 'category__name')
+        .annotate(total=Sum('amount'), count=Count('id'))
+        .order_by('-total')
+    )
+
+
+def totals_by_person(payments, limit=None):
+    rows = (
+        payments.values('related_person_id', 'related_person__name')
+        .annotate(total=Sum('amount'), count=Count('id'))
+        .order_by('-total', 'related_person_id')
+    )
+    if limit:
+        rows = rows[:limit]
+    return list(rows)
+
+
+def totals_by_period(payments, scale):
+    trunc = SCALES[scale]
+    rows = (
+        payments.annotate(bucket=trunc('datetime'))
+        .values('bucket')
+        .annotate(**direction_sums())
+        .order_by('bucket')
+    )
+    return [{**row, 'bucket': row['bucket'].date().isoformat()} for row in rows]
+
+
+def dashboard_summary(payments, scale='week', top_people=5, by_period=None):
+    """Everything the dashboard charts need; ``by_period`` may be supplied precomputed, e.g. from rollups."""
+    return {
+        'totals': overall_totals(payments),
+        'by_payment_type': totals_by_payment_type(payments),
+        'by_category': totals_by_category(payments),
+        'by_person': totals_by_person(payments, limit=top_people),
+        'by_period': totals_by_period(payments, scale) if by_period is None else by_period,
+        'scale': scale,
+    }
@@ -0,0 +1,212 @@
+import os
+import platform
+import random
+import sqlite3
+import statistics
+import tempfile
+import time
+from contextlib import contextmanager
+from urllib.parse import urlencode
+
+import django
+import pandas as pd
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connection
+from django.test import Client, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from . import instrumentation
+from .importers import BulkImporter, ImportResult
+from .models import (
+    BankAccount, Course, ImportJob, Installment, Payment, PaymentCategory, PaymentMethod, PaymentType, Person,
+    Product, Status, Student, Teacher,
+)
+from .readers import read_chunks
+from .synthetic import SyntheticDataset
+
+# Routes that cannot be timed as a plain GET: the login form posts, logout ends the session, the event
+# stream never finishes and the upload form only renders a template.
+SKIPPED_ROUTES = {'login', 'logout', 'api_events', 'upload_excel'}
+
+# URL keyword argument -> model whose first row fills it. Routes whose model has no rows (import jobs, in
+# a fresh database) are left out.
+ROUTE_ARGUMENTS = {
+    'student_id': Student,
+    'teacher_id': Teacher,
+    'course_id': Course,
+    'product_id': Product,
+    'bank_account_id': BankAccount,
+    'payment_id': Payment,
+    'installment_id': Installment,
+    'job_id': ImportJob,
+}
+
+# Query strings for routes that need one, built from the generated data.
+ROUTE_QUERIES = {
+    'api_search': lambda: {'q': Person.objects.values_list('name', flat=True).first().split()[0]},
+    'api_payment_details': lambda: {'ids': first_ids(Payment)},
+    'api_installment_details': lambda: {'ids': first_ids(Installment)},
+}
+
+
+def first_ids(model, count=100):
+    return ','.join(str(pk) for pk in model.objects.order_by('pk').values_list('pk', flat=True)[:count])
+
+
+@contextmanager
+def scratch_database(path):
+    """Point the default connection at a freshly migrated database file, removed again afterwards."""
+    test_settings = connection.settings_dict['TEST']
+    previous = test_settings.get('NAME')
+    test_settings['NAME'] = path
+    old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+    try:
+        yield
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+        test_settings['NAME'] = previous
+
+
+def timed_routes():
+    """``(name, keyword arguments, query)`` for every named route in ``payments/urls.py`` worth timing."""
+    from .urls import urlpatterns
+
+    for pattern in urlpatterns:
+        if pattern.name in SKIPPED_ROUTES:
+            continue
+        kwargs = {}
+        for argument in pattern.pattern.converters:
+            pk = ROUTE_ARGUMENTS[argument].objects.order_by('pk').values_list('pk', flat=True).first()
+            if pk is None:
+                break
+            kwargs[argument] = pk
+        else:
+            query = ROUTE_QUERIES.get(pattern.name)
+            yield pattern.name, kwargs, query() if query else {}
+
+
+def summarize(durations):
+    return {
+        'median_ms': round(statistics.median(durations) * 1000, 2),
+        'min_ms': round(min(durations) * 1000, 2),
+        'max_ms': round(max(durations) * 1000, 2),
+    }
+
+
+class Benchmark:
+    """Time every route and the Excel importer against synthetic datasets of each size in ``scales``.
+
+    Each scale gets its own scratch database. Every request is repeated ``repeat`` times with the
+    response cache cleared first, so the numbers are for real work; the report is plain JSON meant to be
+    diffed between releases.
+    """
+
+    def __init__(self, scales, repeat=5, seed=0, import_rows=5000, progress=None, directory=None):
+        self.scales = sorted(scales)
+        self.repeat = repeat
+        self.seed = seed
+        self.import_rows = import_rows
+        self.progress = progress or (lambda message: None)
+        self.directory = directory
+
+    def run(self):
+        report = {
+            'generated_at': timezone.now().isoformat(),
+            'environment': {
+                'python': platform.python_version(),
+                'django': django.get_version(),
+                'sqlite': sqlite3.sqlite_version,
+                'machine': platform.machine(),
+                'cpus': os.cpu_count(),
+            },
+            'parameters': {'repeat': self.repeat, 'seed': self.seed, 'import_rows': self.import_rows},
+            'scales': [],
+        }
+        with tempfile.TemporaryDirectory(dir=self.directory) as directory, \
+                override_settings(ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, 'testserver']):
+            for scale in self.scales:
+                with scratch_database(os.path.join(directory, f'benchmark-{scale}.sqlite3')):
+                    report['scales'].append(self.run_scale(scale, directory))
+        return report
+
+    def run_scale(self, scale, directory):
+        self.progress(f'Generating {scale} payments')
+        start = time.perf_counter()
+        counts = SyntheticDataset(scale, seed=self.seed, progress=self.progress).run()
+        result = {
+            'payments': scale,
+            'generate_seconds': round(time.perf_counter() - start, 2),
+            'rows': counts,
+            'endpoints': self.time_endpoints(),
+        }
+        # Last, because it adds payments.
+        result['import'] = self.time_import(directory)
+        return result
+
+    @override_settings(PAYMENTS_REQUEST_METRICS=True)
+    def time_endpoints(self):
+        """Time every route. Query counts come from the request log, which unlike ``CaptureQueriesContext``
+        also sees the queries ``parallel.evaluate`` runs on worker-thread connections.
+        """
+        client = Client()
+        client.force_login(User.objects.create_superuser('benchmark', 'benchmark@example.com', None))
+        endpoints = {}
+        for name, kwargs, query in timed_routes():
+            url = reverse(name, kwargs=kwargs) + (f'?{urlencode(query)}' if query else '')
+            self.progress(f'Timing {url}')
+            durations = []
+            for _ in range(self.repeat):
+                cache.clear()
+                start = time.perf_counter()
+                response = client.get(url)
+                body = b''.join(response.streaming_content) if response.streaming else response.content
+                durations.append(time.perf_counter() - start)
+            # Streamed responses are logged once their body has been read, so this is the request above.
+            entry = instrumentation.request_log.recent(limit=1)[0]
+            endpoints[name] = {
+                'url': url,
+                'status': response.status_code,
+                'queries': entry['queries'],
+                'bytes': len(body),
+                **summarize(durations),
+            }
+        return endpoints
+
+    def import_frame(self):
+        """``import_rows`` payment rows in the upload format, pointing at existing people and lookups."""
+        rng = random.Random(self.seed)
+        people = list(Person.objects.values_list('pk', flat=True)[:1000])
+        accounts = list(BankAccount.objects.values_list('pk', flat=True)[:100])
+        choices = {model: list(model.objects.values_list('pk', flat=True))
+                   for model in (PaymentMethod, Status, PaymentCategory, PaymentType)}
+        return pd.DataFrame([{
+            'name': f'Imported payment {n}',
+            'amount': rng.randrange(100, 100000) / 100,
+            'related_person': rng.choice(people),
+            'payment_method': rng.choice(choices[PaymentMethod]),
+            'status': rng.choice(choices[Status]),
+            'category': rng.choice(choices[PaymentCategory]),
+            'payment_type': rng.choice(choices[PaymentType]),
+            'related_bank_account': rng.choice(accounts),
+        } for n in range(self.import_rows)])
+
+    def time_import(self, directory):
+        path = os.path.join(directory, 'payments.xlsx')
+        self.import_frame().to_excel(path, index=False)
+        self.progress(f'Importing {self.import_rows} payments')
+        importer = BulkImporter(Payment)
+        result = ImportResult()
+        start = time.perf_counter()
+        for chunk in read_chunks(path):
+            result.merge(importer.run(chunk))
+        seconds = time.perf_counter() - start
+        return {
+            'rows': self.import_rows,
+            'created': result.created,
+            'failed': result.failed,
+            'seconds': round(seconds, 2),
+            'rows_per_second': round(self.import_rows / seconds),
+        }
@@ -0,0 +1,126 @@
+import asyncio
+import hashlib
+import time
+from functools import wraps
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from django.http import HttpResponse, StreamingHttpResponse
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.http import http_date
+
+from .models import (
+    Person, BankAccount, PaymentMethod, PaymentType, Status, PaymentCategory, Payment
+)
+
+# The tables behind every payment listing: the payments themselves plus everything they are labelled with.
+PAYMENT_TABLES = (Payment, Person, BankAccount, PaymentMethod, PaymentType, Status, PaymentCategory)
+
+
+def get_cache():
+    return caches[getattr(settings, 'PAYMENTS_RESPONSE_CACHE', 'default')]
+
+
+def version_key(model):
+    return f'payments:table-version:{model._meta.label_lower}'
+
+
+def bump(model):
+    """Record that ``model``'s table changed. The version is the change time in nanoseconds."""
+    get_cache().set(version_key(model), time.time_ns(), timeout=None)
+
+
+def table_versions(models):
+    """Current version of each table; a table never seen (or evicted) starts a fresh version."""
+    cache = get_cache()
+    keys = [version_key(model) for model in models]
+    found = cache.get_many(keys)
+    for key in keys:
+        if key not in found:
+            cache.add(key, time.time_ns(), timeout=None)
+            found[key] = cache.get(key)
+    return [found[key] for key in keys]
+
+
+def table_changed(sender, **kwargs):
+    # Bump now so this process stops serving the old response, and again once the change is visible
+    # to other connections so nothing cached in between survives.
+    bump(sender)
+    transaction.on_commit(lambda: bump(sender))
+
+
+def cached_response(*models):
+    """Serve a read-only view with ``ETag``/``Last-Modified`` derived from the versions of ``models``.
+
+    Conditional requests that still match get ``304 Not Modified`` without running the view, and
+    complete ``200`` responses are kept in the response cache until one of the tables changes (the
+    key includes the versions) or ``PAYMENTS_RESPONSE_CACHE_TIMEOUT`` passes. Streamed responses
+    get the validators but are not stored. Works on sync and async views; apply it below the auth
+    decorators.
+    """
+    def decorator(view):
+        if asyncio.iscoroutinefunction(view):
+            @wraps(view)
+            async def wrapped(request, *args, **kwargs):
+                if request.method not in ('GET', 'HEAD'):
+                    return await view(request, *args, **kwargs)
+                etag, last_modified = await sync_to_async(validators)(view, request, models)
+                response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+                if response is None:
+                    response = await sync_to_async(cached)(etag)
+                if response is None:
+                    response = await view(request, *args, **kwargs)
+                    await sync_to_async(store)(etag, response)
+                return with_validators(response, etag, last_modified)
+        else:
+            @wraps(view)
+            def wrapped(request, *args, **kwargs):
+                if request.method not in ('GET', 'HEAD'):
+                    return view(request, *args, **kwargs)
+                etag, last_modified = validators(view, request, models)
+                response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+                if response is None:
+                    response = cached(etag)
+                if response is None:
+                    response = view(request, *args, **kwargs)
+                    store(etag, response)
+                return with_validators(response, etag, last_modified)
+        return wrapped
+    return decorator
+
+
+def validators(view, request, models):
+    versions = table_versions(models)
+    fingerprint = '|'.join([view.__module__, view.__name__, request.get_full_path(),
+                            request.headers.get('Accept', ''), *map(str, versions)])
+    etag = f'"{hashlib.md5(fingerprint.encode()).hexdigest()}"'
+    return etag, max(versions) // 1_000_000_000 + 1
+
+
+def response_key(etag):
+    return f'payments:response:{etag.strip(chr(34))}'
+
+
+def cached(etag):
+    stored = get_cache().get(response_key(etag))
+    if stored is None:
+        return None
+    content, content_type = stored
+    return HttpResponse(content, content_type=content_type)
+
+
+def store(etag, response):
+    if response.status_code == 200 and not isinstance(response, StreamingHttpResponse):
+        timeout = getattr(settings, 'PAYMENTS_RESPONSE_CACHE_TIMEOUT', 300)
+        get_cache().set(response_key(etag), (response.content, response['Content-Type']), timeout=timeout)
+
+
+def with_validators(response, etag, last_modified):
+    if response.status_code in (200, 304):
+        response.headers['ETag'] = etag
+        response.headers['Last-Modified'] = http_date(last_modified)
+        response.headers.setdefault('Cache-Control', 'private, no-cache')
+        patch_vary_headers(response, ('Accept', 'Cookie'))
+    return response
@@ -0,0 +1,114 @@
+from datetime import timedelta
+
+from django.db import connection
+from django.db.models import Min
+from django.utils import timezone
+
+from . import lookups
+from .models import ChangeLog, Installment, Payment
+
+DEFAULT_LIMIT = 1000
+MAX_LIMIT = 10000
+
+TRACKED = {Payment: 'payment', Installment: 'installment'}
+
+# What a client receives for each changed row; the same shapes as the list APIs.
+SYNC_FIELDS = {
+    Payment: ('id', 'name', 'amount', 'datetime', 'status__title', 'payment_method__title', 'category__name',
+              'payment_type__title', 'related_person__name', 'related_bank_account__name'),
+    Installment: ('id', 'amount', 'due_date', 'received_date', 'status__title', 'payment_agreement__id'),
+}
+
+LOOKUP_CHUNK_SIZE = 900
+
+
+class TokenError(ValueError):
+    pass
+
+
+class TokenExpired(TokenError):
+    pass
+
+
+def record(model, ids, deleted=False):
+    """Log a write to ``ids`` and return the token that follows it."""
+    entries = ChangeLog.objects.bulk_create(
+        ChangeLog(table=TRACKED[model], object_id=object_id, deleted=deleted) for object_id in ids
+    )
+    seqs = [entry.id for entry in entries if entry.id is not None]
+    return str(max(seqs)) if seqs else None
+
+
+def high_water_mark():
+    """The last sequence number ever issued. Pruning does not lower it: with AUTOINCREMENT, SQLite keeps it in
+    ``sqlite_sequence`` and never hands out an id twice."""
+    with connection.cursor() as cursor:
+        cursor.execute('SELECT seq FROM sqlite_sequence WHERE name = %s', [ChangeLog._meta.db_table])
+        row = cursor.fetchone()
+    return row[0] if row else 0
+
+
+def current_token():
+    return str(high_water_mark())
+
+
+def parse_token(value):
+    try:
+        since = int(value)
+    except (TypeError, ValueError):
+        raise TokenError(f'Invalid token: {value!r}')
+    if since < 0:
+        raise TokenError(f'Invalid token: {value!r}')
+    return since
+
+
+def check_not_pruned(since):
+    # Sequence numbers are never reused, so a gap right after ``since`` means those entries were pruned.
+    oldest = ChangeLog.objects.aggregate(seq=Min('id'))['seq']
+    if oldest is None:
+        # An empty log may have been pruned completely, so any token below the last one issued is stale.
+        expired = since < high_water_mark()
+    else:
+        expired = oldest > since + 1
+    if expired:
+        raise TokenExpired('Token is older than the retained change log; fetch a full copy again')
+
+
+def changes_since(since, limit=DEFAULT_LIMIT):
+    """Collapse the log entries after ``since`` into per-table upserts and deletes.
+
+    Returns ``{'payments': {'upserts': [...], 'deletes': [...]}, 'installments': {...}, 'next': token,
+    'more': bool}``. Only the latest entry per row counts, so a row changed many times is sent once;
+    upserted rows are read with one query per chunk of ids.
+    """
+    check_not_pruned(since)
+    entries = list(ChangeLog.objects.filter(id__gt=since).order_by('id')
+                   .values_list('id', 'table', 'object_id', 'deleted')[:limit + 1])
+    more = len(entries) > limit
+    entries = entries[:limit]
+
+    latest = {}
+    for _, table, object_id, deleted in entries:
+        latest[table, object_id] = deleted
+
+    result = {'next': str(entries[-1][0]) if entries else str(since), 'more': more}
+    for model, table in TRACKED.items():
+        deleted_ids = sorted(object_id for (name, object_id), deleted in latest.items() if name == table and deleted)
+        changed_ids = sorted(object_id for (name, object_id), deleted in latest.items()
+                             if name == table and not deleted)
+        upserts = []
+        for start in range(0, len(changed_ids), LOOKUP_CHUNK_SIZE):
+            chunk = changed_ids[start:start + LOOKUP_CHUNK_SIZE]
+            upserts.extend(lookups.labelled_values(model.objects.filter(id__in=chunk).order_by('id'),
+                                                   SYNC_FIELDS[model]))
+        # A row saved and then deleted before this poll is a delete; a save after a delete is an upsert.
+        found = {row['id'] for row in upserts}
+        deleted_ids.extend(object_id for object_id in changed_ids if object_id not in found)
+        result[f'{table}s'] = {'upserts': upserts, 'deletes': sorted(deleted_ids)}
+    return result
+
+
+def prune(days):
+    """Drop log entries older than ``days``; clients with older tokens must resync from scratch."""
+    cutoff = timezone.now() - timedelta(days=days)
+    return ChangeLog.objects.filter(changed_at__lt=cutoff).delete()[0]
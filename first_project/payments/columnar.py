@@ -0,0 +1,54 @@
+from datetime import datetime
+from decimal import Decimal
+
+ROWS = 'rows'
+COLUMNS = 'columns'
+LAYOUTS = (ROWS, COLUMNS)
+
+
+class LayoutError(ValueError):
+    pass
+
+
+def requested_layout(request):
+    """``'columns'`` if the client asked for ``?layout=columns``, else ``'rows'``."""
+    layout = request.GET.get('layout') or ROWS
+    if layout not in LAYOUTS:
+        raise LayoutError(f"Unknown layout: {layout}. Use one of: {', '.join(LAYOUTS)}")
+    return layout
+
+
+def column_value(value):
+    # Charts want numbers: decimals become JSON numbers and datetimes milliseconds since the epoch.
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, datetime):
+        return round(value.timestamp() * 1000)
+    return value
+
+
+def encode(rows, fields, dictionary=()):
+    """Turn dict ``rows`` into one array per field.
+
+    Values of the ``dictionary`` fields are replaced by small integer codes into
+    ``dictionaries[field]``, in order of first appearance; ``None`` stays ``null``. Keys of the result
+    are ``count``, ``columns`` and ``dictionaries``.
+    """
+    columns = {field: [] for field in fields}
+    codes = {field: {} for field in dictionary}
+    count = 0
+    for row in rows:
+        count += 1
+        for field, column in columns.items():
+            value = row[field]
+            if field in codes and value is not None:
+                table = codes[field]
+                value = table.setdefault(value, len(table))
+            else:
+                value = column_value(value)
+            column.append(value)
+    return {
+        'count': count,
+        'columns': columns,
+        'dictionaries': {field: list(table) for field, table in codes.items()},
+    }
@@ -0,0 +1,86 @@
+import zlib
+
+from django.conf import settings
+
+try:
+    import brotli
+except ImportError:
+    # Brotli is optional; without it only gzip is offered.
+    brotli = None
+
+DEFAULT_MIN_SIZE = 1024
+# Dynamic responses are compressed on every request, so favour speed; static files once, so favour size.
+# Dynamic gzip is left to Django's GZipMiddleware, which always uses level 6.
+RESPONSE_LEVELS = {'br': 5}
+STATIC_LEVELS = {'br': 11, 'gzip': 9}
+COMPRESSIBLE_TYPES = ('text/html', 'application/json', 'application/x-ndjson', 'text/csv')
+STATIC_EXTENSIONS = ('.css', '.js', '.json', '.svg', '.txt', '.html', '.map')
+
+
+def min_size():
+    return getattr(settings, 'PAYMENTS_COMPRESSION_MIN_SIZE', DEFAULT_MIN_SIZE)
+
+
+def encodings():
+    """Encodings this process can produce, preferred first."""
+    return ('br', 'gzip') if brotli else ('gzip',)
+
+
+def negotiate(accept_encoding, offered=None):
+    """The best of ``offered`` (default ``encodings()``) that an ``Accept-Encoding`` header allows, or ``None``."""
+    accepted = {}
+    for part in accept_encoding.split(','):
+        coding, _, params = part.strip().partition(';')
+        try:
+            quality = float(params.strip()[2:]) if params.strip().startswith('q=') else 1.0
+        except ValueError:
+            quality = 0.0
+        accepted[coding.strip().lower()] = quality
+    for encoding in offered or encodings():
+        if accepted.get(encoding, accepted.get('*', 0)) > 0:
+            return encoding
+    return None
+
+
+def media_type(content_type):
+    return content_type.split(';')[0].strip().lower()
+
+
+def is_compressible(content_type):
+    return media_type(content_type) in COMPRESSIBLE_TYPES
+
+
+class Compressor:
+    """Incremental gzip or Brotli encoder: feed chunks to ``compress`` and end with ``flush``."""
+
+    def __init__(self, encoding, level):
+        if encoding == 'br':
+            self.encoder = brotli.Compressor(quality=level)
+            self.compress, self.flush = self.encoder.process, self.encoder.finish
+        else:
+            # wbits=31 writes a gzip header and trailer around the deflate stream.
+            self.encoder = zlib.compressobj(level, zlib.DEFLATED, 31)
+            self.compress, self.flush = self.encoder.compress, self.encoder.flush
+
+
+def compress(data, encoding, level):
+    compressor = Compressor(encoding, level)
+    return compressor.compress(data) + compressor.flush()
+
+
+def compress_sequence(chunks, encoding):
+    compressor = Compressor(encoding, RESPONSE_LEVELS[encoding])
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+async def compress_async_sequence(chunks, encoding):
+    compressor = Compressor(encoding, RESPONSE_LEVELS[encoding])
+    async for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
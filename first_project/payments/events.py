@@ -0,0 +1,127 @@
+import asyncio
+import json
+import threading
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connection
+
+from . import rollups
+
+MAX_QUEUED_EVENTS = 100
+MAX_IDS_PER_EVENT = 100
+
+
+class Broadcaster:
+    """Fan events out to every connected event stream in this process.
+
+    Each subscriber is an ``asyncio.Queue`` bound to the event loop that created it. ``publish`` may be
+    called from any thread (signal handlers run in sync code); delivery is handed to each subscriber's
+    loop. A subscriber that falls ``MAX_QUEUED_EVENTS`` behind loses its oldest events rather than
+    holding memory for everyone.
+    """
+
+    def __init__(self, max_queued=MAX_QUEUED_EVENTS):
+        self.max_queued = max_queued
+        self.lock = threading.Lock()
+        self.subscribers = set()
+
+    def subscribe(self):
+        queue = asyncio.Queue(maxsize=self.max_queued)
+        with self.lock:
+            self.subscribers.add((asyncio.get_running_loop(), queue))
+        return queue
+
+    def unsubscribe(self, queue):
+        with self.lock:
+            self.subscribers = {(loop, subscribed) for loop, subscribed in self.subscribers if subscribed is not queue}
+
+    @property
+    def listening(self):
+        return bool(self.subscribers)
+
+    def publish(self, event):
+        with self.lock:
+            subscribers = list(self.subscribers)
+        for loop, queue in subscribers:
+            try:
+                loop.call_soon_threadsafe(self.deliver, queue, event)
+            except RuntimeError:
+                # The loop has shut down without unsubscribing.
+                self.unsubscribe(queue)
+
+    @staticmethod
+    def deliver(queue, event):
+        if queue.full():
+            queue.get_nowait()
+        queue.put_nowait(event)
+
+
+broadcaster = Broadcaster()
+
+
+def format_event(event):
+    """Render ``event`` as one Server-Sent Events message."""
+    lines = [f"event: {event['type']}"]
+    if event.get('token'):
+        lines.append(f"id: {event['token']}")
+    lines.append('data: ' + json.dumps(event, cls=DjangoJSONEncoder, separators=(',', ':')))
+    return '\n'.join(lines) + '\n\n'
+
+
+def current_totals():
+    """Incoming/outgoing/other totals over all payments, summed from the yearly rollups."""
+    totals = {'incoming': 0, 'outgoing': 0, 'other': 0, 'count': 0}
+    for bucket in rollups.series('year'):
+        for key in totals:
+            totals[key] += bucket[key]
+    return totals
+
+
+class TotalsPublisher:
+    """Recompute the totals once per burst of changes, not once per change or per viewer."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.pending = False
+
+    def schedule(self):
+        delay = getattr(settings, 'PAYMENTS_EVENTS_TOTALS_DELAY', 1.0)
+        if delay <= 0:
+            broadcaster.publish({'type': 'totals', 'totals': current_totals()})
+            return
+        with self.lock:
+            if self.pending:
+                return
+            self.pending = True
+        timer = threading.Timer(delay, self.publish)
+        timer.daemon = True
+        timer.start()
+
+    def publish(self):
+        with self.lock:
+            self.pending = False
+        try:
+            broadcaster.publish({'type': 'totals', 'totals': current_totals()})
+        finally:
+            connection.close()
+
+
+totals_publisher = TotalsPublisher()
+
+
+def publish_change(table, ids, deleted=False, token=None):
+    """Announce a committed change; clients fetch the rows with ``/api/payments/changes/`` if they need them."""
+    if not broadcaster.listening:
+        return
+    ids = list(ids)
+    broadcaster.publish({
+        'type': 'change',
+        'table': table,
+        'action': 'delete' if deleted else 'upsert',
+        'ids': ids[:MAX_IDS_PER_EVENT],
+        'count': len(ids),
+        'token': token,
+    })
+    if table == 'payment':
+        totals_publisher.schedule()
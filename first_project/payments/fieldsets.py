@@ -0,0 +1,42 @@
+from . import lookups
+
+
+class FieldsetError(ValueError):
+    pass
+
+
+def format_datetime(value):
+    return value.strftime('%Y-%m-%d %H:%M:%S')
+
+
+class Fieldset:
+    """The fields a detail API can return: output name -> ``values()`` lookup, plus optional formatters.
+
+    ``?fields=`` picks a subset; rows are read with one ``lookups.labelled_values`` query projected to
+    just those columns, so dimension labels come from the lookup cache and only person or bank account
+    names need a join. ``id`` is always included.
+    """
+
+    def __init__(self, fields, formatters=None):
+        self.fields = fields
+        self.formatters = formatters or {}
+
+    def select(self, value):
+        """The field names requested by a ``?fields=`` value; all of them when it is empty."""
+        if not value:
+            return list(self.fields)
+        names = [name.strip() for name in value.split(',') if name.strip() and name.strip() != 'id']
+        unknown = [name for name in names if name not in self.fields]
+        if unknown:
+            raise FieldsetError(f"Unknown fields: {', '.join(unknown)}. Choose from: {', '.join(self.fields)}")
+        return list(dict.fromkeys(names))
+
+    def rows(self, queryset, names):
+        """Iterate over ``queryset`` as dicts of ``id`` and ``names``."""
+        paths = {'id': 'id', **{name: self.fields[name] for name in names}}
+        for row in lookups.labelled_values(queryset, tuple(dict.fromkeys(paths.values()))):
+            yield {name: self.format(name, row[path]) for name, path in paths.items()}
+
+    def format(self, name, value):
+        formatter = self.formatters.get(name)
+        return formatter(value) if formatter and value is not None else value
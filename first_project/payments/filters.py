@@ -0,0 +1,100 @@
+from datetime import datetime, time, timedelta
+from decimal import Decimal, InvalidOperation
+
+from django.db.models import CharField, Func, Q, Value
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+
+PAYMENT_FILTER_PARAMS = (
+    'id', 'q', 'name', 'category', 'status', 'payment_type', 'payment_method', 'person', 'bank_account',
+    'date_from', 'date_to', 'amount_min', 'amount_max',
+)
+
+ID_FILTERS = {
+    'id': 'id__in',
+    'category': 'category_id__in',
+    'status': 'status_id__in',
+    'payment_type': 'payment_type_id__in',
+    'payment_method': 'payment_method_id__in',
+    'person': 'related_person_id__in',
+    'bank_account': 'related_bank_account_id__in',
+}
+
+
+class FilterError(ValueError):
+    pass
+
+
+def has_payment_filters(params):
+    return any(params.get(param) for param in PAYMENT_FILTER_PARAMS)
+
+
+def parse_ids(value, param):
+    try:
+        return [int(part) for part in value.split(',') if part.strip()]
+    except ValueError:
+        raise FilterError(f'{param} must be a comma separated list of ids')
+
+
+def parse_amount(value, param):
+    try:
+        amount = Decimal(value)
+    except InvalidOperation:
+        raise FilterError(f'Invalid {param}: {value}')
+    # Decimal also parses 'NaN' and 'Infinity', which the database cannot compare against.
+    if not amount.is_finite():
+        raise FilterError(f'Invalid {param}: {value}')
+    return amount
+
+
+def parse_day(value, param):
+    try:
+        day = parse_date(value)
+    except ValueError:
+        day = None
+    if day is None:
+        raise FilterError(f'Invalid {param} date: {value}')
+    return day
+
+
+def day_start(value, param, offset_days=0):
+    day = parse_day(value, param)
+    return timezone.make_aware(datetime.combine(day + timedelta(days=offset_days), time.min))
+
+
+def filter_payments(payments, params):
+    """Apply the payment list filters found in ``params`` (usually ``request.GET``).
+
+    Date bounds are turned into a half-open ``datetime`` range so the filter can use the index on
+    ``Payment.datetime``. Raises ``FilterError`` on malformed input.
+    """
+    q = params.get('q')
+    if q:
+        # Like the old in-browser search: part of the name, or part of the amount as shown with two decimals.
+        amount_text = Func(Value('%.2f'), 'amount', function='printf', output_field=CharField())
+        payments = payments.alias(amount_text=amount_text).filter(Q(name__icontains=q) | Q(amount_text__contains=q))
+
+    name = params.get('name')
+    if name:
+        payments = payments.filter(name__icontains=name)
+
+    for param, lookup in ID_FILTERS.items():
+        value = params.get(param)
+        if value:
+            payments = payments.filter(**{lookup: parse_ids(value, param)})
+
+    date_from = params.get('date_from')
+    if date_from:
+        payments = payments.filter(datetime__gte=day_start(date_from, 'date_from'))
+    date_to = params.get('date_to')
+    if date_to:
+        payments = payments.filter(datetime__lt=day_start(date_to, 'date_to', offset_days=1))
+
+    amount_min = params.get('amount_min')
+    if amount_min:
+        payments = payments.filter(amount__gte=parse_amount(amount_min, 'amount_min'))
+    amount_max = params.get('amount_max')
+    if amount_max:
+        payments = payments.filter(amount__lte=parse_amount(amount_max, 'amount_max'))
+
+    return payments
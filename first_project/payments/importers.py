@@ -0,0 +1,345 @@
+from decimal import Decimal, InvalidOperation
+
+from django.core.exceptions import ValidationError
+from django.db import IntegrityError, models, transaction
+from django.utils import timezone
+
+from .models import (
+    Person, BankAccount, PaymentMethod, PaymentType, Status,
+    PaymentCategory, Payment, Student, Teacher, Olympiad, Course, Product,
+    StudentAgreement, TeacherAgreement, PaymentAgreement, Installment, InstallmentStatus, PaymentFile
+)
+from . import lookups
+from .signals import bulk_imported
+
+BATCH_SIZE = 1000
+LOOKUP_CHUNK_SIZE = 900
+MAX_REPORTED_ERRORS = 100
+
+
+class ImportSpec:
+    """Describes how the columns of an uploaded sheet map onto one model.
+
+    ``columns`` maps model field names to sheet column names, ``lookup`` lists the fields that identify an
+    existing row (the old ``get_or_create`` keyword arguments) and ``required`` the fields that must be set.
+    """
+
+    def __init__(self, model, columns, lookup, required=(), defaults=None):
+        self.model = model
+        self.columns = columns
+        self.lookup = tuple(lookup)
+        self.required = tuple(required)
+        self.defaults = defaults or {}
+
+    def field(self, name):
+        return self.model._meta.get_field(name)
+
+    @property
+    def foreign_keys(self):
+        return {name: self.field(name).related_model for name in self.columns if self.field(name).is_relation}
+
+
+def simple_spec(model, *fields, lookup=None, required=None):
+    return ImportSpec(model, {name: name for name in fields}, lookup or fields, required=required or fields[:1])
+
+
+IMPORT_SPECS = {spec.model: spec for spec in (
+    ImportSpec(Person, {'name': 'person_name', 'national_id': 'person_national_id'},
+               lookup=('name', 'national_id'), required=('name', 'national_id')),
+    ImportSpec(BankAccount, {'name': 'bank_name', 'bank_number': 'bank_number', 'description': 'bank_description'},
+               lookup=('name', 'bank_number'), required=('name', 'bank_number')),
+    simple_spec(PaymentMethod, 'title', 'description', lookup=('title',)),
+    simple_spec(PaymentType, 'title', 'description', lookup=('title',)),
+    simple_spec(Status, 'title', 'description', lookup=('title',)),
+    simple_spec(PaymentCategory, 'name', 'type', lookup=('name',)),
+    simple_spec(Payment, 'name', 'amount', 'related_person', 'payment_method', 'status', 'category',
+                'payment_type', 'related_bank_account',
+                required=('name', 'amount', 'related_person', 'payment_method', 'status', 'category',
+                          'payment_type')),
+    simple_spec(Student, 'name', 'national_id', 'person', required=('name', 'national_id', 'person')),
+    simple_spec(Teacher, 'name', 'national_id', 'person', required=('name', 'national_id', 'person')),
+    simple_spec(Olympiad, 'title'),
+    simple_spec(Product, 'title', 'description', 'amount', 'teacher',
+                lookup=('title', 'teacher'), required=('title', 'teacher')),
+    simple_spec(Course, 'title', 'session_time', 'start_date', 'end_date', 'teacher', 'olympiad',
+                'related_product', lookup=('title', 'session_time', 'start_date', 'end_date', 'teacher', 'olympiad'),
+                required=('title', 'teacher', 'related_product')),
+    simple_spec(StudentAgreement, 'student', 'course', 'amount', 'attrs',
+                lookup=('student', 'course'), required=('student', 'course')),
+    simple_spec(TeacherAgreement, 'teacher', 'product', 'amount', 'attrs',
+                lookup=('teacher', 'product'), required=('teacher', 'product')),
+    ImportSpec(PaymentAgreement, {name: name for name in ('student_agreement', 'teacher_agreement',
+                                                          'payment_direction', 'total_amount')},
+               lookup=('student_agreement', 'teacher_agreement'), required=('total_amount',),
+               defaults={'payment_direction': 'in'}),
+    simple_spec(Installment, 'payment_agreement', 'amount', 'due_date', 'received_date', 'status',
+                lookup=('payment_agreement', 'amount', 'due_date'),
+                required=('payment_agreement', 'amount', 'due_date')),
+    simple_spec(InstallmentStatus, 'title'),
+    simple_spec(PaymentFile, 'payment', 'file', required=('payment', 'file')),
+)}
+
+
+class ImportResult:
+    def __init__(self):
+        self.created = 0
+        self.skipped = 0
+        self.failed = 0
+        self.errors = []
+
+    def add_error(self, row, message):
+        self.failed += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({'row': row, 'error': message})
+
+    def merge(self, other, sheet=None):
+        self.created += other.created
+        self.skipped += other.skipped
+        for error in other.errors:
+            if len(self.errors) < MAX_REPORTED_ERRORS:
+                self.errors.append({'sheet': sheet, **error} if sheet else error)
+        self.failed += other.failed
+
+    @property
+    def processed(self):
+        return self.created + self.skipped + self.failed
+
+    def as_dict(self):
+        return {
+            'created': self.created,
+            'skipped': self.skipped,
+            'failed': self.failed,
+            'errors': self.errors,
+        }
+
+    def summary(self):
+        return f'{self.created} rows created, {self.skipped} already existed, {self.failed} failed.'
+
+
+def sheet_row(index):
+    # Header is row 1 in the spreadsheet, so data row ``index`` 0 is row 2.
+    return int(index) + 2
+
+
+def integral(value):
+    """Parse ids written as ``3``, ``3.0`` or ``'3'`` (CSV cells arrive as text)."""
+    number = Decimal(str(value).strip())
+    if number != number.to_integral_value():
+        raise ValueError(f'{value!r} is not a whole number')
+    return int(number)
+
+
+def coerce(field, value):
+    if value is None:
+        return None
+    if hasattr(value, 'item'):
+        value = value.item()
+    if field.is_relation:
+        return integral(value)
+    if isinstance(field, models.CharField) and isinstance(value, float) and value.is_integer():
+        value = int(value)
+    value = field.to_python(value)
+    if isinstance(field, models.DateTimeField) and timezone.is_naive(value):
+        value = timezone.make_aware(value)
+    return value
+
+
+def decimal_rules(field, column):
+    """Range rules for a ``DecimalField`` column as ``(test, message)`` pairs; ``test`` is true for a bad value.
+
+    The tests accept a single number or a pandas Series, so ``BulkImporter`` and the dry run in
+    ``validation.py`` apply exactly the same rules.
+    """
+    limit = 10 ** (field.max_digits - field.decimal_places)
+    return (
+        (lambda number: number < 0, f'{column} must not be negative'),
+        (lambda number: abs(number) >= limit, f'{column} must be less than {limit}'),
+    )
+
+
+def lookup_key(spec, values):
+    return tuple(values.get(spec.field(name).attname) for name in spec.lookup)
+
+
+def existing_keys(spec, keys):
+    """Lookup tuples among ``keys`` that already exist, fetched in chunks of the first lookup field."""
+    first = spec.field(spec.lookup[0]).attname
+    attnames = [spec.field(name).attname for name in spec.lookup]
+    candidates = sorted({key[0] for key in keys if key[0] is not None}, key=str)
+    found = set()
+    for start in range(0, len(candidates), LOOKUP_CHUNK_SIZE):
+        chunk = candidates[start:start + LOOKUP_CHUNK_SIZE]
+        found.update(spec.model.objects.filter(**{f'{first}__in': chunk}).values_list(*attnames))
+    if any(key[0] is None for key in keys):
+        found.update(spec.model.objects.filter(**{f'{first}__isnull': True}).values_list(*attnames))
+    return found
+
+
+def existing_unique_values(spec, field_name, values):
+    found = set()
+    values = sorted(values, key=str)
+    for start in range(0, len(values), LOOKUP_CHUNK_SIZE):
+        chunk = values[start:start + LOOKUP_CHUNK_SIZE]
+        found.update(spec.model.objects.filter(**{f'{field_name}__in': chunk}).values_list(field_name, flat=True))
+    return found
+
+
+class BulkImporter:
+    """Vectorised replacement for the old per-row ``get_or_create`` import.
+
+    Every foreign key column is resolved with one ``in_bulk`` call, existing rows are detected with one
+    query per chunk of lookup values, and new rows are written with ``bulk_create`` inside a transaction.
+    Rows that fail validation are reported and skipped without aborting the rest of the sheet.
+    """
+
+    def __init__(self, model, batch_size=BATCH_SIZE):
+        if model not in IMPORT_SPECS:
+            raise ValueError(f'Excel import is not supported for {model.__name__}')
+        self.spec = IMPORT_SPECS[model]
+        self.batch_size = batch_size
+
+    def check_columns(self, df):
+        missing = [column for field, column in self.spec.columns.items()
+                   if column not in df.columns and field in self.spec.required]
+        if missing:
+            raise ValueError(f"Missing columns: {', '.join(missing)}")
+
+    def records(self, df):
+        df = df.dropna(how='all')
+        columns = [column for column in self.spec.columns.values() if column in df.columns]
+        frame = df[columns].astype(object).where(df[columns].notna(), None)
+        for index, row in zip(frame.index, frame.itertuples(index=False, name=None)):
+            yield sheet_row(index), dict(zip(columns, row))
+
+    def resolve_foreign_keys(self, raw_rows):
+        resolved = {}
+        for name, related_model in self.spec.foreign_keys.items():
+            if related_model in lookups.DIMENSIONS:
+                # Every id of a lookup table is already held by the process-wide cache.
+                resolved[name] = lookups.ids(related_model)
+                continue
+            column = self.spec.columns[name]
+            ids = set()
+            for _, raw in raw_rows:
+                try:
+                    value = coerce(self.spec.field(name), raw.get(column))
+                except (TypeError, ValueError, InvalidOperation):
+                    continue
+                if value is not None:
+                    ids.add(value)
+            resolved[name] = set(related_model.objects.in_bulk(list(ids))) if ids else set()
+        return resolved
+
+    def build(self, raw, resolved):
+        values = {}
+        errors = []
+        for name, column in self.spec.columns.items():
+            field = self.spec.field(name)
+            try:
+                value = coerce(field, raw.get(column))
+            except (TypeError, ValueError, InvalidOperation, ValidationError):
+                errors.append(f'{column}: invalid value {raw.get(column)!r}')
+                continue
+            if value is None:
+                value = self.spec.defaults.get(name)
+            if value is None and name in self.spec.required:
+                errors.append(f'{column} is required')
+            elif value is not None and name in resolved and value not in resolved[name]:
+                errors.append(f'{column}: {field.related_model.__name__} {value} does not exist')
+            elif value is not None and isinstance(field, models.DecimalField):
+                errors.extend(message for test, message in decimal_rules(field, column) if test(value))
+            values[field.attname] = value
+
+        if self.spec.model is PaymentAgreement and not (values.get('student_agreement_id')
+                                                        or values.get('teacher_agreement_id')):
+            errors.append('student_agreement or teacher_agreement is required')
+
+        if errors:
+            return None, errors
+        instance = self.spec.model(**values)
+        try:
+            instance.clean()
+        except ValidationError as e:
+            return None, e.messages
+        return instance, []
+
+    def run(self, df):
+        """Import ``df`` and return an ``ImportResult``."""
+        self.check_columns(df)
+        result = ImportResult()
+        raw_rows = list(self.records(df))
+        if not raw_rows:
+            return result
+
+        resolved = self.resolve_foreign_keys(raw_rows)
+        pending = []
+        for row_number, raw in raw_rows:
+            instance, errors = self.build(raw, resolved)
+            if errors:
+                result.add_error(row_number, '; '.join(errors))
+            else:
+                pending.append((row_number, instance))
+
+        pending = self.drop_existing(pending, result)
+        pending = self.drop_unique_collisions(pending, result)
+
+        created = []
+        with transaction.atomic():
+            for start in range(0, len(pending), self.batch_size):
+                created.extend(self.insert_batch(pending[start:start + self.batch_size], result))
+            if created:
+                bulk_imported.send(sender=self.spec.model, instances=created)
+        result.created = len(created)
+        result.errors.sort(key=lambda error: error['row'])
+        return result
+
+    def drop_existing(self, pending, result):
+        keys = {row_number: lookup_key(self.spec, instance.__dict__) for row_number, instance in pending}
+        existing = existing_keys(self.spec, set(keys.values())) if keys else set()
+        kept = []
+        for row_number, instance in pending:
+            key = keys[row_number]
+            if key in existing:
+                result.skipped += 1
+                continue
+            existing.add(key)
+            kept.append((row_number, instance))
+        return kept
+
+    def drop_unique_collisions(self, pending, result):
+        unique_fields = [self.spec.field(name).attname for name in self.spec.columns
+                         if self.spec.field(name).unique and not self.spec.field(name).primary_key]
+        for attname in unique_fields:
+            values = {getattr(instance, attname) for _, instance in pending} - {None}
+            taken = existing_unique_values(self.spec, attname, values)
+            kept = []
+            for row_number, instance in pending:
+                value = getattr(instance, attname)
+                if value is not None and value in taken:
+                    result.add_error(row_number, f'{attname} {value} already exists')
+                    continue
+                taken.add(value)
+                kept.append((row_number, instance))
+            pending = kept
+        return pending
+
+    def insert_batch(self, batch, result):
+        instances = [instance for _, instance in batch]
+        try:
+            with transaction.atomic():
+                return self.spec.model.objects.bulk_create(instances)
+        except IntegrityError:
+            pass
+        # Something in the batch violates a constraint; retry row by row to isolate the bad rows.
+        created = []
+        for row_number, instance in batch:
+            try:
+                with transaction.atomic():
+                    created.extend(self.spec.model.objects.bulk_create([instance]))
+            except IntegrityError as e:
+                result.add_error(row_number, str(e))
+        return created
+
+
+def import_dataframe(model, df, **kwargs):
+    return BulkImporter(model, **kwargs).run(df)
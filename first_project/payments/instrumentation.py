@@ -0,0 +1,131 @@
+import threading
+import time
+from collections import deque
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.http import JsonResponse as BaseJsonResponse
+from django.utils import timezone
+
+DEFAULT_LOG_SIZE = 500
+
+# The request being measured in this context. Context variables follow the request into
+# ``sync_to_async`` threads, so queries run there are counted too.
+current = ContextVar('payments_request_stats', default=None)
+
+
+class RequestStats:
+    """Counters for one request; updated from the request's thread and any worker threads it uses."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.started = time.perf_counter()
+        self.queries = 0
+        self.db_time = 0.0
+        self.serialize_time = 0.0
+        self.size = 0
+
+    def add_query(self, duration):
+        with self.lock:
+            self.queries += 1
+            self.db_time += duration
+
+    def add_serialize(self, duration):
+        with self.lock:
+            self.serialize_time += duration
+
+    def elapsed(self):
+        return time.perf_counter() - self.started
+
+    def server_timing(self):
+        return (f'db;dur={self.db_time * 1000:.1f};desc="{self.queries} queries", '
+                f'serialize;dur={self.serialize_time * 1000:.1f}, total;dur={self.elapsed() * 1000:.1f}')
+
+    def entry(self, request, status):
+        match = getattr(request, 'resolver_match', None)
+        return {
+            'at': timezone.now(),
+            'method': request.method,
+            'path': request.path,
+            'view': match.view_name if match else None,
+            'status': status,
+            'queries': self.queries,
+            'db_ms': round(self.db_time * 1000, 2),
+            'serialize_ms': round(self.serialize_time * 1000, 2),
+            'total_ms': round(self.elapsed() * 1000, 2),
+            'bytes': self.size,
+        }
+
+
+def count_query(execute, sql, params, many, context):
+    """Database execute wrapper (installed on every connection) charging each query to the current request."""
+    stats = current.get()
+    if stats is None:
+        return execute(sql, params, many, context)
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        stats.add_query(time.perf_counter() - start)
+
+
+def install_query_counter(sender, connection, **kwargs):
+    if count_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(count_query)
+
+
+class JsonResponse(BaseJsonResponse):
+    """``django.http.JsonResponse`` that charges its encoding time to the current request."""
+
+    def __init__(self, *args, **kwargs):
+        start = time.perf_counter()
+        super().__init__(*args, **kwargs)
+        stats = current.get()
+        if stats is not None:
+            stats.add_serialize(time.perf_counter() - start)
+
+
+class RequestLog:
+    """The last ``size`` request entries, oldest dropped first. Appends are O(1) under a short lock."""
+
+    def __init__(self, size=DEFAULT_LOG_SIZE):
+        self.lock = threading.Lock()
+        self.entries = deque(maxlen=size)
+
+    def record(self, entry):
+        with self.lock:
+            self.entries.append(entry)
+
+    def recent(self, view=None, limit=None):
+        with self.lock:
+            entries = list(self.entries)
+        entries.reverse()
+        if view:
+            entries = [entry for entry in entries if entry['view'] == view]
+        return entries[:limit] if limit else entries
+
+    def summary(self):
+        """Per-view count and average/maximum of the recorded timings, slowest average first."""
+        views = {}
+        for entry in self.recent():
+            views.setdefault(entry['view'], []).append(entry)
+        rows = []
+        for view, entries in views.items():
+            row = {'view': view, 'count': len(entries)}
+            for field in ('total_ms', 'db_ms', 'serialize_ms', 'queries', 'bytes'):
+                values = [entry[field] for entry in entries]
+                row[f'avg_{field}'] = round(sum(values) / len(values), 2)
+                row[f'max_{field}'] = max(values)
+            rows.append(row)
+        return sorted(rows, key=lambda row: row['avg_total_ms'], reverse=True)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+
+request_log = RequestLog(getattr(settings, 'PAYMENTS_REQUEST_LOG_SIZE', DEFAULT_LOG_SIZE))
+
+
+def enabled():
+    return getattr(settings, 'PAYMENTS_REQUEST_METRICS', True)
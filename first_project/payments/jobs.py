@@ -0,0 +1,131 @@
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+from django.apps import apps
+from django.conf import settings
+from django.db import close_old_connections, connection, transaction
+from django.utils import timezone
+
+from . import metrics
+from .importers import BulkImporter, ImportResult
+from .models import ImportJob
+from .readers import DEFAULT_CHUNK_SIZE, read_chunks
+from .validation import DataFrameValidator
+from .workbook import WORKBOOK, WorkbookLoader
+
+logger = logging.getLogger(__name__)
+
+_executor = None
+
+
+def get_executor():
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=getattr(settings, 'PAYMENTS_IMPORT_THREADS', 1),
+            thread_name_prefix='payments-import',
+        )
+    return _executor
+
+
+def enqueue(job):
+    """Hand ``job`` to the in-process worker pool once the surrounding transaction commits.
+
+    With ``PAYMENTS_IMPORT_WORKER = 'command'`` jobs are left queued for ``process_import_jobs``.
+    """
+    if getattr(settings, 'PAYMENTS_IMPORT_WORKER', 'thread') == 'thread':
+        transaction.on_commit(lambda: get_executor().submit(run_in_thread, job.pk))
+
+
+def run_in_thread(job_id):
+    try:
+        run_job(job_id)
+    finally:
+        connection.close()
+
+
+def claim(job_id):
+    """Atomically move a queued job to running; returns ``False`` if another worker got there first."""
+    return bool(ImportJob.objects.filter(pk=job_id, status='queued').update(
+        status='running', started_at=timezone.now()
+    ))
+
+
+def run_job(job_id):
+    close_old_connections()
+    if not claim(job_id):
+        return None
+    job = ImportJob.objects.get(pk=job_id)
+    chunk_size = getattr(settings, 'PAYMENTS_IMPORT_CHUNK_SIZE', DEFAULT_CHUNK_SIZE)
+    result = ImportResult()
+    try:
+        if job.model_name == WORKBOOK:
+            result = run_workbook(job, chunk_size)
+        elif job.dry_run:
+            validator = DataFrameValidator(apps.get_model('payments', job.model_name))
+            for chunk in read_chunks(job.file.path, chunk_size):
+                result.merge(validator.validate(chunk))
+                save_progress(job, result)
+        else:
+            importer = BulkImporter(apps.get_model('payments', job.model_name))
+            for chunk in read_chunks(job.file.path, chunk_size):
+                result.merge(importer.run(chunk))
+                save_progress(job, result)
+    except Exception as e:
+        logger.exception('Import job %s failed', job_id)
+        job.status = 'failed'
+        job.message = f'Error processing file: {e}'
+    else:
+        if job.status != 'failed':
+            job.status = 'done'
+            job.message = f'Dry run, nothing was saved: {result.summary()}' if job.dry_run \
+                else f'File processed: {result.summary()}'
+    job.finished_at = timezone.now()
+    save_progress(job, result)
+    metrics.observe_import(job)
+    return job
+
+
+def run_workbook(job, chunk_size):
+    """Load every sheet of the job's workbook, saving progress as each chunk of each sheet lands."""
+    loader = WorkbookLoader(
+        job.file.path,
+        max_workers=getattr(settings, 'PAYMENTS_IMPORT_SHEET_WORKERS', 4),
+        chunk_size=chunk_size,
+        progress=lambda result: save_progress(job, result),
+    )
+    result = loader.run()
+    if loader.failed_sheets:
+        job.status = 'failed'
+        job.message = f"Sheets not loaded: {', '.join(loader.failed_sheets)}. {result.summary()}"
+    return result
+
+
+def save_progress(job, result):
+    job.rows_processed = result.processed
+    job.rows_created = result.created
+    job.rows_skipped = result.skipped
+    job.rows_failed = result.failed
+    job.errors = result.errors
+    job.save(update_fields=[
+        'status', 'message', 'finished_at', 'rows_processed', 'rows_created', 'rows_skipped', 'rows_failed', 'errors'
+    ])
+
+
+def job_status(job):
+    return {
+        'id': job.id,
+        'model_name': job.model_name,
+        'dry_run': job.dry_run,
+        'status': job.status,
+        'message': job.message,
+        'rows_processed': job.rows_processed,
+        'rows_created': job.rows_created,
+        'rows_skipped': job.rows_skipped,
+        'rows_failed': job.rows_failed,
+        'throughput': job.throughput,
+        'errors': job.errors,
+        'created_at': job.created_at,
+        'started_at': job.started_at,
+        'finished_at': job.finished_at,
+    }
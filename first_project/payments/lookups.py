@@ -0,0 +1,164 @@
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+
+from .models import PaymentMethod, PaymentType, Status, PaymentCategory, InstallmentStatus
+
+# Small reference tables and the field that labels each row.
+DIMENSIONS = {
+    PaymentMethod: 'title',
+    PaymentType: 'title',
+    Status: 'title',
+    PaymentCategory: 'name',
+    InstallmentStatus: 'title',
+}
+
+
+def version_key(model):
+    return f'payments:dimension-version:{model._meta.label_lower}'
+
+
+class DimensionCache:
+    """In-process ``id -> label`` maps for the ``DIMENSIONS`` tables.
+
+    Each table carries a version number kept in Django's cache. Saving or deleting a row (see
+    ``signals``) bumps the version and drops the local copy; other processes notice the new version
+    within ``PAYMENTS_LOOKUP_CHECK_SECONDS`` and reload. Writes that bypass signals, such as
+    ``QuerySet.update()``, must call ``invalidate`` themselves.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.tables = {}
+        self.versions = {}
+        self.checked_at = 0.0
+
+    def shared_versions(self):
+        keys = {version_key(model): model for model in DIMENSIONS}
+        found = cache.get_many(list(keys))
+        return {model: found.get(key, 0) for key, model in keys.items()}
+
+    def check(self, force=False):
+        interval = getattr(settings, 'PAYMENTS_LOOKUP_CHECK_SECONDS', 5)
+        now = time.monotonic()
+        if not force and now - self.checked_at < interval:
+            return
+        versions = self.shared_versions()
+        with self.lock:
+            for model, version in versions.items():
+                if self.versions.get(model) != version:
+                    self.tables.pop(model, None)
+                    self.versions[model] = version
+            self.checked_at = now
+
+    def warm(self):
+        """Load every table that is not cached yet, one query per table, and return all of them.
+
+        The returned dict is a snapshot: another thread's ``invalidate`` cannot take a table out of it.
+        """
+        self.check()
+        with self.lock:
+            tables = dict(self.tables)
+        for model, label_field in DIMENSIONS.items():
+            if model not in tables:
+                tables[model] = dict(model.objects.values_list('pk', label_field))
+                with self.lock:
+                    self.tables[model] = tables[model]
+        return tables
+
+    def table(self, model, fresh=False):
+        self.check(force=fresh)
+        with self.lock:
+            table = self.tables.get(model)
+        if table is None:
+            table = self.warm()[model]
+        return table
+
+    def invalidate(self, model):
+        key = version_key(model)
+        if not cache.add(key, 1):
+            try:
+                cache.incr(key)
+            except ValueError:
+                cache.set(key, 1)
+        with self.lock:
+            self.tables.pop(model, None)
+            self.versions.pop(model, None)
+            self.checked_at = 0.0
+
+
+dimensions = DimensionCache()
+
+
+def label(model, pk):
+    return dimensions.table(model).get(pk)
+
+
+def ids(model, fresh=True):
+    """Primary keys of ``model``; ``fresh`` re-checks the shared version first, for writers."""
+    return set(dimensions.table(model, fresh=fresh))
+
+
+def split_fields(model, fields):
+    """Swap ``values()`` lookups such as ``status__title`` for the local foreign key column.
+
+    Returns the fields to select and a map of output name to ``(attname, dimension model)`` for
+    ``attach_labels``, which puts the label back under the original name without a join.
+    """
+    selected = []
+    labels = {}
+    for name in fields:
+        relation, _, attr = name.partition('__')
+        field = model._meta.get_field(relation) if attr else None
+        if field is not None and field.is_relation and DIMENSIONS.get(field.related_model) == attr:
+            labels[name] = (field.attname, field.related_model)
+            name = field.attname
+        selected.append(name)
+    return selected, labels
+
+
+def label_resolver(models):
+    """``resolve(model, pk)`` over the cached tables of ``models``, reloading a table on a miss."""
+    tables = {model: dimensions.table(model) for model in models}
+
+    def resolve(model, pk):
+        if pk is not None and pk not in tables[model]:
+            # Possibly added by another process since the last version check.
+            tables[model] = dimensions.table(model, fresh=True)
+        return tables[model].get(pk)
+
+    return resolve
+
+
+def attach_labels(rows, fields, labels):
+    """Yield ``rows`` with dimension ids replaced by their cached labels, keys in ``fields`` order."""
+    if not labels:
+        yield from rows
+        return
+    resolve = label_resolver({model for _, model in labels.values()})
+    for row in rows:
+        yield {
+            name: resolve(labels[name][1], row[labels[name][0]]) if name in labels else row[name]
+            for name in fields
+        }
+
+
+def labelled_values(queryset, fields, chunk_size=2000):
+    """``queryset.values(*fields)`` without the joins for dimension labels, as an iterator of dicts."""
+    selected, labels = split_fields(queryset.model, fields)
+    return attach_labels(queryset.values(*selected).iterator(chunk_size=chunk_size), fields, labels)
+
+
+def labelled_values_list(queryset, fields, chunk_size=2000):
+    """Like ``labelled_values`` but yields lists in ``fields`` order, for exports that need no keys."""
+    selected, labels = split_fields(queryset.model, fields)
+    rows = queryset.values_list(*selected).iterator(chunk_size=chunk_size)
+    columns = [(index, labels[name][1]) for index, name in enumerate(fields) if name in labels]
+    resolve = label_resolver({model for _, model in columns})
+    for row in rows:
+        row = list(row)
+        for index, model in columns:
+            row[index] = resolve(model, row[index])
+        yield row
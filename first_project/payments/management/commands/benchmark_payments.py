@@ -0,0 +1,32 @@
+import json
+
+from django.core.management.base import BaseCommand
+
+from payments.benchmark import Benchmark
+
+
+class Command(BaseCommand):
+    help = 'Time every payments route and the Excel importer against synthetic datasets of each --scales ' \
+           'size, each in its own scratch database, and write a JSON report to diff between releases.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--scales', type=int, nargs='+', default=[10000, 100000, 1000000])
+        parser.add_argument('--repeat', type=int, default=5)
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--import-rows', type=int, default=5000)
+        parser.add_argument('--output', default='benchmark.json')
+
+    def handle(self, *args, **options):
+        benchmark = Benchmark(options['scales'], repeat=options['repeat'], seed=options['seed'],
+                              import_rows=options['import_rows'],
+                              progress=self.stdout.write if options['verbosity'] > 1 else None)
+        report = benchmark.run()
+        with open(options['output'], 'w') as f:
+            json.dump(report, f, indent=2, sort_keys=True)
+            f.write('\n')
+        for scale in report['scales']:
+            slowest = max(scale['endpoints'].items(), key=lambda item: item[1]['median_ms'])
+            self.stdout.write(f"{scale['payments']} payments: slowest route {slowest[0]} "
+                              f"({slowest[1]['median_ms']} ms median), import "
+                              f"{scale['import']['rows_per_second']} rows/s")
+        self.stdout.write(self.style.SUCCESS(f"Wrote {options['output']}."))
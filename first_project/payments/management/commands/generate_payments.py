@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+
+from payments.synthetic import DEFAULT_BATCH_SIZE, SyntheticDataset
+
+
+class Command(BaseCommand):
+    help = 'Add a synthetic, linked dataset of about --payments payments (people, courses, agreements, ' \
+           'installments, payments) to the database. Meant for benchmarks and local testing.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--payments', type=int, default=10000)
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE)
+
+    def handle(self, *args, **options):
+        dataset = SyntheticDataset(options['payments'], seed=options['seed'], batch_size=options['batch_size'],
+                                   progress=self.stdout.write if options['verbosity'] > 1 else None)
+        counts = dataset.run()
+        summary = ', '.join(f'{count} {name}' for name, count in counts.items())
+        self.stdout.write(self.style.SUCCESS(f'Created {summary}.'))
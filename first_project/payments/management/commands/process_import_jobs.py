@@ -0,0 +1,24 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from payments import jobs
+from payments.models import ImportJob
+
+
+class Command(BaseCommand):
+    help = 'Run queued Excel import jobs. Use --loop to keep polling for new jobs.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--loop', action='store_true', help='Keep polling for new jobs.')
+        parser.add_argument('--interval', type=float, default=2.0, help='Seconds between polls with --loop.')
+
+    def handle(self, *args, **options):
+        while True:
+            for job_id in ImportJob.objects.filter(status='queued').order_by('id').values_list('id', flat=True):
+                job = jobs.run_job(job_id)
+                if job is not None:
+                    self.stdout.write(f'Job {job.id} ({job.model_name}): {job.status}. {job.message}')
+            if not options['loop']:
+                break
+            time.sleep(options['interval'])
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from payments import changes
+
+
+class Command(BaseCommand):
+    help = 'Delete change log entries older than --days. Sync tokens from before the cutoff stop working.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=30)
+
+    def handle(self, *args, **options):
+        deleted = changes.prune(options['days'])
+        self.stdout.write(self.style.SUCCESS(f'Deleted {deleted} change log entries.'))
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from payments import rollups
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the Day/Week/Month/Year payment rollup table from scratch.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        created = rollups.rebuild(batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt {created} payment rollup buckets.'))
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from payments import search
+
+
+class Command(BaseCommand):
+    help = 'Refill the full-text search index from the payment, person, student, teacher and course tables.'
+
+    def handle(self, *args, **options):
+        indexed = search.rebuild()
+        self.stdout.write(self.style.SUCCESS(f'Indexed {indexed} rows.'))
@@ -0,0 +1,90 @@
+import os
+
+from prometheus_client import CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, Counter, Histogram, generate_latest
+from prometheus_client import multiprocess
+from prometheus_client.core import GaugeMetricFamily
+
+from .models import BankAccount, Course, Installment, Payment, Person, Student, Teacher
+
+# Metrics are kept by ``prometheus_client``. In one process they live in memory. When the environment
+# variable PROMETHEUS_MULTIPROC_DIR names a directory (set it before the workers start), every process
+# writes its values to its own mmap'd files there and a scrape of any worker adds them all up. The
+# directory must be emptied before the server starts. A gunicorn ``child_exit`` hook should call
+# ``prometheus_client.multiprocess.mark_process_dead(worker.pid)``.
+MULTIPROCESS_ENV = 'PROMETHEUS_MULTIPROC_DIR'
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+QUERY_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 250, 1000)
+IMPORT_BUCKETS = (1, 5, 15, 30, 60, 120, 300, 600, 1800, 3600)
+
+COUNTED_TABLES = (Payment, Installment, Person, Student, Teacher, Course, BankAccount)
+
+requests_total = Counter(
+    'payments_http_requests', 'HTTP requests by route, method and status.', ['route', 'method', 'status'],
+)
+request_seconds = Histogram(
+    'payments_http_request_duration_seconds', 'Wall time of HTTP requests by route.', ['route'],
+    buckets=LATENCY_BUCKETS,
+)
+request_queries = Histogram(
+    'payments_http_request_queries', 'Database queries per HTTP request by route.', ['route'],
+    buckets=QUERY_BUCKETS,
+)
+request_db_seconds = Histogram(
+    'payments_http_request_db_seconds', 'Database time per HTTP request by route.', ['route'],
+    buckets=LATENCY_BUCKETS,
+)
+import_rows_total = Counter(
+    'payments_import_rows', 'Rows read by Excel imports by model and outcome.', ['model', 'outcome'],
+)
+import_jobs_total = Counter(
+    'payments_import_jobs', 'Finished Excel import jobs by model and status.', ['model', 'status'],
+)
+import_seconds = Histogram(
+    'payments_import_duration_seconds', 'Run time of Excel import jobs by model.', ['model'],
+    buckets=IMPORT_BUCKETS,
+)
+
+
+def observe_request(entry):
+    """Fold one ``instrumentation.RequestStats.entry`` into the request metrics."""
+    # Unresolved paths share one label so arbitrary URLs cannot create new series.
+    route = entry['view'] or 'unresolved'
+    requests_total.labels(route, entry['method'], str(entry['status'])).inc()
+    request_seconds.labels(route).observe(entry['total_ms'] / 1000)
+    request_queries.labels(route).observe(entry['queries'])
+    request_db_seconds.labels(route).observe(entry['db_ms'] / 1000)
+
+
+def observe_import(job):
+    """Count a finished import job; ``rate(payments_import_rows_total[5m])`` gives the throughput."""
+    model = job.model_name
+    import_jobs_total.labels(model, job.status).inc()
+    for outcome in ('created', 'skipped', 'failed'):
+        import_rows_total.labels(model, outcome).inc(getattr(job, f'rows_{outcome}'))
+    if job.started_at and job.finished_at:
+        import_seconds.labels(model).observe((job.finished_at - job.started_at).total_seconds())
+
+
+class TableRowsCollector:
+    """Row counts of the main tables, read from the database at scrape time rather than stored."""
+
+    def collect(self):
+        family = GaugeMetricFamily('payments_table_rows', 'Rows in the main payments tables.', labels=['table'])
+        for model in COUNTED_TABLES:
+            family.add_metric([model._meta.model_name], model.objects.count())
+        yield family
+
+
+table_registry = CollectorRegistry()
+table_registry.register(TableRowsCollector())
+
+
+def exposition():
+    """The Prometheus text exposition of every metric, and its content type."""
+    if os.environ.get(MULTIPROCESS_ENV):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry) + generate_latest(table_registry), CONTENT_TYPE_LATEST
@@ -0,0 +1,134 @@
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.middleware.gzip import GZipMiddleware
+from django.utils.cache import patch_vary_headers
+
+from . import compression, instrumentation, metrics
+
+
+class RequestMetricsMiddleware:
+    """Measure every request: query count, database time, serialization time, response size and wall time.
+
+    Results go to ``instrumentation.request_log``, the Prometheus metrics in ``metrics`` and, as far as
+    they are known when the headers are sent, a ``Server-Timing`` header. Streamed bodies are measured
+    while they are sent and logged when the stream ends. Set ``PAYMENTS_REQUEST_METRICS = False`` to turn it off.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if not instrumentation.enabled():
+            return self.get_response(request)
+        stats = instrumentation.RequestStats()
+        token = instrumentation.current.set(stats)
+        try:
+            response = self.get_response(request)
+        finally:
+            instrumentation.current.reset(token)
+        return self.finish(request, response, stats)
+
+    async def __acall__(self, request):
+        if not instrumentation.enabled():
+            return await self.get_response(request)
+        stats = instrumentation.RequestStats()
+        token = instrumentation.current.set(stats)
+        try:
+            response = await self.get_response(request)
+        finally:
+            instrumentation.current.reset(token)
+        return self.finish(request, response, stats)
+
+    def finish(self, request, response, stats):
+        response.headers['Server-Timing'] = stats.server_timing()
+        if not response.streaming:
+            stats.size = len(response.content)
+            self.record(request, response, stats)
+        elif response.is_async:
+            response.streaming_content = self.measure_async(response.streaming_content, request, response, stats)
+        else:
+            response.streaming_content = self.measure(response.streaming_content, request, response, stats)
+        return response
+
+    @staticmethod
+    def record(request, response, stats):
+        entry = stats.entry(request, response.status_code)
+        instrumentation.request_log.record(entry)
+        metrics.observe_request(entry)
+
+    def measure(self, content, request, response, stats):
+        try:
+            while True:
+                start, queried = time.perf_counter(), stats.db_time
+                token = instrumentation.current.set(stats)
+                try:
+                    chunk = next(content)
+                except StopIteration:
+                    break
+                finally:
+                    instrumentation.current.reset(token)
+                # Producing the body is serialization, apart from the queries it runs.
+                stats.add_serialize(time.perf_counter() - start - (stats.db_time - queried))
+                stats.size += len(chunk)
+                yield chunk
+        finally:
+            self.record(request, response, stats)
+
+    async def measure_async(self, content, request, response, stats):
+        try:
+            async for chunk in content:
+                stats.size += len(chunk)
+                yield chunk
+        finally:
+            self.record(request, response, stats)
+
+
+class CompressionMiddleware(GZipMiddleware):
+    """Django's ``GZipMiddleware``, limited to HTML, JSON, NDJSON and CSV, with Brotli for the API payloads.
+
+    Gzip, including every HTML response, is left to ``GZipMiddleware`` and so keeps its random filename
+    padding, the BREACH mitigation for pages that carry a CSRF token. Brotli has no such padding, so it is
+    only offered for JSON, NDJSON and CSV, and only when the ``brotli`` package is installed. Responses
+    smaller than ``PAYMENTS_COMPRESSION_MIN_SIZE`` bytes are sent as they are; streamed ones are always
+    compressed, chunk by chunk.
+    """
+
+    def process_response(self, request, response):
+        content_type = response.get('Content-Type', '')
+        if response.has_header('Content-Encoding') or not compression.is_compressible(content_type):
+            return response
+        if not response.streaming and len(response.content) < compression.min_size():
+            return response
+        offered = ('gzip',) if compression.media_type(content_type) == 'text/html' else None
+        encoding = compression.negotiate(request.headers.get('Accept-Encoding', ''), offered)
+        if encoding == 'gzip':
+            return super().process_response(request, response)
+        patch_vary_headers(response, ('Accept-Encoding',))
+        if encoding is None:
+            return response
+
+        if response.streaming:
+            if response.is_async:
+                response.streaming_content = compression.compress_async_sequence(response.streaming_content, encoding)
+            else:
+                response.streaming_content = compression.compress_sequence(response.streaming_content, encoding)
+            del response.headers['Content-Length']
+        else:
+            compressed = compression.compress(response.content, encoding, compression.RESPONSE_LEVELS[encoding])
+            if len(compressed) >= len(response.content):
+                return response
+            response.content = compressed
+            response.headers['Content-Length'] = str(len(compressed))
+
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response.headers['ETag'] = 'W/' + etag
+        response.headers['Content-Encoding'] = encoding
+        return response
@@ -0,0 +1,29 @@
+# Generated by Django 5.1.4 on 2026-10-17 09:12
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('payments', '0010_bankaccount_excel_upload_course_excel_upload_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PaymentRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('granularity', models.CharField(choices=[('day', 'Day'), ('week', 'Week'), ('month', 'Month'), ('year', 'Year')], max_length=5)),
+                ('bucket_start', models.DateField()),
+                ('total', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('count', models.IntegerField(default=0)),
+                ('category', models.ForeignKey(on_delete=django.db.models.deletion.DO_NOTHING, related_name='rollups', to='payments.paymentcategory')),
+                ('payment_type', models.ForeignKey(on_delete=django.db.models.deletion.DO_NOTHING, related_name='rollups', to='payments.paymenttype')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('granularity', 'bucket_start', 'payment_type', 'category'), name='unique_payment_rollup_bucket')],
+            },
+        ),
+    ]
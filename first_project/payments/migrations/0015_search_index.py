@@ -0,0 +1,53 @@
+from django.db import migrations
+
+# kind code, source table, title column, body column. Index rows use rowid = object id * 8 + kind code, so
+# the triggers find an entry by rowid instead of scanning the index.
+SOURCES = (
+    (1, 'payments_payment', 'name', 'info_text'),
+    (2, 'payments_person', 'name', 'national_id'),
+    (3, 'payments_student', 'name', 'national_id'),
+    (4, 'payments_teacher', 'name', 'national_id'),
+    (5, 'payments_course', 'title', 'NULL'),
+)
+
+
+def row(prefix, column):
+    return column if column == 'NULL' else f'{prefix}.{column}'
+
+
+def triggers(code, table, title, body):
+    changed = ', '.join(column for column in (title, body) if column != 'NULL')
+    insert = (f'INSERT INTO payments_search (rowid, title, body) '
+              f'VALUES (new.id * 8 + {code}, {row("new", title)}, {row("new", body)});')
+    delete = f'DELETE FROM payments_search WHERE rowid = old.id * 8 + {code};'
+    return [
+        f'CREATE TRIGGER {table}_search_ai AFTER INSERT ON {table} BEGIN {insert} END',
+        f'CREATE TRIGGER {table}_search_au AFTER UPDATE OF {changed} ON {table} BEGIN {delete} {insert} END',
+        f'CREATE TRIGGER {table}_search_ad AFTER DELETE ON {table} BEGIN {delete} END',
+    ]
+
+
+def forwards_sql():
+    statements = ["CREATE VIRTUAL TABLE payments_search USING fts5(title, body, tokenize='unicode61 remove_diacritics 2')"]
+    for code, table, title, body in SOURCES:
+        statements.extend(triggers(code, table, title, body))
+        statements.append(f'INSERT INTO payments_search (rowid, title, body) '
+                          f'SELECT id * 8 + {code}, {title}, {body} FROM {table}')
+    return statements
+
+
+def backwards_sql():
+    statements = [f'DROP TRIGGER IF EXISTS {table}_search_{suffix}'
+                  for _, table, _, _ in SOURCES for suffix in ('ai', 'au', 'ad')]
+    return statements + ['DROP TABLE IF EXISTS payments_search']
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('payments', '0014_changelog'),
+    ]
+
+    operations = [
+        migrations.RunSQL(forwards_sql(), backwards_sql()),
+    ]
@@ -0,0 +1,50 @@
+from django.db import migrations
+from django.db.models import Count, Sum
+from django.db.models.functions import TruncDay, TruncMonth, TruncWeek, TruncYear
+
+# Granularity -> function giving the start of the bucket, as in ``payments.aggregation.SCALES`` when this
+# migration was written. Kept here so later changes to the app code cannot change what the migration does.
+SCALES = {
+    'day': TruncDay,
+    'week': TruncWeek,
+    'month': TruncMonth,
+    'year': TruncYear,
+}
+
+
+def backfill(apps, schema_editor):
+    # 0011 created the rollup table empty, and the unfiltered dashboard summary reads its chart series only
+    # from rollups, so fill it from the payments already in the database.
+    Payment = apps.get_model('payments', 'Payment')
+    PaymentRollup = apps.get_model('payments', 'PaymentRollup')
+
+    PaymentRollup.objects.all().delete()
+    for granularity, trunc in SCALES.items():
+        rows = (
+            Payment.objects.annotate(bucket=trunc('datetime'))
+            .values('bucket', 'payment_type_id', 'category_id')
+            .annotate(total=Sum('amount'), count=Count('id'))
+            .order_by()
+        )
+        PaymentRollup.objects.bulk_create([
+            PaymentRollup(
+                granularity=granularity,
+                bucket_start=row['bucket'].date(),
+                payment_type_id=row['payment_type_id'],
+                category_id=row['category_id'],
+                total=row['total'],
+                count=row['count'],
+            )
+            for row in rows
+        ], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('payments', '0016_payment_installment_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill, migrations.RunPython.noop),
+    ]
@@ -1,5 +1,6 @@
 from django.db import models
 from django.core.exceptions import ValidationError
+from django.utils import timezone
 
 
 class Person(models.Model):
@@ -72,10 +73,46 @@ class Payment(models.Model):
     related_bank_account = models.ForeignKey(BankAccount, on_delete=models.DO_NOTHING, null=True, blank=True,
                                              related_name='payments')
 
+    class Meta:
+        # One index per filter the views and admin combine with a date range or newest-first order.
+        indexes = [
+            models.Index(fields=['related_person', 'datetime'], name='payment_person_date_idx'),
+            models.Index(fields=['related_bank_account', 'datetime'], name='payment_account_date_idx'),
+            models.Index(fields=['category', 'datetime'], name='payment_category_date_idx'),
+            models.Index(fields=['status', 'datetime'], name='payment_status_date_idx'),
+            models.Index(fields=['payment_type', 'datetime'], name='payment_type_date_idx'),
+            models.Index(fields=['amount'], name='payment_amount_idx'),
+        ]
+
     def __str__(self):
         return self.name
 
 
+class PaymentRollup(models.Model):
+    GRANULARITY_CHOICES = [
+        ('day', 'Day'),
+        ('week', 'Week'),
+        ('month', 'Month'),
+        ('year', 'Year'),
+    ]
+
+    granularity = models.CharField(max_length=5, choices=GRANULARITY_CHOICES)
+    bucket_start = models.DateField()
+    payment_type = models.ForeignKey(PaymentType, on_delete=models.DO_NOTHING, related_name='rollups')
+    category = models.ForeignKey(PaymentCategory, on_delete=models.DO_NOTHING, related_name='rollups')
+    total = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    count = models.IntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['granularity', 'bucket_start', 'payment_type', 'category'],
+                                    name='unique_payment_rollup_bucket'),
+        ]
+
+    def __str__(self):
+        return f"{self.get_granularity_display()} {self.bucket_start}: {self.total}"
+
+
 class PaymentFile(models.Model):
     payment = models.ForeignKey(Payment, on_delete=models.DO_NOTHING, related_name='files')
     file = models.FileField(upload_to='files_record/payment_files/')
@@ -215,6 +252,12 @@ class Installment(models.Model):
         related_name='installments'
     )
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['status', 'due_date'], name='installment_status_due_idx'),
+            models.Index(fields=['due_date'], name='installment_due_idx'),
+        ]
+
     def __str__(self):
         return f"Installment {self.id} for Payment Agreement {self.payment_agreement.id}"
 
@@ -224,3 +267,64 @@ class InstallmentStatus(models.Model):
 
     def __str__(self):
         return self.title
+
+
+class ImportJob(models.Model):
+    STATUS_CHOICES = [
+        ('queued', 'Queued'),
+        ('running', 'Running'),
+        ('done', 'Done'),
+        ('failed', 'Failed'),
+    ]
+
+    model_name = models.CharField(max_length=100)
+    file = models.FileField(upload_to='files_record/import_jobs/')
+    dry_run = models.BooleanField(default=False)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='queued', db_index=True)
+    rows_processed = models.IntegerField(default=0)
+    rows_created = models.IntegerField(default=0)
+    rows_skipped = models.IntegerField(default=0)
+    rows_failed = models.IntegerField(default=0)
+    errors = models.JSONField(default=list, blank=True)
+    message = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    @property
+    def throughput(self):
+        """Rows processed per second since the job started."""
+        if not self.started_at:
+            return 0.0
+        end = self.finished_at or timezone.now()
+        elapsed = (end - self.started_at).total_seconds()
+        return round(self.rows_processed / elapsed, 1) if elapsed > 0 else 0.0
+
+    def __str__(self):
+        return f"Import of {self.model_name} ({self.get_status_display()})"
+
+
+class ChangeLog(models.Model):
+    """Append-only record of every payment and installment write; ``id`` is the sync sequence number.
+
+    Deletes are kept as tombstones (``deleted=True``) so clients syncing with ``/api/payments/changes/``
+    learn about rows that no longer exist.
+    """
+    TABLE_CHOICES = [
+        ('payment', 'Payment'),
+        ('installment', 'Installment'),
+    ]
+
+    table = models.CharField(max_length=20, choices=TABLE_CHOICES)
+    object_id = models.BigIntegerField()
+    deleted = models.BooleanField(default=False)
+    changed_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['table', 'id'], name='changelog_table_seq_idx'),
+        ]
+
+    def __str__(self):
+        action = 'Deleted' if self.deleted else 'Changed'
+        return f"{action} {self.table} {self.object_id} (#{self.id})"
@@ -0,0 +1,82 @@
+import base64
+import json
+from datetime import date
+from decimal import Decimal
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+
+
+class CursorError(ValueError):
+    pass
+
+
+def encode_cursor(sort, value, pk):
+    # isoformat() rather than DjangoJSONEncoder, which truncates datetimes to milliseconds.
+    if isinstance(value, date):
+        value = value.isoformat()
+    elif isinstance(value, Decimal):
+        value = str(value)
+    payload = json.dumps([sort, value, pk], separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+
+def decode_cursor(token):
+    try:
+        padded = token + '=' * (-len(token) % 4)
+        sort, value, pk = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return sort, value, int(pk)
+    except (ValueError, TypeError):
+        raise CursorError('Invalid cursor')
+
+
+def page_size(value, default=DEFAULT_PAGE_SIZE):
+    if not value:
+        return default
+    try:
+        size = int(value)
+    except ValueError:
+        raise CursorError('limit must be an integer')
+    return max(1, min(size, MAX_PAGE_SIZE))
+
+
+def keyset_page(queryset, sort, cursor=None, limit=DEFAULT_PAGE_SIZE, fields=()):
+    """Return one page of ``queryset.values(*fields)`` ordered by ``sort`` and ``id`` plus the next cursor.
+
+    ``sort`` is a model field name, optionally prefixed with ``-``. The cursor carries the sort key and id
+    of the last row served, so every page is a single indexed range query regardless of its depth.
+    """
+    descending = sort.startswith('-')
+    field_name = sort.lstrip('-')
+    model_field = queryset.model._meta.get_field(field_name)
+
+    if cursor:
+        cursor_sort, raw_value, last_id = decode_cursor(cursor)
+        if cursor_sort != sort:
+            raise CursorError('Cursor does not match the requested sort')
+        try:
+            value = model_field.to_python(raw_value)
+        except ValidationError:
+            raise CursorError('Invalid cursor')
+        after = 'lt' if descending else 'gt'
+        queryset = queryset.filter(
+            Q(**{f'{field_name}__{after}': value}) | Q(**{field_name: value, f'id__{after}': last_id})
+        )
+
+    prefix = '-' if descending else ''
+    fields = list(fields)
+    selected = fields + [name for name in (field_name, 'id') if name not in fields]
+    rows = list(queryset.order_by(f'{prefix}{field_name}', f'{prefix}id').values(*selected)[:limit + 1])
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_cursor(sort, last[field_name], last['id'])
+    for row in rows:
+        for name in selected[len(fields):]:
+            row.pop(name)
+    return rows, next_cursor
@@ -0,0 +1,30 @@
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import connection
+from django.db.models.query import QuerySet
+
+
+def enabled():
+    return getattr(settings, 'PAYMENTS_PARALLEL_QUERIES', True)
+
+
+def evaluate_in_own_thread(rows):
+    try:
+        return list(rows)
+    finally:
+        connection.close()
+
+
+async def evaluate(rows):
+    """Evaluate a queryset (or ``lookups.labelled_values`` iterator) into a list from async code.
+
+    Django's async ORM runs every query on one shared thread, so ``asyncio.gather`` over it still queries
+    one at a time. With ``PAYMENTS_PARALLEL_QUERIES`` each evaluation gets a worker thread and database
+    connection of its own, so gathered sub-queries really overlap. Without it (tests wrap each test in a
+    transaction that other connections cannot see) querysets use the async ORM directly.
+    """
+    if enabled():
+        return await sync_to_async(evaluate_in_own_thread, thread_sensitive=False)(rows)
+    if isinstance(rows, QuerySet):
+        return [row async for row in rows]
+    return await sync_to_async(list)(rows)
@@ -0,0 +1,63 @@
+from pathlib import Path
+
+from openpyxl import load_workbook
+import pandas as pd
+
+DEFAULT_CHUNK_SIZE = 5000
+SUPPORTED_EXTENSIONS = ('.csv', '.xlsx', '.xlsm')
+WORKBOOK_EXTENSIONS = ('.xlsx', '.xlsm')
+
+
+def read_chunks(path, chunk_size=DEFAULT_CHUNK_SIZE, sheet_name=None):
+    """Yield the rows of a CSV or Excel file as DataFrames of at most ``chunk_size`` rows.
+
+    The DataFrame index keeps counting across chunks, so ``index + 2`` is always the spreadsheet row.
+    CSV is read with pandas ``chunksize`` and XLSX through openpyxl's read-only mode, so memory is
+    bounded by the chunk size rather than the file size.
+    """
+    extension = Path(str(path)).suffix.lower()
+    if extension == '.csv':
+        # Keep every cell as text so identifiers such as national ids keep their leading zeros.
+        yield from pd.read_csv(path, chunksize=chunk_size, dtype=str)
+    elif extension in WORKBOOK_EXTENSIONS:
+        yield from read_xlsx_chunks(path, chunk_size, sheet_name)
+    else:
+        raise ValueError(f"Unsupported file type '{extension}'. Upload one of: {', '.join(SUPPORTED_EXTENSIONS)}")
+
+
+def sheet_names(path):
+    extension = Path(str(path)).suffix.lower()
+    if extension not in WORKBOOK_EXTENSIONS:
+        raise ValueError(f"Workbook imports need one of: {', '.join(WORKBOOK_EXTENSIONS)}")
+    workbook = load_workbook(path, read_only=True)
+    try:
+        return list(workbook.sheetnames)
+    finally:
+        workbook.close()
+
+
+def read_xlsx_chunks(path, chunk_size, sheet_name=None):
+    workbook = load_workbook(path, read_only=True, data_only=True)
+    try:
+        worksheet = workbook[sheet_name] if sheet_name else workbook.active
+        rows = worksheet.iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            return
+        columns = [str(name) if name is not None else f'Unnamed: {i}' for i, name in enumerate(header)]
+        offset = 0
+        batch = []
+        for row in rows:
+            batch.append(row[:len(columns)])
+            if len(batch) >= chunk_size:
+                yield frame(batch, columns, offset)
+                offset += len(batch)
+                batch = []
+        if batch:
+            yield frame(batch, columns, offset)
+    finally:
+        workbook.close()
+
+
+def frame(rows, columns, offset):
+    return pd.DataFrame(rows, columns=columns, index=range(offset, offset + len(rows)))
@@ -0,0 +1,132 @@
+from datetime import timedelta
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import Count, F, Q, Sum
+from django.utils import timezone
+
+from .aggregation import INCOMING, OUTGOING, SCALES
+from .models import Payment, PaymentRollup
+
+GRANULARITIES = [choice for choice, _ in PaymentRollup.GRANULARITY_CHOICES]
+
+
+def truncate_date(day, granularity):
+    if granularity == 'day':
+        return day
+    if granularity == 'week':
+        return day - timedelta(days=day.weekday())
+    if granularity == 'month':
+        return day.replace(day=1)
+    if granularity == 'year':
+        return day.replace(month=1, day=1)
+    raise ValueError(f'Unknown granularity: {granularity}')
+
+
+def bucket_start(value, granularity):
+    """Return the first day of the bucket containing ``value``, matching the ``Trunc*`` functions."""
+    day = timezone.localtime(value).date() if timezone.is_aware(value) else value.date()
+    return truncate_date(day, granularity)
+
+
+def apply_change(payment_type_id, category_id, when, amount, count):
+    """Add ``amount``/``count`` (negative to subtract) to every rollup bucket containing ``when``."""
+    amount = Decimal(str(amount))
+    with transaction.atomic():
+        for granularity in GRANULARITIES:
+            key = {
+                'granularity': granularity,
+                'bucket_start': bucket_start(when, granularity),
+                'payment_type_id': payment_type_id,
+                'category_id': category_id,
+            }
+            updated = PaymentRollup.objects.filter(**key).update(total=F('total') + amount, count=F('count') + count)
+            if not updated and count > 0:
+                PaymentRollup.objects.create(total=amount, count=count, **key)
+            elif count < 0:
+                PaymentRollup.objects.filter(count__lte=0, **key).delete()
+
+
+def add_payment(payment):
+    apply_change(payment.payment_type_id, payment.category_id, payment.datetime, payment.amount, 1)
+
+
+def remove_payment(payment):
+    apply_change(payment.payment_type_id, payment.category_id, payment.datetime, -Decimal(str(payment.amount)), -1)
+
+
+def add_payments(payments):
+    """Fold a batch of new payments into the rollups, one write per touched bucket."""
+    buckets = {}
+    for payment in payments:
+        for granularity in GRANULARITIES:
+            key = (granularity, bucket_start(payment.datetime, granularity), payment.payment_type_id,
+                   payment.category_id)
+            total, count = buckets.get(key, (Decimal('0'), 0))
+            buckets[key] = (total + Decimal(str(payment.amount)), count + 1)
+
+    with transaction.atomic():
+        for (granularity, start, payment_type_id, category_id), (total, count) in buckets.items():
+            key = {
+                'granularity': granularity,
+                'bucket_start': start,
+                'payment_type_id': payment_type_id,
+                'category_id': category_id,
+            }
+            updated = PaymentRollup.objects.filter(**key).update(total=F('total') + total, count=F('count') + count)
+            if not updated:
+                PaymentRollup.objects.create(total=total, count=count, **key)
+
+
+def rebuild(batch_size=1000):
+    """Recompute every rollup bucket from the payments table with one GROUP BY per granularity."""
+    created = 0
+    with transaction.atomic():
+        PaymentRollup.objects.all().delete()
+        for granularity in GRANULARITIES:
+            rows = (
+                Payment.objects.annotate(bucket=SCALES[granularity]('datetime'))
+                .values('bucket', 'payment_type_id', 'category_id')
+                .annotate(total=Sum('amount'), count=Count('id'))
+                .order_by()
+            )
+            rollups = [
+                PaymentRollup(
+                    granularity=granularity,
+                    bucket_start=row['bucket'].date(),
+                    payment_type_id=row['payment_type_id'],
+                    category_id=row['category_id'],
+                    total=row['total'],
+                    count=row['count'],
+                )
+                for row in rows
+            ]
+            PaymentRollup.objects.bulk_create(rollups, batch_size=batch_size)
+            created += len(rollups)
+    return created
+
+
+def series(granularity, start=None, end=None, payment_types=None, categories=None):
+    """Per-bucket incoming/outgoing/other totals read from the rollup table."""
+    rollups = PaymentRollup.objects.filter(granularity=granularity)
+    if start:
+        rollups = rollups.filter(bucket_start__gte=truncate_date(start, granularity))
+    if end:
+        rollups = rollups.filter(bucket_start__lte=end)
+    if payment_types:
+        rollups = rollups.filter(payment_type_id__in=payment_types)
+    if categories:
+        rollups = rollups.filter(category_id__in=categories)
+
+    rows = (
+        rollups.values(bucket=F('bucket_start'))
+        .annotate(
+            incoming=Sum('total', filter=Q(payment_type__title=INCOMING), default=0),
+            outgoing=Sum('total', filter=Q(payment_type__title=OUTGOING), default=0),
+            other=Sum('total', filter=~Q(payment_type__title__in=[INCOMING, OUTGOING]), default=0),
+            count=Sum('count'),
+        )
+        .order_by('bucket')
+    )
+    return [{**row, 'bucket': row['bucket'].isoformat()} for row in rows]
+
@@ -0,0 +1,89 @@
+import re
+
+from django.db import connection, transaction
+from django.urls import reverse
+
+from .models import Course, Payment, Person, Student, Teacher
+
+# Kind code (the low three bits of the index rowid, see migration 0015), name, model, indexed title and body
+# columns and the detail page of each hit.
+KINDS = {
+    1: ('payment', Payment, 'name', 'info_text', 'payment_detail'),
+    2: ('person', Person, 'name', 'national_id', None),
+    3: ('student', Student, 'name', 'national_id', 'student_detail'),
+    4: ('teacher', Teacher, 'name', 'national_id', 'teacher_detail'),
+    5: ('course', Course, 'title', None, 'course_detail'),
+}
+KIND_CODES = {name: code for code, (name, *_) in KINDS.items()}
+
+MAX_TERMS = 10
+# Matches in the title count ten times as much as matches in the body.
+TITLE_WEIGHT = 10.0
+
+
+class SearchError(ValueError):
+    pass
+
+
+def match_expression(q):
+    """Turn user input into an FTS5 query: every word must match, as a prefix, in any column.
+
+    Words are quoted, so FTS5 operators and punctuation in the input are searched as text instead of
+    being parsed.
+    """
+    terms = re.findall(r'\w+', q or '')[:MAX_TERMS]
+    if not terms:
+        raise SearchError('q must contain at least one letter or digit')
+    return ' '.join(f'"{term}"*' for term in terms)
+
+
+def parse_kinds(value):
+    if not value:
+        return None
+    names = [name.strip() for name in value.split(',') if name.strip()]
+    unknown = [name for name in names if name not in KIND_CODES]
+    if unknown:
+        raise SearchError(f"Unknown type: {', '.join(unknown)}. Choose from {', '.join(KIND_CODES)}")
+    return [KIND_CODES[name] for name in names]
+
+
+def search(q, kinds=None, limit=50, offset=0):
+    """Ranked hits for ``q`` across payments, people, students, teachers and courses.
+
+    Returns ``(hits, more)``; each hit is ``{'type', 'id', 'title', 'detail', 'url'}``, best match first.
+    """
+    sql = 'SELECT rowid, title, body FROM payments_search WHERE payments_search MATCH %s'
+    params = [match_expression(q)]
+    if kinds:
+        sql += f" AND rowid %% 8 IN ({', '.join(['%s'] * len(kinds))})"
+        params.extend(kinds)
+    sql += ' ORDER BY bm25(payments_search, %s, 1.0), rowid LIMIT %s OFFSET %s'
+    params.extend([TITLE_WEIGHT, limit + 1, offset])
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        rows = cursor.fetchall()
+
+    hits = []
+    for rowid, title, body in rows[:limit]:
+        object_id, code = divmod(rowid, 8)
+        name, _, _, _, url_name = KINDS[code]
+        hits.append({
+            'type': name,
+            'id': object_id,
+            'title': title,
+            'detail': body,
+            'url': reverse(url_name, args=[object_id]) if url_name else None,
+        })
+    return hits, len(rows) > limit
+
+
+def rebuild():
+    """Refill the index from the source tables, e.g. after loading data with the triggers dropped."""
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute('DELETE FROM payments_search')
+        for code, (_, model, title, body, _) in KINDS.items():
+            table = model._meta.db_table
+            cursor.execute(f'INSERT INTO payments_search (rowid, title, body) '
+                           f'SELECT id * 8 + {code}, {title}, {body or "NULL"} FROM {table}')
+        cursor.execute('SELECT count(*) FROM payments_search')
+        return cursor.fetchone()[0]
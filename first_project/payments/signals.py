@@ -0,0 +1,85 @@
+from django.apps import apps
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import Signal, receiver
+
+from . import caching, changes, events, lookups, rollups
+from .models import Payment, ImportJob, PaymentRollup, ChangeLog
+
+# Sent by the bulk importer after ``bulk_create``, which bypasses ``post_save``. Receives ``instances``.
+bulk_imported = Signal()
+
+
+@receiver(pre_save, sender=Payment)
+def remember_previous_payment(sender, instance, **kwargs):
+    instance._previous_state = None
+    if instance.pk:
+        instance._previous_state = Payment.objects.filter(pk=instance.pk).only(
+            'amount', 'datetime', 'payment_type_id', 'category_id'
+        ).first()
+
+
+@receiver(post_save, sender=Payment)
+def update_rollups_on_save(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    previous = getattr(instance, '_previous_state', None)
+    if previous is not None:
+        rollups.remove_payment(previous)
+    rollups.add_payment(instance)
+
+
+@receiver(post_delete, sender=Payment)
+def update_rollups_on_delete(sender, instance, **kwargs):
+    rollups.remove_payment(instance)
+
+
+@receiver(bulk_imported, sender=Payment)
+def update_rollups_on_import(sender, instances, **kwargs):
+    # Only once the imported rows are committed, so an import that rolls back leaves the rollups alone.
+    transaction.on_commit(lambda: rollups.add_payments(instances))
+
+
+def invalidate_dimension(sender, **kwargs):
+    # Drop the local copy now and bump the shared version again once the change is visible to others.
+    lookups.dimensions.invalidate(sender)
+    transaction.on_commit(lambda: lookups.dimensions.invalidate(sender))
+
+
+for dimension in lookups.DIMENSIONS:
+    for signal in (post_save, post_delete, bulk_imported):
+        signal.connect(invalidate_dimension, sender=dimension, dispatch_uid=f'invalidate_{dimension.__name__}')
+
+
+def log_and_announce(model, ids, deleted=False):
+    token = changes.record(model, ids, deleted=deleted)
+    table = changes.TRACKED[model]
+    transaction.on_commit(lambda: events.publish_change(table, ids, deleted=deleted, token=token))
+
+
+def record_change(sender, instance, raw=False, **kwargs):
+    if not raw:
+        log_and_announce(sender, [instance.pk])
+
+
+def record_delete(sender, instance, **kwargs):
+    log_and_announce(sender, [instance.pk], deleted=True)
+
+
+def record_import(sender, instances, **kwargs):
+    log_and_announce(sender, [instance.pk for instance in instances])
+
+
+for tracked in changes.TRACKED:
+    post_save.connect(record_change, sender=tracked, dispatch_uid=f'change_{tracked.__name__}')
+    post_delete.connect(record_delete, sender=tracked, dispatch_uid=f'delete_{tracked.__name__}')
+    bulk_imported.connect(record_import, sender=tracked, dispatch_uid=f'import_{tracked.__name__}')
+
+
+# Any change to the tables the read APIs serve moves their ETags on. Rollups only change with payments,
+# and import jobs and the change log are read through uncached endpoints.
+for model in apps.get_app_config('payments').get_models():
+    if model in (ImportJob, PaymentRollup, ChangeLog):
+        continue
+    for signal in (post_save, post_delete, bulk_imported):
+        signal.connect(caching.table_changed, sender=model, dispatch_uid=f'version_{model.__name__}')
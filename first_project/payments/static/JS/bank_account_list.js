@@ -0,0 +1,384 @@
+const bankAccountsPerPage = 5;
+let currentPage = 1;
+let totalPages = 1;
+let totalBankAccounts = 0;
+let filteredDataGlobal = [];
+let isEditMode = false;
+let selectedBankAccounts = new Set();
+let isAllSelected = false;
+
+const urlParams = new URLSearchParams(window.location.search);
+const pageParam = urlParams.get('page');
+if (pageParam) {
+    currentPage = parseInt(pageParam);
+}
+
+const storedSelectedRows = sessionStorage.getItem('selectedBankAccounts');
+if (storedSelectedRows) {
+    selectedBankAccounts = new Set(JSON.parse(storedSelectedRows));
+}
+
+const toggleSortButton = document.getElementById('toggle-sort-button');
+const sortContainer = document.getElementById('sort-container');
+let isSortVisible = false;
+
+let sortStates = {
+    'sort-bank-name': { asc: true },
+    'sort-bank-number': { asc: true },
+    'sort-method': { asc: true },
+    'sort-type': { asc: true },
+    'sort-related-person': { asc: true },
+    'sort-category': { asc: true },
+    'sort-status': { asc: true }
+};
+
+toggleSortButton.addEventListener('click', () => {
+    isSortVisible = !isSortVisible;
+    sortContainer.classList.toggle('hidden', !isSortVisible);
+    sortContainer.classList.toggle('visible', isSortVisible);
+
+    const icon = toggleSortButton.querySelector('i');
+    icon.className = isSortVisible ? 'fa-solid fa-angles-right' : 'fa-solid fa-angles-left';
+});
+
+function sortTable(columnIndex, sortId) {
+    const table = document.querySelector('#bank-account-table tbody');
+    const rows = Array.from(table.rows);
+    const sortState = sortStates[sortId];
+    sortState.asc = !sortState.asc;
+
+    rows.sort((a, b) => {
+        const textA = a.cells[columnIndex].textContent.trim().toLowerCase();
+        const textB = b.cells[columnIndex].textContent.trim().toLowerCase();
+        return sortState.asc ? textA.localeCompare(textB) : textB.localeCompare(textA);
+    });
+
+    table.innerHTML = '';
+    rows.forEach(row => table.appendChild(row));
+
+    updateSortIcon(sortId, sortState.asc);
+}
+
+function updateSortIcon(sortId, isAscending) {
+    const sortElement = document.getElementById(sortId);
+    const icon = sortElement.querySelector('i');
+    icon.className = isAscending ? 'fa-solid fa-arrow-up-wide-short' : 'fa-solid fa-arrow-up-short-wide';
+}
+
+function resetAndRender() {
+    currentPage = 1;
+    renderBankAccounts();
+}
+
+function renderBankAccounts() {
+    const bankAccountTableBody = document.querySelector('#bank-account-table tbody');
+    bankAccountTableBody.innerHTML = '';
+
+    fetch('/api/bank-accounts/?payments_limit=1')
+        .then(response => response.json())
+        .then(data => {
+            filteredDataGlobal = filterData(data);
+            totalBankAccounts = filteredDataGlobal.length;
+            totalPages = Math.ceil(totalBankAccounts / bankAccountsPerPage);
+            if (currentPage < 1) currentPage = 1;
+            if (currentPage > totalPages) currentPage = totalPages;
+            const start = (currentPage - 1) * bankAccountsPerPage;
+            const end = start + bankAccountsPerPage;
+            const pageData = filteredDataGlobal.slice(start, end);
+
+            pageData.forEach(bankAccount => {
+                const row = document.createElement('tr');
+                row.innerHTML = `
+                    <td>
+                        ${isEditMode ? `<div class="select-circle ${selectedBankAccounts.has(bankAccount.id) ? 'selected' : ''}" data-id="${bankAccount.id}"></div>` : ''}
+                    </td>
+                    <td>${bankAccount.name}</td>
+                    <td>${bankAccount.bank_number}</td>
+                    <td>${bankAccount.payments[0]?.name || 'N/A'}</td>
+                    <td>${bankAccount.payments[0]?.amount || 'N/A'}</td>
+                    <td>${bankAccount.payments[0]?.datetime || 'N/A'}</td>
+                    <td>${bankAccount.payments[0]?.status__title || 'N/A'}</td>
+                    <td>${bankAccount.payments[0]?.payment_method__title || 'N/A'}</td>
+                    <td>${bankAccount.payments[0]?.category__name || 'N/A'}</td>
+                    <td>${bankAccount.payments[0]?.payment_type__title || 'N/A'}</td>
+                    <td>${bankAccount.payments[0]?.related_person__name || 'N/A'}</td>
+                `;
+                if (isEditMode) {
+                    const circle = row.querySelector('.select-circle');
+                    circle.addEventListener('click', (e) => {
+                        e.stopPropagation();
+                        circle.classList.toggle('selected');
+                        const bankAccountId = parseInt(circle.getAttribute('data-id'));
+                        if (circle.classList.contains('selected')) {
+                            selectedBankAccounts.add(bankAccountId);
+                        } else {
+                            selectedBankAccounts.delete(bankAccountId);
+                        }
+                        isAllSelected = false;
+                        renderSelectedRows();
+                    });
+                } else {
+                    row.addEventListener('click', () => {
+                        window.location.href = `/bank-account-detail/${bankAccount.id}/`;
+                    });
+                }
+                bankAccountTableBody.appendChild(row);
+            });
+
+            renderPagination();
+            renderSelectedRows();
+        })
+        .catch(error => {
+            console.error('Error fetching bank accounts:', error);
+        });
+}
+
+function renderSelectedRows() {
+    const selectedRowsContainer = document.getElementById('selected-rows-container');
+    const selectedRowsList = document.getElementById('selected-rows-list');
+    selectedRowsList.innerHTML = '';
+
+    if (selectedBankAccounts.size > 0) {
+        selectedRowsContainer.style.display = 'block';
+        filteredDataGlobal.forEach(bankAccount => {
+            if (selectedBankAccounts.has(bankAccount.id)) {
+                const selectedRow = document.createElement('div');
+                selectedRow.className = 'selected-row';
+                selectedRow.innerHTML = `
+                    <span>${bankAccount.name}</span>
+                    <span>${bankAccount.bank_number}</span>
+                    <span>${bankAccount.payments[0]?.name || 'N/A'}</span>
+                    <span>${bankAccount.payments[0]?.amount || 'N/A'}</span>
+                    <span>${bankAccount.payments[0]?.datetime || 'N/A'}</span>
+                    <span>${bankAccount.payments[0]?.status__title || 'N/A'}</span>
+                    <span>${bankAccount.payments[0]?.payment_method__title || 'N/A'}</span>
+                    <span>${bankAccount.payments[0]?.category__name || 'N/A'}</span>
+                    <span>${bankAccount.payments[0]?.payment_type__title || 'N/A'}</span>
+                    <span>${bankAccount.payments[0]?.related_person__name || 'N/A'}</span>
+                `;
+                selectedRowsList.appendChild(selectedRow);
+            }
+        });
+    } else {
+        selectedRowsContainer.style.display = 'none';
+    }
+}
+
+function renderPagination() {
+    const paginationContainer = document.getElementById('pagination');
+    paginationContainer.innerHTML = '';
+
+    const firstPageButton = createPageButton(1);
+    paginationContainer.appendChild(firstPageButton);
+
+    if (currentPage > 3) {
+        const dotsBefore = document.createElement('span');
+        dotsBefore.className = 'dots';
+        dotsBefore.textContent = '...';
+        paginationContainer.appendChild(dotsBefore);
+    }
+
+    let startPage = Math.max(2, currentPage - 1);
+    let endPage = Math.min(totalPages - 1, currentPage + 1);
+
+    for (let i = startPage; i <= endPage; i++) {
+        const button = createPageButton(i);
+        paginationContainer.appendChild(button);
+    }
+
+    if (currentPage < totalPages - 2) {
+        const dotsAfter = document.createElement('span');
+        dotsAfter.className = 'dots';
+        dotsAfter.textContent = '...';
+        paginationContainer.appendChild(dotsAfter);
+    }
+
+    if (totalPages > 1) {
+        const lastPageButton = createPageButton(totalPages);
+        paginationContainer.appendChild(lastPageButton);
+    }
+
+    if (currentPage > 1) {
+        const leftArrow = document.createElement('img');
+        leftArrow.src = paginationContainer.dataset.previousIcon;
+        leftArrow.alt = 'Previous Page';
+        leftArrow.addEventListener('click', () => {
+            currentPage -= 1;
+            renderBankAccounts();
+        });
+        paginationContainer.insertBefore(leftArrow, paginationContainer.firstChild);
+    }
+
+    if (currentPage < totalPages) {
+        const rightArrow = document.createElement('img');
+        rightArrow.src = paginationContainer.dataset.nextIcon;
+        rightArrow.alt = 'Next Page';
+        rightArrow.addEventListener('click', () => {
+            currentPage += 1;
+            renderBankAccounts();
+        });
+        paginationContainer.appendChild(rightArrow);
+    }
+}
+
+function createPageButton(pageNumber) {
+    const button = document.createElement('button');
+    button.className = 'page-button';
+    if (pageNumber === currentPage) {
+        button.classList.add('active');
+    }
+    button.textContent = pageNumber;
+    button.addEventListener('click', () => {
+        currentPage = pageNumber;
+        renderBankAccounts();
+    });
+    return button;
+}
+
+function filterData(data) {
+    const generalFilter = document.getElementById('general-filter').value.toLowerCase();
+    const startDate = document.getElementById('start-date-filter').value;
+    const endDate = document.getElementById('end-date-filter').value;
+
+    return data.filter(bankAccount => {
+        const nameMatch = bankAccount.name.toLowerCase().includes(generalFilter);
+        const bankNumberMatch = bankAccount.bank_number.toLowerCase().includes(generalFilter);
+        const paymentNameMatch = bankAccount.payments.some(payment => payment.name.toLowerCase().includes(generalFilter));
+        const amountMatch = bankAccount.payments.some(payment => payment.amount.toString().includes(generalFilter));
+
+        const paymentDate = new Date(bankAccount.payments[0]?.datetime || '');
+        const filterStartDate = startDate ? new Date(startDate) : null;
+        const filterEndDate = endDate ? new Date(endDate) : null;
+
+        const dateMatch = (!filterStartDate || paymentDate >= filterStartDate) &&
+                         (!filterEndDate || paymentDate <= filterEndDate);
+
+        return (nameMatch || bankNumberMatch || paymentNameMatch || amountMatch) && dateMatch;
+    });
+}
+
+function printTable(tableId) {
+    const table = document.getElementById(tableId);
+    if (!table) {
+        alert('Table not found!');
+        return;
+    }
+
+    let rowsToPrint = [];
+    if (isEditMode && selectedBankAccounts.size > 0) {
+        rowsToPrint = filteredDataGlobal.filter(bankAccount => selectedBankAccounts.has(bankAccount.id));
+    } else {
+        rowsToPrint = filteredDataGlobal;
+    }
+
+    if (rowsToPrint.length === 0) {
+        alert('No rows selected to print!');
+        return;
+    }
+
+    const w = window.open('', '', 'height=500,width=800');
+    w.document.write('<html><head><title>Print Table</title>');
+    w.document.write('<style>table { width: 100%; border-collapse: collapse; } th, td { border: 1px solid #000; padding: 8px; }</style>');
+    w.document.write('</head><body>');
+    w.document.write('<table>');
+    w.document.write('<thead><tr><th>Bank Name</th><th>Bank Number</th><th>Name</th><th>Amount</th><th>Date</th><th>Status</th><th>Method</th><th>Category</th><th>Type</th><th>Related Person</th></tr></thead>');
+    w.document.write('<tbody>');
+    rowsToPrint.forEach(bankAccount => {
+        w.document.write(`
+            <tr>
+                <td>${bankAccount.name}</td>
+                <td>${bankAccount.bank_number}</td>
+                <td>${bankAccount.payments[0]?.name || 'N/A'}</td>
+                <td>${bankAccount.payments[0]?.amount || 'N/A'}</td>
+                <td>${bankAccount.payments[0]?.datetime || 'N/A'}</td>
+                <td>${bankAccount.payments[0]?.status__title || 'N/A'}</td>
+                <td>${bankAccount.payments[0]?.payment_method__title || 'N/A'}</td>
+                <td>${bankAccount.payments[0]?.category__name || 'N/A'}</td>
+                <td>${bankAccount.payments[0]?.payment_type__title || 'N/A'}</td>
+                <td>${bankAccount.payments[0]?.related_person__name || 'N/A'}</td>
+            </tr>
+        `);
+    });
+    w.document.write('</tbody>');
+    w.document.write('</table>');
+    w.document.write('</body></html>');
+    w.document.close();
+    w.print();
+}
+
+function exportToCSV(tableId) {
+    const table = document.getElementById(tableId);
+    if (!table) {
+        alert('Table not found!');
+        return;
+    }
+
+    let rowsToExport = [];
+    if (isEditMode && selectedBankAccounts.size > 0) {
+        rowsToExport = filteredDataGlobal.filter(bankAccount => selectedBankAccounts.has(bankAccount.id));
+    } else {
+        rowsToExport = filteredDataGlobal;
+    }
+
+    if (rowsToExport.length === 0) {
+        alert('No rows selected to export!');
+        return;
+    }
+
+    let csv = 'Bank Name,Bank Number,Name,Amount,Date,Status,Method,Category,Type,Related Person\n';
+    rowsToExport.forEach(bankAccount => {
+        csv += `${bankAccount.name},${bankAccount.bank_number},${bankAccount.payments[0]?.name || 'N/A'},${bankAccount.payments[0]?.amount || 'N/A'},${bankAccount.payments[0]?.datetime || 'N/A'},${bankAccount.payments[0]?.status__title || 'N/A'},${bankAccount.payments[0]?.payment_method__title || 'N/A'},${bankAccount.payments[0]?.category__name || 'N/A'},${bankAccount.payments[0]?.payment_type__title || 'N/A'},${bankAccount.payments[0]?.related_person__name || 'N/A'}\n`;
+    });
+    const blob = new Blob([csv], { type: 'text/csv;charset=utf-8;' });
+    const link = document.createElement('a');
+    link.href = URL.createObjectURL(blob);
+    link.download = tableId + '_data.csv';
+    link.style.display = 'none';
+    document.body.appendChild(link);
+    link.click();
+    document.body.removeChild(link);
+}
+
+document.getElementById('edit-button').addEventListener('click', () => {
+    isEditMode = !isEditMode;
+    selectedBankAccounts.clear();
+    isAllSelected = false;
+    document.getElementById('select-all-button').style.display = isEditMode ? 'inline-block' : 'none';
+    document.getElementById('selected-rows-container').style.display = isEditMode ? 'block' : 'none';
+    renderBankAccounts();
+});
+
+document.getElementById('select-all-button').addEventListener('click', () => {
+    const currentPageData = filteredDataGlobal.slice(
+        (currentPage - 1) * bankAccountsPerPage,
+        currentPage * bankAccountsPerPage
+    );
+    if (isAllSelected) {
+        currentPageData.forEach(bankAccount => selectedBankAccounts.delete(bankAccount.id));
+        isAllSelected = false;
+    } else {
+        currentPageData.forEach(bankAccount => selectedBankAccounts.add(bankAccount.id));
+        isAllSelected = true;
+    }
+    renderBankAccounts();
+});
+
+document.getElementById('general-filter').addEventListener('input', resetAndRender);
+
+const toggleDateFilterButton = document.getElementById('toggle-date-filter-button');
+const dateFilterContainer = document.getElementById('date-filter-container');
+let isDateFilterVisible = false;
+
+toggleDateFilterButton.addEventListener('click', () => {
+    isDateFilterVisible = !isDateFilterVisible;
+    dateFilterContainer.classList.toggle('hidden', !isDateFilterVisible);
+    dateFilterContainer.classList.toggle('visible', isDateFilterVisible);
+
+    const icon = toggleDateFilterButton.querySelector('i');
+    icon.className = isDateFilterVisible ? 'fa-solid fa-calendar-days' : 'fa-solid fa-calendar-days';
+});
+
+document.getElementById('start-date-filter').addEventListener('change', resetAndRender);
+document.getElementById('end-date-filter').addEventListener('change', resetAndRender);
+
+renderBankAccounts();
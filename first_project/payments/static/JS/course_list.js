@@ -0,0 +1,366 @@
+const coursesPerPage = 5;
+let currentPage = 1;
+let totalPages = 1;
+let totalCourses = 0;
+let filteredDataGlobal = [];
+let isEditMode = false;
+let selectedCourses = new Set();
+let isAllSelected = false;
+
+const urlParams = new URLSearchParams(window.location.search);
+const pageParam = urlParams.get('page');
+if (pageParam) {
+    currentPage = parseInt(pageParam);
+}
+
+const storedSelectedRows = sessionStorage.getItem('selectedCourses');
+if (storedSelectedRows) {
+    selectedCourses = new Set(JSON.parse(storedSelectedRows));
+}
+
+const toggleDateFilterButton = document.getElementById('toggle-date-filter-button');
+const dateFilterContainer = document.getElementById('date-filter-container');
+const startDateFilter = document.getElementById('start-date-filter');
+const endDateFilter = document.getElementById('end-date-filter');
+const sortContainer = document.getElementById('sort-container');
+let isDateFilterVisible = false;
+
+let sortStates = {
+    'sort-title': { asc: true },
+    'sort-teacher': { asc: true },
+    'sort-olympiad': { asc: true }
+};
+
+toggleDateFilterButton.addEventListener('click', () => {
+    isDateFilterVisible = !isDateFilterVisible;
+    dateFilterContainer.classList.toggle('hidden', !isDateFilterVisible);
+    dateFilterContainer.classList.toggle('visible', isDateFilterVisible);
+    sortContainer.classList.toggle('hidden', !isDateFilterVisible);
+    sortContainer.classList.toggle('visible', isDateFilterVisible);
+
+    const icon = toggleDateFilterButton.querySelector('i');
+    icon.className = isDateFilterVisible ? 'fa-solid fa-angles-right' : 'fa-solid fa-angles-left';
+
+    if (!isDateFilterVisible) {
+        startDateFilter.value = '';
+        endDateFilter.value = '';
+        resetAndRender();
+    }
+});
+
+startDateFilter.addEventListener('change', resetAndRender);
+endDateFilter.addEventListener('change', resetAndRender);
+
+function sortTable(columnIndex, sortId) {
+    const table = document.querySelector('#course-table tbody');
+    const rows = Array.from(table.rows);
+    const sortState = sortStates[sortId];
+    sortState.asc = !sortState.asc;
+
+    rows.sort((a, b) => {
+        const textA = a.cells[columnIndex].textContent.trim().toLowerCase();
+        const textB = b.cells[columnIndex].textContent.trim().toLowerCase();
+        return sortState.asc ? textA.localeCompare(textB) : textB.localeCompare(textA);
+    });
+
+    table.innerHTML = '';
+    rows.forEach(row => table.appendChild(row));
+
+    updateSortIcon(sortId, sortState.asc);
+}
+
+function updateSortIcon(sortId, isAscending) {
+    const sortElement = document.getElementById(sortId);
+    const icon = sortElement.querySelector('i');
+    icon.className = isAscending ? 'fa-solid fa-arrow-up-wide-short' : 'fa-solid fa-arrow-up-short-wide';
+}
+
+function resetAndRender() {
+    currentPage = 1;
+    renderCourses();
+}
+
+function renderCourses() {
+    const courseTableBody = document.querySelector('#course-table tbody');
+    courseTableBody.innerHTML = '';
+
+    fetch('/api/courses/')
+        .then(response => response.json())
+        .then(data => {
+            filteredDataGlobal = filterData(data);
+            totalCourses = filteredDataGlobal.length;
+            totalPages = Math.ceil(totalCourses / coursesPerPage);
+            if (currentPage < 1) currentPage = 1;
+            if (currentPage > totalPages) currentPage = totalPages;
+            const start = (currentPage - 1) * coursesPerPage;
+            const end = start + coursesPerPage;
+            const pageData = filteredDataGlobal.slice(start, end);
+
+            pageData.forEach(course => {
+                const row = document.createElement('tr');
+                row.innerHTML = `
+                    <td>
+                        ${isEditMode ? `<div class="select-circle ${selectedCourses.has(course.id) ? 'selected' : ''}" data-id="${course.id}"></div>` : ''}
+                    </td>
+                    <td>${course.title}</td>
+                    <td>${course.teacher__name}</td>
+                    <td>${course.olympiad__title || 'None'}</td>
+                    <td>${course.session_time}</td>
+                    <td>${course.start_date}</td>
+                    <td>${course.end_date}</td>
+                `;
+                if (isEditMode) {
+                    const circle = row.querySelector('.select-circle');
+                    circle.addEventListener('click', (e) => {
+                        e.stopPropagation();
+                        circle.classList.toggle('selected');
+                        const courseId = parseInt(circle.getAttribute('data-id'));
+                        if (circle.classList.contains('selected')) {
+                            selectedCourses.add(courseId);
+                        } else {
+                            selectedCourses.delete(courseId);
+                        }
+                        isAllSelected = false;
+                        renderSelectedRows();
+                    });
+                } else {
+                    row.addEventListener('click', () => {
+                        window.location.href = `/course-detail/${course.id}/`;
+                    });
+                }
+                courseTableBody.appendChild(row);
+            });
+
+            renderPagination();
+            renderSelectedRows();
+        })
+        .catch(error => {
+            console.error('Error fetching courses:', error);
+        });
+}
+
+function renderSelectedRows() {
+    const selectedRowsContainer = document.getElementById('selected-rows-container');
+    const selectedRowsList = document.getElementById('selected-rows-list');
+    selectedRowsList.innerHTML = '';
+
+    if (selectedCourses.size > 0) {
+        selectedRowsContainer.style.display = 'block';
+        filteredDataGlobal.forEach(course => {
+            if (selectedCourses.has(course.id)) {
+                const selectedRow = document.createElement('div');
+                selectedRow.className = 'selected-row';
+                selectedRow.innerHTML = `
+                    <span>${course.title}</span>
+                    <span>${course.teacher__name}</span>
+                    <span>${course.olympiad__title || 'None'}</span>
+                    <span>${course.session_time}</span>
+                    <span>${course.start_date}</span>
+                    <span>${course.end_date}</span>
+                `;
+                selectedRowsList.appendChild(selectedRow);
+            }
+        });
+    } else {
+        selectedRowsContainer.style.display = 'none';
+    }
+}
+
+function renderPagination() {
+    const paginationContainer = document.getElementById('pagination');
+    paginationContainer.innerHTML = '';
+
+    const firstPageButton = createPageButton(1);
+    paginationContainer.appendChild(firstPageButton);
+
+    if (currentPage > 3) {
+        const dotsBefore = document.createElement('span');
+        dotsBefore.className = 'dots';
+        dotsBefore.textContent = '...';
+        paginationContainer.appendChild(dotsBefore);
+    }
+
+    let startPage = Math.max(2, currentPage - 1);
+    let endPage = Math.min(totalPages - 1, currentPage + 1);
+
+    for (let i = startPage; i <= endPage; i++) {
+        const button = createPageButton(i);
+        paginationContainer.appendChild(button);
+    }
+
+    if (currentPage < totalPages - 2) {
+        const dotsAfter = document.createElement('span');
+        dotsAfter.className = 'dots';
+        dotsAfter.textContent = '...';
+        paginationContainer.appendChild(dotsAfter);
+    }
+
+    if (totalPages > 1) {
+        const lastPageButton = createPageButton(totalPages);
+        paginationContainer.appendChild(lastPageButton);
+    }
+
+    if (currentPage > 1) {
+        const leftArrow = document.createElement('img');
+        leftArrow.src = paginationContainer.dataset.previousIcon;
+        leftArrow.alt = 'Previous Page';
+        leftArrow.addEventListener('click', () => {
+            currentPage -= 1;
+            renderCourses();
+        });
+        paginationContainer.insertBefore(leftArrow, paginationContainer.firstChild);
+    }
+
+    if (currentPage < totalPages) {
+        const rightArrow = document.createElement('img');
+        rightArrow.src = paginationContainer.dataset.nextIcon;
+        rightArrow.alt = 'Next Page';
+        rightArrow.addEventListener('click', () => {
+            currentPage += 1;
+            renderCourses();
+        });
+        paginationContainer.appendChild(rightArrow);
+    }
+}
+
+function createPageButton(pageNumber) {
+    const button = document.createElement('button');
+    button.className = 'page-button';
+    if (pageNumber === currentPage) {
+        button.classList.add('active');
+    }
+    button.textContent = pageNumber;
+    button.addEventListener('click', () => {
+        currentPage = pageNumber;
+        renderCourses();
+    });
+    return button;
+}
+
+function filterData(data) {
+    const generalFilter = document.getElementById('general-filter').value.toLowerCase();
+    const startDate = document.getElementById('start-date-filter').value;
+    const endDate = document.getElementById('end-date-filter').value;
+
+    return data.filter(course => {
+        const titleMatch = course.title.toLowerCase().includes(generalFilter);
+        const teacherMatch = course.teacher__name.toLowerCase().includes(generalFilter);
+        const olympiadMatch = course.olympiad__title && course.olympiad__title.toLowerCase().includes(generalFilter);
+
+        const courseStartDate = new Date(course.start_date);
+        const courseEndDate = new Date(course.end_date);
+        const filterStartDate = startDate ? new Date(startDate) : null;
+        const filterEndDate = endDate ? new Date(endDate) : null;
+
+        const dateMatch = (!filterStartDate || courseStartDate >= filterStartDate) &&
+                          (!filterEndDate || courseEndDate <= filterEndDate);
+
+        return (titleMatch || teacherMatch || olympiadMatch) && dateMatch;
+    });
+}
+
+function printTable(tableId) {
+    const table = document.getElementById(tableId);
+    if (!table) {
+        alert('Table not found!');
+        return;
+    }
+
+    let rowsToPrint = [];
+    if (isEditMode && selectedCourses.size > 0) {
+        rowsToPrint = filteredDataGlobal.filter(course => selectedCourses.has(course.id));
+    } else {
+        rowsToPrint = filteredDataGlobal;
+    }
+
+    if (rowsToPrint.length === 0) {
+        alert('No rows selected to print!');
+        return;
+    }
+
+    const w = window.open('', '', 'height=500,width=800');
+    w.document.write('<html><head><title>Print Table</title>');
+    w.document.write('<style>table { width: 100%; border-collapse: collapse; } th, td { border: 1px solid #000; padding: 8px; }</style>');
+    w.document.write('</head><body>');
+    w.document.write('<table>');
+    w.document.write('<thead><tr><th>Title</th><th>Teacher</th><th>Olympiad</th><th>Session Time</th><th>Start Date</th><th>End Date</th></tr></thead>');
+    w.document.write('<tbody>');
+    rowsToPrint.forEach(course => {
+        w.document.write(`
+            <tr>
+                <td>${course.title}</td>
+                <td>${course.teacher__name}</td>
+                <td>${course.olympiad__title || 'None'}</td>
+                <td>${course.session_time}</td>
+                <td>${course.start_date}</td>
+                <td>${course.end_date}</td>
+            </tr>
+        `);
+    });
+    w.document.write('</tbody>');
+    w.document.write('</table>');
+    w.document.write('</body></html>');
+    w.document.close();
+    w.print();
+}
+
+function exportToCSV(tableId) {
+    const table = document.getElementById(tableId);
+    if (!table) {
+        alert('Table not found!');
+        return;
+    }
+
+    let rowsToExport = [];
+    if (isEditMode && selectedCourses.size > 0) {
+        rowsToExport = filteredDataGlobal.filter(course => selectedCourses.has(course.id));
+    } else {
+        rowsToExport = filteredDataGlobal;
+    }
+
+    if (rowsToExport.length === 0) {
+        alert('No rows selected to export!');
+        return;
+    }
+
+    let csv = 'Title,Teacher,Olympiad,Session Time,Start Date,End Date\n';
+    rowsToExport.forEach(course => {
+        csv += `${course.title},${course.teacher__name},${course.olympiad__title || 'None'},${course.session_time},${course.start_date},${course.end_date}\n`;
+    });
+    const blob = new Blob([csv], { type: 'text/csv;charset=utf-8;' });
+    const link = document.createElement('a');
+    link.href = URL.createObjectURL(blob);
+    link.download = tableId + '_data.csv';
+    link.style.display = 'none';
+    document.body.appendChild(link);
+    link.click();
+    document.body.removeChild(link);
+}
+
+document.getElementById('edit-button').addEventListener('click', () => {
+    isEditMode = !isEditMode;
+    selectedCourses.clear();
+    isAllSelected = false;
+    document.getElementById('select-all-button').style.display = isEditMode ? 'inline-block' : 'none';
+    document.getElementById('selected-rows-container').style.display = isEditMode ? 'block' : 'none';
+    renderCourses();
+});
+
+document.getElementById('select-all-button').addEventListener('click', () => {
+    const currentPageData = filteredDataGlobal.slice(
+        (currentPage - 1) * coursesPerPage,
+        currentPage * coursesPerPage
+    );
+    if (isAllSelected) {
+        currentPageData.forEach(course => selectedCourses.delete(course.id));
+        isAllSelected = false;
+    } else {
+        currentPageData.forEach(course => selectedCourses.add(course.id));
+        isAllSelected = true;
+    }
+    renderCourses();
+});
+
+document.getElementById('general-filter').addEventListener('input', resetAndRender);
+
+renderCourses();
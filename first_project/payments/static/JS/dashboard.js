@@ -0,0 +1,365 @@
+const ctx = document.getElementById('profitLossChart').getContext('2d');
+let profitLossChart;
+
+const pieCtx = document.getElementById('pieChart').getContext('2d');
+let pieChart;
+
+const personPieCtx = document.getElementById('personPieChart').getContext('2d');
+let personPieChart;
+
+let currentScale = 'Week';
+
+const professionalColors = [
+    '#4e79a7', '#f28e2c', '#e15759', '#76b7b2', '#59a14f',
+    '#edc949', '#af7aa1', '#ff9da7', '#9c755f', '#bab0ac'
+];
+
+function renderActions(payments) {
+    const infoList = document.getElementById('infoList');
+    infoList.innerHTML = '';
+
+    if (payments.length === 0) {
+        const noResults = document.createElement('div');
+        noResults.className = 'no-results';
+        noResults.textContent = 'No payments found';
+        infoList.appendChild(noResults);
+    } else {
+        payments.forEach(payment => {
+            const item = document.createElement('div');
+            item.className = 'info-list-item';
+
+            let amountColor = 'other';
+            if (payment.payment_type__title === 'incoming') {
+                amountColor = 'profit';
+            } else if (payment.payment_type__title === 'outgoing') {
+                amountColor = 'loss';
+            }
+
+            item.innerHTML = `
+                <a href="/payment-detail/${payment.id}/" style="text-decoration: none; color: inherit; display: flex; justify-content: space-between; width: 100%;">
+                    <span class="name">${payment.name}</span>
+                    <span class="date">${new Date(payment.datetime).toISOString().split('T')[0]}</span>
+                    <span class="${amountColor}">$${payment.amount.toFixed(2)}</span>
+                </a>
+            `;
+            infoList.appendChild(item);
+        });
+    }
+}
+
+function summaryUrl() {
+    const params = new URLSearchParams({ scale: currentScale.toLowerCase() });
+    const name = document.getElementById('searchName').value;
+    const startDate = document.getElementById('startDate').value;
+    const endDate = document.getElementById('endDate').value;
+    const lastN = parseInt(document.getElementById('searchLastN').value);
+
+    if (name) params.set('name', name);
+    if (startDate) params.set('date_from', startDate);
+    if (endDate) params.set('date_to', endDate);
+    params.set('recent', !isNaN(lastN) && lastN > 0 ? lastN : 50);
+    params.set('layout', 'columns');
+    return `/api/dashboard/summary/?${params.toString()}`;
+}
+
+// The summary is requested with layout=columns: every list is {count, columns, dictionaries}.
+function columnValues(table, field) {
+    const values = table.columns[field];
+    const dictionary = table.dictionaries[field];
+    return dictionary ? values.map(code => code === null ? null : dictionary[code]) : values;
+}
+
+function columnRows(table) {
+    const fields = Object.keys(table.columns);
+    const values = fields.map(field => columnValues(table, field));
+    return Array.from({ length: table.count }, (_, i) =>
+        Object.fromEntries(fields.map((field, j) => [field, values[j][i]])));
+}
+
+function periodGroups(summary) {
+    const { bucket, incoming, outgoing } = summary.by_period.columns;
+    return bucket.map((start, i) => ({
+        key: formatBucket(start, currentScale),
+        overallProfit: incoming[i],
+        overallLoss: outgoing[i],
+        overallIncome: incoming[i] - outgoing[i],
+    }));
+}
+
+function formatBucket(bucket, scale) {
+    switch (scale) {
+        case 'Month':
+            return bucket.slice(0, 7);
+        case 'Year':
+            return bucket.slice(0, 4);
+        case 'Week':
+            return `Week of ${bucket}`;
+        default:
+            return bucket;
+    }
+}
+
+function renderScaleResults(groups) {
+    const scaleResults = document.getElementById('scaleResults');
+    scaleResults.innerHTML = '';
+
+    groups.forEach(group => {
+        const row = document.createElement('div');
+        row.className = 'row';
+        row.innerHTML = `
+            <div>${group.key}</div>
+            <div>Overall Profit</div>
+            <div class="value" style="color: green;">$${group.overallProfit.toFixed(2)}</div>
+            <div>Overall Loss</div>
+            <div class="value" style="color: red;">$${group.overallLoss.toFixed(2)}</div>
+            <div>Overall Income</div>
+            <div class="value">$${group.overallIncome.toFixed(2)}</div>
+        `;
+        scaleResults.appendChild(row);
+    });
+}
+
+function filterResults() {
+    fetchSummary();
+}
+
+function updateScale(scale) {
+    currentScale = scale;
+    fetchSummary();
+}
+
+function renderProfitLossChart(groups) {
+    if (profitLossChart) {
+        profitLossChart.destroy();
+    }
+
+    profitLossChart = new Chart(ctx, {
+        type: 'line',
+        data: {
+            labels: groups.map(group => group.key),
+            datasets: [
+                {
+                    label: 'Profit',
+                    data: groups.map(group => group.overallProfit),
+                    borderColor: 'green',
+                    borderWidth: 2,
+                    fill: false,
+                    tension: 0.1,
+                },
+                {
+                    label: 'Loss',
+                    data: groups.map(group => group.overallLoss),
+                    borderColor: 'red',
+                    borderWidth: 2,
+                    fill: false,
+                    tension: 0.1,
+                },
+                {
+                    label: 'Income',
+                    data: groups.map(group => group.overallIncome),
+                    borderColor: 'blue',
+                    borderWidth: 2,
+                    fill: false,
+                    tension: 0.1,
+                },
+            ],
+        },
+        options: {
+            responsive: true,
+            plugins: {
+                legend: {
+                    position: 'top',
+                },
+                tooltip: {
+                    callbacks: {
+                        label: (context) => `${context.dataset.label}: $${context.raw.toFixed(2)}`,
+                    },
+                },
+                zoom: {
+                    pan: {
+                        enabled: true,
+                        mode: 'x',
+                        speed: 1,
+                        threshold: 10,
+                    },
+                    zoom: {
+                        wheel: { enabled: true }, // Enable zooming with the mouse wheel
+                        pinch: { enabled: true }, // Enable zooming with pinch gestures (touchpad)
+                        mode: 'x', // Zoom only on the x-axis
+                        speed: 0.05, // Control the speed of zooming
+                        limits: {
+                            x: { minRange: 1 }, // Minimum range for the x-axis
+                        },
+                        onZoomComplete: ({ chart }) => {
+                            const xAxis = chart.scales.x;
+                            const range = xAxis.max - xAxis.min;
+                            const newScale = getDynamicScale(range);
+                            if (newScale !== currentScale) {
+                                updateScale(newScale); // Update the scale dynamically
+                            }
+                        },
+                    },
+                },
+            },
+            scales: {
+                y: {
+                    ticks: {
+                        callback: (value) => `$${value}`,
+                    },
+                },
+                x: {
+                    ticks: {
+                        autoSkip: true,
+                    },
+                },
+            },
+            animation: {
+                duration: 1000, // Animation duration in milliseconds
+                easing: 'easeInOutQuad', // Smooth animation
+            },
+        },
+    });
+}
+
+function renderPieChart(totals) {
+    if (pieChart) {
+        pieChart.destroy();
+    }
+
+    pieChart = new Chart(pieCtx, {
+        type: 'pie',
+        data: {
+            labels: ['Incoming', 'Outgoing', 'Other'],
+            datasets: [
+                {
+                    data: [totals.incoming, totals.outgoing, totals.other].map(parseFloat),
+                    backgroundColor: ['green', 'red', 'blue'],
+                },
+            ],
+        },
+        options: {
+            responsive: true,
+            plugins: {
+                legend: {
+                    position: 'bottom',
+                },
+                tooltip: {
+                    callbacks: {
+                        label: (context) => `${context.label}: $${context.raw.toFixed(2)}`,
+                    },
+                },
+            },
+            animation: {
+                duration: 1000, // Animation duration in milliseconds
+                easing: 'easeInOutQuad', // Smooth animation
+            },
+        },
+    });
+}
+
+function renderPersonPieChart(people) {
+    if (personPieChart) {
+        personPieChart.destroy();
+    }
+
+    personPieChart = new Chart(personPieCtx, {
+        type: 'pie',
+        data: {
+            labels: columnValues(people, 'related_person__name'),
+            datasets: [
+                {
+                    data: people.columns.total,
+                    backgroundColor: professionalColors, // Use professional color palette
+                },
+            ],
+        },
+        options: {
+            responsive: true,
+            plugins: {
+                legend: {
+                    position: 'bottom',
+                },
+                tooltip: {
+                    callbacks: {
+                        label: (context) => `${context.label}: $${context.raw.toFixed(2)}`,
+                    },
+                },
+            },
+            animation: {
+                duration: 1000, // Animation duration in milliseconds
+                easing: 'easeInOutQuad', // Smooth animation
+            },
+        },
+    });
+}
+
+function fetchSummary() {
+    fetch(summaryUrl())
+        .then(response => {
+            if (!response.ok) {
+                throw new Error('Network response was not ok');
+            }
+            return response.json();
+        })
+        .then(summary => {
+            const groups = periodGroups(summary);
+            renderActions(columnRows(summary.recent));
+            renderScaleResults(groups);
+            renderProfitLossChart(groups);
+            renderPieChart(summary.totals);
+            renderPersonPieChart(summary.by_person);
+        })
+        .catch(error => {
+            console.error('Error fetching dashboard summary:', error);
+        });
+}
+
+function getDynamicScale(range) {
+    if (range <= 7) {
+        return 'Day';
+    } else if (range <= 30) {
+        return 'Week';
+    } else if (range <= 365) {
+        return 'Month';
+    } else {
+        return 'Year';
+    }
+}
+
+function hasFilters() {
+    return ['searchName', 'startDate', 'endDate'].some(id => document.getElementById(id).value);
+}
+
+let refreshTimer;
+
+function listenForChanges() {
+    if (!window.EventSource) {
+        return;
+    }
+    const source = new EventSource('/api/events/');
+    source.addEventListener('totals', event => {
+        // Pushed totals cover all payments, so they only replace the pie chart of an unfiltered view.
+        if (!hasFilters()) {
+            renderPieChart(JSON.parse(event.data).totals);
+        }
+    });
+    source.addEventListener('change', event => {
+        if (JSON.parse(event.data).table !== 'payment') {
+            return;
+        }
+        // Refresh the rest of the dashboard once a burst of changes settles.
+        clearTimeout(refreshTimer);
+        refreshTimer = setTimeout(fetchSummary, 2000);
+    });
+    source.onerror = () => {
+        // Served over WSGI the stream is unavailable; fall back to manual refreshes.
+        if (source.readyState === EventSource.CLOSED) {
+            console.warn('Live updates are unavailable.');
+        }
+    };
+}
+
+window.onload = function () {
+    updateScale('Day');
+    listenForChanges();
+};
@@ -0,0 +1,42 @@
+function printTable(tableId) {
+    const table = document.getElementById(tableId);
+    if (!table) {
+        alert('Table not found!');
+        return;
+    }
+    const printWindow = window.open('', '', 'height=500,width=800');
+    printWindow.document.write('<html><head><title>Print Table</title>');
+    printWindow.document.write('<style>table { width: 100%; border-collapse: collapse; } th, td { border: 1px solid #000; padding: 8px; }</style>');
+    printWindow.document.write('</head><body>');
+    printWindow.document.write(table.outerHTML);
+    printWindow.document.write('</body></html>');
+    printWindow.document.close();
+    printWindow.print();
+}
+
+function exportToCSV(tableId) {
+    const table = document.getElementById(tableId);
+    if (!table) {
+        alert('Table not found!');
+        return;
+    }
+    const rows = table.querySelectorAll('tr');
+    if (rows.length === 0) {
+        alert('No data to export!');
+        return;
+    }
+    let csvContent = '';
+    rows.forEach(row => {
+        const cells = row.querySelectorAll('td, th');
+        const rowData = Array.from(cells).map(cell => cell.innerText.replace(/,/g, ';')).join(',');
+        csvContent += rowData + '\n';
+    });
+    const blob = new Blob([csvContent], { type: 'text/csv;charset=utf-8;' });
+    const link = document.createElement('a');
+    link.href = URL.createObjectURL(blob);
+    link.download = `${tableId}_data.csv`;
+    link.style.display = 'none';
+    document.body.appendChild(link);
+    link.click();
+    document.body.removeChild(link);
+}
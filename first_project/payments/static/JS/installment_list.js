@@ -0,0 +1,369 @@
+const installmentsPerPage = 5;
+let currentPage = 1;
+let totalPages = 1;
+let totalInstallments = 0;
+let filteredDataGlobal = [];
+let isEditMode = false;
+let selectedInstallments = new Set();
+let isAllSelected = false;
+
+const urlParams = new URLSearchParams(window.location.search);
+const pageParam = urlParams.get('page');
+if (pageParam) {
+    currentPage = parseInt(pageParam);
+}
+
+const storedSelectedRows = sessionStorage.getItem('selectedInstallments');
+if (storedSelectedRows) {
+    selectedInstallments = new Set(JSON.parse(storedSelectedRows));
+}
+
+const toggleSortButton = document.getElementById('toggle-sort-button');
+const sortContainer = document.getElementById('sort-container');
+let isSortVisible = false;
+
+let sortStates = {
+    'sort-amount': { asc: true },
+    'sort-status': { asc: true }
+};
+
+toggleSortButton.addEventListener('click', () => {
+    isSortVisible = !isSortVisible;
+    sortContainer.classList.toggle('hidden', !isSortVisible);
+    sortContainer.classList.toggle('visible', isSortVisible);
+
+    const icon = toggleSortButton.querySelector('i');
+    icon.className = isSortVisible ? 'fa-solid fa-angles-right' : 'fa-solid fa-angles-left';
+});
+
+function sortTable(columnIndex, sortId) {
+    const table = document.querySelector('#installment-table tbody');
+    const rows = Array.from(table.rows);
+    const sortState = sortStates[sortId];
+    sortState.asc = !sortState.asc;
+
+    rows.sort((a, b) => {
+        const textA = a.cells[columnIndex].textContent.trim().toLowerCase();
+        const textB = b.cells[columnIndex].textContent.trim().toLowerCase();
+        if (columnIndex === 2) {
+            return sortState.asc ? parseFloat(textA) - parseFloat(textB) : parseFloat(textB) - parseFloat(textA);
+        } else {
+            return sortState.asc ? textA.localeCompare(textB) : textB.localeCompare(textA);
+        }
+    });
+
+    table.innerHTML = '';
+    rows.forEach(row => table.appendChild(row));
+
+    updateSortIcon(sortId, sortState.asc);
+}
+
+function updateSortIcon(sortId, isAscending) {
+    const sortElement = document.getElementById(sortId);
+    const icon = sortElement.querySelector('i');
+    icon.className = isAscending ? 'fa-solid fa-arrow-up-wide-short' : 'fa-solid fa-arrow-up-short-wide';
+}
+
+function resetAndRender() {
+    currentPage = 1;
+    renderInstallments();
+}
+
+function renderInstallments() {
+    const installmentTableBody = document.querySelector('#installment-table tbody');
+    installmentTableBody.innerHTML = '';
+
+    fetch('/api/installments/')
+        .then(response => response.json())
+        .then(data => {
+            filteredDataGlobal = filterData(data);
+            totalInstallments = filteredDataGlobal.length;
+            totalPages = Math.ceil(totalInstallments / installmentsPerPage);
+            if (currentPage < 1) currentPage = 1;
+            if (currentPage > totalPages) currentPage = totalPages;
+            const start = (currentPage - 1) * installmentsPerPage;
+            const end = start + installmentsPerPage;
+            const pageData = filteredDataGlobal.slice(start, end);
+
+            pageData.forEach(installment => {
+                const row = document.createElement('tr');
+                row.innerHTML = `
+                    <td>
+                        ${isEditMode ? `<div class="select-circle ${selectedInstallments.has(installment.id) ? 'selected' : ''}" data-id="${installment.id}"></div>` : ''}
+                    </td>
+                    <td>${installment.id}</td>
+                    <td>${installment.amount}</td>
+                    <td>${installment.due_date}</td>
+                    <td>${installment.received_date || 'N/A'}</td>
+                    <td>${installment.status__title || 'N/A'}</td>
+                    <td>${installment.payment_agreement__id}</td>
+                `;
+                if (isEditMode) {
+                    const circle = row.querySelector('.select-circle');
+                    circle.addEventListener('click', (e) => {
+                        e.stopPropagation();
+                        circle.classList.toggle('selected');
+                        const installmentId = parseInt(circle.getAttribute('data-id'));
+                        if (circle.classList.contains('selected')) {
+                            selectedInstallments.add(installmentId);
+                        } else {
+                            selectedInstallments.delete(installmentId);
+                        }
+                        isAllSelected = false;
+                        renderSelectedRows();
+                    });
+                } else {
+                    row.addEventListener('click', () => {
+                        window.location.href = `/installment-detail/${installment.id}/`;
+                    });
+                }
+                installmentTableBody.appendChild(row);
+            });
+
+            renderPagination();
+            renderSelectedRows();
+        })
+        .catch(error => {
+            console.error('Error fetching installments:', error);
+        });
+}
+
+function renderSelectedRows() {
+    const selectedRowsContainer = document.getElementById('selected-rows-container');
+    const selectedRowsList = document.getElementById('selected-rows-list');
+    selectedRowsList.innerHTML = '';
+
+    if (selectedInstallments.size > 0) {
+        selectedRowsContainer.style.display = 'block';
+        filteredDataGlobal.forEach(installment => {
+            if (selectedInstallments.has(installment.id)) {
+                const selectedRow = document.createElement('div');
+                selectedRow.className = 'selected-row';
+                selectedRow.innerHTML = `
+                    <span>${installment.id}</span>
+                    <span>${installment.amount}</span>
+                    <span>${installment.due_date}</span>
+                    <span>${installment.received_date || 'N/A'}</span>
+                    <span>${installment.status__title || 'N/A'}</span>
+                    <span>${installment.payment_agreement__id}</span>
+                `;
+                selectedRowsList.appendChild(selectedRow);
+            }
+        });
+    } else {
+        selectedRowsContainer.style.display = 'none';
+    }
+}
+
+function filterData(data) {
+    const generalFilter = document.getElementById('general-filter').value.toLowerCase();
+    const startDate = document.getElementById('start-date-filter').value;
+    const endDate = document.getElementById('end-date-filter').value;
+
+    return data.filter(installment => {
+        const amountMatch = installment.amount.toString().includes(generalFilter);
+        const statusMatch = installment.status__title.toLowerCase().includes(generalFilter);
+
+        const installmentDate = new Date(installment.due_date);
+        const filterStartDate = startDate ? new Date(startDate) : null;
+        const filterEndDate = endDate ? new Date(endDate) : null;
+
+        const dateMatch = (!filterStartDate || installmentDate >= filterStartDate) &&
+                         (!filterEndDate || installmentDate <= filterEndDate);
+
+        return (amountMatch || statusMatch) && dateMatch;
+    });
+}
+
+function renderPagination() {
+    const paginationContainer = document.getElementById('pagination');
+    paginationContainer.innerHTML = '';
+
+    const firstPageButton = createPageButton(1);
+    paginationContainer.appendChild(firstPageButton);
+
+    if (currentPage > 3) {
+        const dotsBefore = document.createElement('span');
+        dotsBefore.className = 'dots';
+        dotsBefore.textContent = '...';
+        paginationContainer.appendChild(dotsBefore);
+    }
+
+    let startPage = Math.max(2, currentPage - 1);
+    let endPage = Math.min(totalPages - 1, currentPage + 1);
+
+    for (let i = startPage; i <= endPage; i++) {
+        const button = createPageButton(i);
+        paginationContainer.appendChild(button);
+    }
+
+    if (currentPage < totalPages - 2) {
+        const dotsAfter = document.createElement('span');
+        dotsAfter.className = 'dots';
+        dotsAfter.textContent = '...';
+        paginationContainer.appendChild(dotsAfter);
+    }
+
+    if (totalPages > 1) {
+        const lastPageButton = createPageButton(totalPages);
+        paginationContainer.appendChild(lastPageButton);
+    }
+
+    if (currentPage > 1) {
+        const leftArrow = document.createElement('img');
+        leftArrow.src = paginationContainer.dataset.previousIcon;
+        leftArrow.alt = 'Previous Page';
+        leftArrow.addEventListener('click', () => {
+            currentPage -= 1;
+            renderInstallments();
+        });
+        paginationContainer.insertBefore(leftArrow, paginationContainer.firstChild);
+    }
+
+    if (currentPage < totalPages) {
+        const rightArrow = document.createElement('img');
+        rightArrow.src = paginationContainer.dataset.nextIcon;
+        rightArrow.alt = 'Next Page';
+        rightArrow.addEventListener('click', () => {
+            currentPage += 1;
+            renderInstallments();
+        });
+        paginationContainer.appendChild(rightArrow);
+    }
+}
+
+function createPageButton(pageNumber) {
+    const button = document.createElement('button');
+    button.className = 'page-button';
+    if (pageNumber === currentPage) {
+        button.classList.add('active');
+    }
+    button.textContent = pageNumber;
+    button.addEventListener('click', () => {
+        currentPage = pageNumber;
+        renderInstallments();
+    });
+    return button;
+}
+
+function printTable(tableId) {
+    const table = document.getElementById(tableId);
+    if (!table) {
+        alert('Table not found!');
+        return;
+    }
+
+    let rowsToPrint = [];
+    if (isEditMode && selectedInstallments.size > 0) {
+        rowsToPrint = filteredDataGlobal.filter(installment => selectedInstallments.has(installment.id));
+    } else {
+        rowsToPrint = filteredDataGlobal;
+    }
+
+    if (rowsToPrint.length === 0) {
+        alert('No rows selected to print!');
+        return;
+    }
+
+    const w = window.open('', '', 'height=500,width=800');
+    w.document.write('<html><head><title>Print Table</title>');
+    w.document.write('<style>table { width: 100%; border-collapse: collapse; } th, td { border: 1px solid #000; padding: 8px; }</style>');
+    w.document.write('</head><body>');
+    w.document.write('<table>');
+    w.document.write('<thead><tr><th>ID</th><th>Amount</th><th>Due Date</th><th>Received Date</th><th>Status</th><th>Payment Agreement ID</th></tr></thead>');
+    w.document.write('<tbody>');
+    rowsToPrint.forEach(installment => {
+        w.document.write(`
+            <tr>
+                <td>${installment.id}</td>
+                <td>${installment.amount}</td>
+                <td>${installment.due_date}</td>
+                <td>${installment.received_date || 'N/A'}</td>
+                <td>${installment.status__title || 'N/A'}</td>
+                <td>${installment.payment_agreement__id}</td>
+            </tr>
+        `);
+    });
+    w.document.write('</tbody>');
+    w.document.write('</table>');
+    w.document.write('</body></html>');
+    w.document.close();
+    w.print();
+}
+
+function exportToCSV(tableId) {
+    const table = document.getElementById(tableId);
+    if (!table) {
+        alert('Table not found!');
+        return;
+    }
+
+    let rowsToExport = [];
+    if (isEditMode && selectedInstallments.size > 0) {
+        rowsToExport = filteredDataGlobal.filter(installment => selectedInstallments.has(installment.id));
+    } else {
+        rowsToExport = filteredDataGlobal;
+    }
+
+    if (rowsToExport.length === 0) {
+        alert('No rows selected to export!');
+        return;
+    }
+
+    let csv = 'ID,Amount,Due Date,Received Date,Status,Payment Agreement ID\n';
+    rowsToExport.forEach(installment => {
+        csv += `${installment.id},${installment.amount},${installment.due_date},${installment.received_date || 'N/A'},${installment.status__title || 'N/A'},${installment.payment_agreement__id}\n`;
+    });
+    const blob = new Blob([csv], { type: 'text/csv;charset=utf-8;' });
+    const link = document.createElement('a');
+    link.href = URL.createObjectURL(blob);
+    link.download = tableId + '_data.csv';
+    link.style.display = 'none';
+    document.body.appendChild(link);
+    link.click();
+    document.body.removeChild(link);
+}
+
+document.getElementById('edit-button').addEventListener('click', () => {
+    isEditMode = !isEditMode;
+    selectedInstallments.clear();
+    isAllSelected = false;
+    document.getElementById('select-all-button').style.display = isEditMode ? 'inline-block' : 'none';
+    document.getElementById('selected-rows-container').style.display = isEditMode ? 'block' : 'none';
+    renderInstallments();
+});
+
+document.getElementById('select-all-button').addEventListener('click', () => {
+    const currentPageData = filteredDataGlobal.slice(
+        (currentPage - 1) * installmentsPerPage,
+        currentPage * installmentsPerPage
+    );
+    if (isAllSelected) {
+        currentPageData.forEach(installment => selectedInstallments.delete(installment.id));
+        isAllSelected = false;
+    } else {
+        currentPageData.forEach(installment => selectedInstallments.add(installment.id));
+        isAllSelected = true;
+    }
+    renderInstallments();
+});
+
+document.getElementById('general-filter').addEventListener('input', resetAndRender);
+
+const toggleDateFilterButton = document.getElementById('toggle-date-filter-button');
+const dateFilterContainer = document.getElementById('date-filter-container');
+let isDateFilterVisible = false;
+
+toggleDateFilterButton.addEventListener('click', () => {
+    isDateFilterVisible = !isDateFilterVisible;
+    dateFilterContainer.classList.toggle('hidden', !isDateFilterVisible);
+    dateFilterContainer.classList.toggle('visible', isDateFilterVisible);
+
+    const icon = toggleDateFilterButton.querySelector('i');
+    icon.className = isDateFilterVisible ? 'fa-solid fa-calendar-days' : 'fa-solid fa-calendar-days';
+});
+
+document.getElementById('start-date-filter').addEventListener('change', resetAndRender);
+document.getElementById('end-date-filter').addEventListener('change', resetAndRender);
+
+renderInstallments();
@@ -0,0 +1,280 @@
+const paymentsPerPage = 5;
+let currentPage = 1;
+let pageCursors = [null];
+let nextCursor = null;
+let currentSort = '-datetime';
+let filteredDataGlobal = [];
+let isEditMode = false;
+let selectedPayments = new Set();
+const selectedPaymentData = new Map();
+let isAllSelected = false;
+
+const storedSelectedRows = sessionStorage.getItem('selectedPayments');
+if (storedSelectedRows) {
+    selectedPayments = new Set(JSON.parse(storedSelectedRows));
+}
+
+const toggleSortButton = document.getElementById('toggle-sort-button');
+const sortContainer = document.getElementById('sort-container');
+let isSortVisible = false;
+
+let sortStates = {
+    'sort-name': { asc: true },
+    'sort-amount': { asc: true }
+};
+
+toggleSortButton.addEventListener('click', () => {
+    isSortVisible = !isSortVisible;
+    sortContainer.classList.toggle('hidden', !isSortVisible);
+    sortContainer.classList.toggle('visible', isSortVisible);
+
+    const icon = toggleSortButton.querySelector('i');
+    icon.className = isSortVisible ? 'fa-solid fa-angles-right' : 'fa-solid fa-angles-left';
+});
+
+function sortTable(columnIndex, sortId) {
+    const sortState = sortStates[sortId];
+    sortState.asc = !sortState.asc;
+    const field = columnIndex === 2 ? 'amount' : 'name';
+    currentSort = sortState.asc ? field : `-${field}`;
+
+    updateSortIcon(sortId, sortState.asc);
+    resetAndRender();
+}
+
+function updateSortIcon(sortId, isAscending) {
+    const sortElement = document.getElementById(sortId);
+    const icon = sortElement.querySelector('i');
+    icon.className = isAscending ? 'fa-solid fa-arrow-up-wide-short' : 'fa-solid fa-arrow-up-short-wide';
+}
+
+function resetAndRender() {
+    currentPage = 1;
+    pageCursors = [null];
+    renderPayments();
+}
+
+function paymentQuery() {
+    const params = new URLSearchParams({ sort: currentSort, limit: paymentsPerPage });
+    const generalFilter = document.getElementById('general-filter').value.trim();
+    const startDate = document.getElementById('start-date-filter').value;
+    const endDate = document.getElementById('end-date-filter').value;
+
+    if (generalFilter) params.set('q', generalFilter);
+    if (startDate) params.set('date_from', startDate);
+    if (endDate) params.set('date_to', endDate);
+    return params;
+}
+
+function renderPayments() {
+    const paymentTableBody = document.querySelector('#payment-table tbody');
+
+    const params = paymentQuery();
+    const cursor = pageCursors[currentPage - 1];
+    if (cursor) params.set('cursor', cursor);
+
+    fetch(`/api/payments/?${params.toString()}`)
+        .then(response => response.json())
+        .then(data => {
+            paymentTableBody.innerHTML = '';
+            filteredDataGlobal = data.results;
+            nextCursor = data.next;
+            pageCursors[currentPage] = nextCursor;
+            const pageData = filteredDataGlobal;
+
+            pageData.forEach(payment => {
+                const row = document.createElement('tr');
+                row.innerHTML = `
+                    <td>
+                        ${isEditMode ? `<div class="select-circle ${selectedPayments.has(payment.id) ? 'selected' : ''}" data-id="${payment.id}"></div>` : ''}
+                    </td>
+                    <td>${payment.name}</td>
+                    <td>${payment.amount}</td>
+                    <td>${payment.datetime}</td>
+                `;
+                if (isEditMode) {
+                    const circle = row.querySelector('.select-circle');
+                    circle.addEventListener('click', (e) => {
+                        e.stopPropagation();
+                        circle.classList.toggle('selected');
+                        const paymentId = parseInt(circle.getAttribute('data-id'));
+                        if (circle.classList.contains('selected')) {
+                            selectedPayments.add(paymentId);
+                            selectedPaymentData.set(paymentId, payment);
+                        } else {
+                            selectedPayments.delete(paymentId);
+                            selectedPaymentData.delete(paymentId);
+                        }
+                        isAllSelected = false;
+                        renderSelectedRows();
+                    });
+                } else {
+                    row.addEventListener('click', () => {
+                        window.location.href = `/payment-detail/${payment.id}/`;
+                    });
+                }
+                paymentTableBody.appendChild(row);
+            });
+
+            renderPagination();
+            renderSelectedRows();
+        })
+        .catch(error => {
+            console.error('Error fetching payments:', error);
+        });
+}
+
+function renderSelectedRows() {
+    const selectedRowsContainer = document.getElementById('selected-rows-container');
+    const selectedRowsList = document.getElementById('selected-rows-list');
+    selectedRowsList.innerHTML = '';
+
+    if (selectedPayments.size > 0) {
+        selectedRowsContainer.style.display = 'block';
+        selectedPaymentData.forEach(payment => {
+            const selectedRow = document.createElement('div');
+            selectedRow.className = 'selected-row';
+            selectedRow.innerHTML = `
+                <span>${payment.name}</span>
+                <span>${payment.amount}</span>
+                <span>${payment.datetime}</span>
+            `;
+            selectedRowsList.appendChild(selectedRow);
+        });
+    } else {
+        selectedRowsContainer.style.display = 'none';
+    }
+}
+
+function renderPagination() {
+    const paginationContainer = document.getElementById('pagination');
+    paginationContainer.innerHTML = '';
+
+    const currentPageButton = document.createElement('button');
+    currentPageButton.className = 'page-button active';
+    currentPageButton.textContent = currentPage;
+    paginationContainer.appendChild(currentPageButton);
+
+    if (currentPage > 1) {
+        const leftArrow = document.createElement('img');
+        leftArrow.src = paginationContainer.dataset.previousIcon;
+        leftArrow.alt = 'Previous Page';
+        leftArrow.addEventListener('click', () => {
+            currentPage -= 1;
+            renderPayments();
+        });
+        paginationContainer.insertBefore(leftArrow, paginationContainer.firstChild);
+    }
+
+    if (nextCursor) {
+        const rightArrow = document.createElement('img');
+        rightArrow.src = paginationContainer.dataset.nextIcon;
+        rightArrow.alt = 'Next Page';
+        rightArrow.addEventListener('click', () => {
+            currentPage += 1;
+            renderPayments();
+        });
+        paginationContainer.appendChild(rightArrow);
+    }
+}
+
+function printTable(tableId) {
+    const table = document.getElementById(tableId);
+    if (!table) {
+        alert('Table not found!');
+        return;
+    }
+
+    let rowsToPrint = [];
+    if (isEditMode && selectedPayments.size > 0) {
+        rowsToPrint = Array.from(selectedPaymentData.values());
+    } else {
+        rowsToPrint = filteredDataGlobal;
+    }
+
+    if (rowsToPrint.length === 0) {
+        alert('No rows selected to print!');
+        return;
+    }
+
+    const w = window.open('', '', 'height=500,width=800');
+    w.document.write('<html><head><title>Print Table</title>');
+    w.document.write('<style>table { width: 100%; border-collapse: collapse; } th, td { border: 1px solid #000; padding: 8px; }</style>');
+    w.document.write('</head><body>');
+    w.document.write('<table>');
+    w.document.write('<thead><tr><th>Name</th><th>Amount</th><th>Date</th></tr></thead>');
+    w.document.write('<tbody>');
+    rowsToPrint.forEach(payment => {
+        w.document.write(`
+            <tr>
+                <td>${payment.name}</td>
+                <td>${payment.amount}</td>
+                <td>${payment.datetime}</td>
+            </tr>
+        `);
+    });
+    w.document.write('</tbody>');
+    w.document.write('</table>');
+    w.document.write('</body></html>');
+    w.document.close();
+    w.print();
+}
+
+function exportPayments(format) {
+    // The server streams every payment matching the filters, or only the selected ones in edit mode.
+    const params = paymentQuery();
+    params.delete('limit');
+    params.set('format', format);
+    if (isEditMode && selectedPayments.size > 0) {
+        params.set('id', Array.from(selectedPayments).join(','));
+    }
+    window.location.href = `/api/payments/export/?${params.toString()}`;
+}
+
+document.getElementById('edit-button').addEventListener('click', () => {
+    isEditMode = !isEditMode;
+    selectedPayments.clear();
+    selectedPaymentData.clear();
+    isAllSelected = false;
+    document.getElementById('select-all-button').style.display = isEditMode ? 'inline-block' : 'none';
+    document.getElementById('selected-rows-container').style.display = isEditMode ? 'block' : 'none';
+    renderPayments();
+});
+
+document.getElementById('select-all-button').addEventListener('click', () => {
+    const currentPageData = filteredDataGlobal;
+    if (isAllSelected) {
+        currentPageData.forEach(payment => {
+            selectedPayments.delete(payment.id);
+            selectedPaymentData.delete(payment.id);
+        });
+        isAllSelected = false;
+    } else {
+        currentPageData.forEach(payment => {
+            selectedPayments.add(payment.id);
+            selectedPaymentData.set(payment.id, payment);
+        });
+        isAllSelected = true;
+    }
+    renderPayments();
+});
+
+document.getElementById('general-filter').addEventListener('input', resetAndRender);
+
+const toggleDateFilterButton = document.getElementById('toggle-date-filter-button');
+const dateFilterContainer = document.getElementById('date-filter-container');
+let isDateFilterVisible = false;
+
+toggleDateFilterButton.addEventListener('click', () => {
+    isDateFilterVisible = !isDateFilterVisible;
+    dateFilterContainer.classList.toggle('hidden', !isDateFilterVisible);
+    dateFilterContainer.classList.toggle('visible', isDateFilterVisible);
+
+    const icon = toggleDateFilterButton.querySelector('i');
+    icon.className = isDateFilterVisible ? 'fa-solid fa-calendar-days' : 'fa-solid fa-calendar-days';
+});
+
+document.getElementById('start-date-filter').addEventListener('change', resetAndRender);
+document.getElementById('end-date-filter').addEventListener('change', resetAndRender);
+
+renderPayments();
@@ -0,0 +1,58 @@
+function printAllTables() {
+    const productDetailTable = document.getElementById('product-detail-table');
+    const relatedCoursesTable = document.getElementById('related-courses-table');
+
+    if (!productDetailTable || !relatedCoursesTable) {
+        alert('Tables not found!');
+        return;
+    }
+
+    const printWindow = window.open('', '', 'height=500,width=800');
+    printWindow.document.write('<html><head><title>Print All Tables</title>');
+    printWindow.document.write('<style>table { width: 100%; border-collapse: collapse; } th, td { border: 1px solid #000; padding: 8px; }</style>');
+    printWindow.document.write('</head><body>');
+    printWindow.document.write('<h1>Product Details</h1>');
+    printWindow.document.write(productDetailTable.outerHTML);
+    printWindow.document.write('<h1>Related Courses</h1>');
+    printWindow.document.write(relatedCoursesTable.outerHTML);
+    printWindow.document.write('</body></html>');
+    printWindow.document.close();
+    printWindow.print();
+}
+
+function exportAllTablesToCSV() {
+    const productDetailTable = document.getElementById('product-detail-table');
+    const relatedCoursesTable = document.getElementById('related-courses-table');
+
+    if (!productDetailTable || !relatedCoursesTable) {
+        alert('Tables not found!');
+        return;
+    }
+
+    let csvContent = '';
+
+    csvContent += 'Product Details\n';
+    const productRows = productDetailTable.querySelectorAll('tr');
+    productRows.forEach(row => {
+        const cells = row.querySelectorAll('td, th');
+        const rowData = Array.from(cells).map(cell => cell.innerText.replace(/,/g, ';')).join(',');
+        csvContent += rowData + '\n';
+    });
+
+    csvContent += '\nRelated Courses\n';
+    const courseRows = relatedCoursesTable.querySelectorAll('tr');
+    courseRows.forEach(row => {
+        const cells = row.querySelectorAll('td, th');
+        const rowData = Array.from(cells).map(cell => cell.innerText.replace(/,/g, ';')).join(',');
+        csvContent += rowData + '\n';
+    });
+
+    const blob = new Blob([csvContent], { type: 'text/csv;charset=utf-8;' });
+    const link = document.createElement('a');
+    link.href = URL.createObjectURL(blob);
+    link.download = 'all_tables_data.csv';
+    link.style.display = 'none';
+    document.body.appendChild(link);
+    link.click();
+    document.body.removeChild(link);
+}
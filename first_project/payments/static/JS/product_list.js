@@ -0,0 +1,337 @@
+const productsPerPage = 5;
+let currentPage = 1;
+let totalPages = 1;
+let totalProducts = 0;
+let filteredDataGlobal = [];
+let isEditMode = false;
+let selectedProducts = new Set();
+let isAllSelected = false;
+
+const urlParams = new URLSearchParams(window.location.search);
+const pageParam = urlParams.get('page');
+if (pageParam) {
+    currentPage = parseInt(pageParam);
+}
+
+const storedSelectedRows = sessionStorage.getItem('selectedProducts');
+if (storedSelectedRows) {
+    selectedProducts = new Set(JSON.parse(storedSelectedRows));
+}
+
+const toggleSortButton = document.getElementById('toggle-sort-button');
+const sortContainer = document.getElementById('sort-container');
+let isSortVisible = false;
+
+let sortStates = {
+    'sort-title': { asc: true },
+    'sort-amount': { asc: true },
+    'sort-teacher': { asc: true }
+};
+
+toggleSortButton.addEventListener('click', () => {
+    isSortVisible = !isSortVisible;
+    sortContainer.classList.toggle('hidden', !isSortVisible);
+    sortContainer.classList.toggle('visible', isSortVisible);
+
+    const icon = toggleSortButton.querySelector('i');
+    icon.className = isSortVisible ? 'fa-solid fa-angles-right' : 'fa-solid fa-angles-left';
+});
+
+function sortTable(columnIndex, sortId) {
+    const table = document.querySelector('#product-table tbody');
+    const rows = Array.from(table.rows);
+    const sortState = sortStates[sortId];
+    sortState.asc = !sortState.asc;
+
+    rows.sort((a, b) => {
+        const textA = a.cells[columnIndex].textContent.trim().toLowerCase();
+        const textB = b.cells[columnIndex].textContent.trim().toLowerCase();
+        if (columnIndex === 2) {
+            return sortState.asc ? parseFloat(textA) - parseFloat(textB) : parseFloat(textB) - parseFloat(textA);
+        } else {
+            return sortState.asc ? textA.localeCompare(textB) : textB.localeCompare(textA);
+        }
+    });
+
+    table.innerHTML = '';
+    rows.forEach(row => table.appendChild(row));
+
+    updateSortIcon(sortId, sortState.asc);
+}
+
+function updateSortIcon(sortId, isAscending) {
+    const sortElement = document.getElementById(sortId);
+    const icon = sortElement.querySelector('i');
+    icon.className = isAscending ? 'fa-solid fa-arrow-up-wide-short' : 'fa-solid fa-arrow-up-short-wide';
+}
+
+function resetAndRender() {
+    currentPage = 1;
+    renderProducts();
+}
+
+function renderProducts() {
+    const productTableBody = document.querySelector('#product-table tbody');
+    productTableBody.innerHTML = '';
+
+    fetch('/api/products/')
+        .then(response => response.json())
+        .then(data => {
+            filteredDataGlobal = filterData(data);
+            totalProducts = filteredDataGlobal.length;
+            totalPages = Math.ceil(totalProducts / productsPerPage);
+            if (currentPage < 1) currentPage = 1;
+            if (currentPage > totalPages) currentPage = totalPages;
+            const start = (currentPage - 1) * productsPerPage;
+            const end = start + productsPerPage;
+            const pageData = filteredDataGlobal.slice(start, end);
+
+            pageData.forEach(product => {
+                const row = document.createElement('tr');
+                row.innerHTML = `
+                    <td>
+                        ${isEditMode ? `<div class="select-circle ${selectedProducts.has(product.id) ? 'selected' : ''}" data-id="${product.id}"></div>` : ''}
+                    </td>
+                    <td>${product.title}</td>
+                    <td>${product.amount}</td>
+                    <td>${product.teacher__name}</td>
+                `;
+                if (isEditMode) {
+                    const circle = row.querySelector('.select-circle');
+                    circle.addEventListener('click', (e) => {
+                        e.stopPropagation();
+                        circle.classList.toggle('selected');
+                        const productId = parseInt(circle.getAttribute('data-id'));
+                        if (circle.classList.contains('selected')) {
+                            selectedProducts.add(productId);
+                        } else {
+                            selectedProducts.delete(productId);
+                        }
+                        isAllSelected = false;
+                        renderSelectedRows();
+                    });
+                } else {
+                    row.addEventListener('click', () => {
+                        window.location.href = `/product-detail/${product.id}/`;
+                    });
+                }
+                productTableBody.appendChild(row);
+            });
+
+            renderPagination();
+            renderSelectedRows();
+        })
+        .catch(error => {
+            console.error('Error fetching products:', error);
+        });
+}
+
+function renderSelectedRows() {
+    const selectedRowsContainer = document.getElementById('selected-rows-container');
+    const selectedRowsList = document.getElementById('selected-rows-list');
+    selectedRowsList.innerHTML = '';
+
+    if (selectedProducts.size > 0) {
+        selectedRowsContainer.style.display = 'block';
+        filteredDataGlobal.forEach(product => {
+            if (selectedProducts.has(product.id)) {
+                const selectedRow = document.createElement('div');
+                selectedRow.className = 'selected-row';
+                selectedRow.innerHTML = `
+                    <span>${product.title}</span>
+                    <span>${product.amount}</span>
+                    <span>${product.teacher__name}</span>
+                `;
+                selectedRowsList.appendChild(selectedRow);
+            }
+        });
+    } else {
+        selectedRowsContainer.style.display = 'none';
+    }
+}
+
+function renderPagination() {
+    const paginationContainer = document.getElementById('pagination');
+    paginationContainer.innerHTML = '';
+
+    const firstPageButton = createPageButton(1);
+    paginationContainer.appendChild(firstPageButton);
+
+    if (currentPage > 3) {
+        const dotsBefore = document.createElement('span');
+        dotsBefore.className = 'dots';
+        dotsBefore.textContent = '...';
+        paginationContainer.appendChild(dotsBefore);
+    }
+
+    let startPage = Math.max(2, currentPage - 1);
+    let endPage = Math.min(totalPages - 1, currentPage + 1);
+
+    for (let i = startPage; i <= endPage; i++) {
+        const button = createPageButton(i);
+        paginationContainer.appendChild(button);
+    }
+
+    if (currentPage < totalPages - 2) {
+        const dotsAfter = document.createElement('span');
+        dotsAfter.className = 'dots';
+        dotsAfter.textContent = '...';
+        paginationContainer.appendChild(dotsAfter);
+    }
+
+    if (totalPages > 1) {
+        const lastPageButton = createPageButton(totalPages);
+        paginationContainer.appendChild(lastPageButton);
+    }
+
+    if (currentPage > 1) {
+        const leftArrow = document.createElement('img');
+        leftArrow.src = paginationContainer.dataset.previousIcon;
+        leftArrow.alt = 'Previous Page';
+        leftArrow.addEventListener('click', () => {
+            currentPage -= 1;
+            renderProducts();
+        });
+        paginationContainer.insertBefore(leftArrow, paginationContainer.firstChild);
+    }
+
+    if (currentPage < totalPages) {
+        const rightArrow = document.createElement('img');
+        rightArrow.src = paginationContainer.dataset.nextIcon;
+        rightArrow.alt = 'Next Page';
+        rightArrow.addEventListener('click', () => {
+            currentPage += 1;
+            renderProducts();
+        });
+        paginationContainer.appendChild(rightArrow);
+    }
+}
+
+function createPageButton(pageNumber) {
+    const button = document.createElement('button');
+    button.className = 'page-button';
+    if (pageNumber === currentPage) {
+        button.classList.add('active');
+    }
+    button.textContent = pageNumber;
+    button.addEventListener('click', () => {
+        currentPage = pageNumber;
+        renderProducts();
+    });
+    return button;
+}
+
+function filterData(data) {
+    const generalFilter = document.getElementById('general-filter').value.toLowerCase();
+
+    return data.filter(product => {
+        const titleMatch = product.title.toLowerCase().includes(generalFilter);
+        const amountMatch = product.amount.toString().includes(generalFilter);
+        const teacherMatch = product.teacher__name.toLowerCase().includes(generalFilter);
+
+        return titleMatch || amountMatch || teacherMatch;
+    });
+}
+
+function printTable(tableId) {
+    const table = document.getElementById(tableId);
+    if (!table) {
+        alert('Table not found!');
+        return;
+    }
+
+    let rowsToPrint = [];
+    if (isEditMode && selectedProducts.size > 0) {
+        rowsToPrint = filteredDataGlobal.filter(product => selectedProducts.has(product.id));
+    } else {
+        rowsToPrint = filteredDataGlobal;
+    }
+
+    if (rowsToPrint.length === 0) {
+        alert('No rows selected to print!');
+        return;
+    }
+
+    const w = window.open('', '', 'height=500,width=800');
+    w.document.write('<html><head><title>Print Table</title>');
+    w.document.write('<style>table { width: 100%; border-collapse: collapse; } th, td { border: 1px solid #000; padding: 8px; }</style>');
+    w.document.write('</head><body>');
+    w.document.write('<table>');
+    w.document.write('<thead><tr><th>Title</th><th>Amount</th><th>Teacher</th></tr></thead>');
+    w.document.write('<tbody>');
+    rowsToPrint.forEach(product => {
+        w.document.write(`
+            <tr>
+                <td>${product.title}</td>
+                <td>${product.amount}</td>
+                <td>${product.teacher__name}</td>
+            </tr>
+        `);
+    });
+    w.document.write('</tbody>');
+    w.document.write('</table>');
+    w.document.write('</body></html>');
+    w.document.close();
+    w.print();
+}
+
+function exportToCSV(tableId) {
+    const table = document.getElementById(tableId);
+    if (!table) {
+        alert('Table not found!');
+        return;
+    }
+
+    let rowsToExport = [];
+    if (isEditMode && selectedProducts.size > 0) {
+        rowsToExport = filteredDataGlobal.filter(product => selectedProducts.has(product.id));
+    } else {
+        rowsToExport = filteredDataGlobal;
+    }
+
+    if (rowsToExport.length === 0) {
+        alert('No rows selected to export!');
+        return;
+    }
+
+    let csv = 'Title,Amount,Teacher\n';
+    rowsToExport.forEach(product => {
+        csv += `${product.title},${product.amount},${product.teacher__name}\n`;
+    });
+    const blob = new Blob([csv], { type: 'text/csv;charset=utf-8;' });
+    const link = document.createElement('a');
+    link.href = URL.createObjectURL(blob);
+    link.download = tableId + '_data.csv';
+    link.style.display = 'none';
+    document.body.appendChild(link);
+    link.click();
+    document.body.removeChild(link);
+}
+
+document.getElementById('edit-button').addEventListener('click', () => {
+    isEditMode = !isEditMode;
+    selectedProducts.clear();
+    isAllSelected = false;
+    document.getElementById('select-all-button').style.display = isEditMode ? 'inline-block' : 'none';
+    document.getElementById('selected-rows-container').style.display = isEditMode ? 'block' : 'none';
+    renderProducts();
+});
+
+document.getElementById('select-all-button').addEventListener('click', () => {
+    const currentPageData = filteredDataGlobal.slice(
+        (currentPage - 1) * productsPerPage,
+        currentPage * productsPerPage
+    );
+    if (isAllSelected) {
+        currentPageData.forEach(product => selectedProducts.delete(product.id));
+        isAllSelected = false;
+    } else {
+        currentPageData.forEach(product => selectedProducts.add(product.id));
+        isAllSelected = true;
+    }
+    renderProducts();
+});
+
+document.getElementById('general-filter').addEventListener('input', resetAndRender);
+
+renderProducts();
@@ -0,0 +1,58 @@
+function printAllTables() {
+    const studentDetailTable = document.getElementById('student-detail-table');
+    const relatedPaymentsTable = document.getElementById('related-payments-table');
+
+    if (!studentDetailTable || !relatedPaymentsTable) {
+        alert('Tables not found!');
+        return;
+    }
+
+    const printWindow = window.open('', '', 'height=500,width=800');
+    printWindow.document.write('<html><head><title>Print All Tables</title>');
+    printWindow.document.write('<style>table { width: 100%; border-collapse: collapse; } th, td { border: 1px solid #000; padding: 8px; }</style>');
+    printWindow.document.write('</head><body>');
+    printWindow.document.write('<h1>Student Details</h1>');
+    printWindow.document.write(studentDetailTable.outerHTML);
+    printWindow.document.write('<h1>Related Payments</h1>');
+    printWindow.document.write(relatedPaymentsTable.outerHTML);
+    printWindow.document.write('</body></html>');
+    printWindow.document.close();
+    printWindow.print();
+}
+
+function exportAllTablesToCSV() {
+    const studentDetailTable = document.getElementById('student-detail-table');
+    const relatedPaymentsTable = document.getElementById('related-payments-table');
+
+    if (!studentDetailTable || !relatedPaymentsTable) {
+        alert('Tables not found!');
+        return;
+    }
+
+    let csvContent = '';
+
+    csvContent += 'Student Details\n';
+    const studentRows = studentDetailTable.querySelectorAll('tr');
+    studentRows.forEach(row => {
+        const cells = row.querySelectorAll('td, th');
+        const rowData = Array.from(cells).map(cell => cell.innerText.replace(/,/g, ';')).join(',');
+        csvContent += rowData + '\n';
+    });
+
+    csvContent += '\nRelated Payments\n';
+    const paymentRows = relatedPaymentsTable.querySelectorAll('tr');
+    paymentRows.forEach(row => {
+        const cells = row.querySelectorAll('td, th');
+        const rowData = Array.from(cells).map(cell => cell.innerText.replace(/,/g, ';')).join(',');
+        csvContent += rowData + '\n';
+    });
+
+    const blob = new Blob([csvContent], { type: 'text/csv;charset=utf-8;' });
+    const link = document.createElement('a');
+    link.href = URL.createObjectURL(blob);
+    link.download = 'all_tables_data.csv';
+    link.style.display = 'none';
+    document.body.appendChild(link);
+    link.click();
+    document.body.removeChild(link);
+}
@@ -0,0 +1,332 @@
+const studentsPerPage = 5;
+let currentPage = 1;
+let totalPages = 1;
+let totalStudents = 0;
+let filteredDataGlobal = [];
+let isEditMode = false;
+let selectedStudents = new Set();
+let isAllSelected = false;
+
+const urlParams = new URLSearchParams(window.location.search);
+const pageParam = urlParams.get('page');
+if (pageParam) {
+    currentPage = parseInt(pageParam);
+}
+
+const storedSelectedRows = sessionStorage.getItem('selectedStudents');
+if (storedSelectedRows) {
+    selectedStudents = new Set(JSON.parse(storedSelectedRows));
+}
+
+const toggleSortButton = document.getElementById('toggle-sort-button');
+const sortContainer = document.getElementById('sort-container');
+let isSortVisible = false;
+
+let sortStates = {
+    'sort-name': { asc: true },
+    'sort-national-id': { asc: true }
+};
+
+toggleSortButton.addEventListener('click', () => {
+    isSortVisible = !isSortVisible;
+    sortContainer.classList.toggle('hidden', !isSortVisible);
+    sortContainer.classList.toggle('visible', isSortVisible);
+
+    const icon = toggleSortButton.querySelector('i');
+    icon.className = isSortVisible ? 'fa-solid fa-angles-right' : 'fa-solid fa-angles-left';
+});
+
+function sortTable(columnIndex, sortId) {
+    const table = document.querySelector('#student-table tbody');
+    const rows = Array.from(table.rows);
+    const sortState = sortStates[sortId];
+    sortState.asc = !sortState.asc;
+
+    rows.sort((a, b) => {
+        const textA = a.cells[columnIndex].textContent.trim().toLowerCase();
+        const textB = b.cells[columnIndex].textContent.trim().toLowerCase();
+        if (columnIndex === 2) {
+            return sortState.asc ? parseInt(textA) - parseInt(textB) : parseInt(textB) - parseInt(textA);
+        } else {
+            return sortState.asc ? textA.localeCompare(textB) : textB.localeCompare(textA);
+        }
+    });
+
+    table.innerHTML = '';
+    rows.forEach(row => table.appendChild(row));
+
+    updateSortIcon(sortId, sortState.asc);
+}
+
+function updateSortIcon(sortId, isAscending) {
+    const sortElement = document.getElementById(sortId);
+    const icon = sortElement.querySelector('i');
+    icon.className = isAscending ? 'fa-solid fa-arrow-up-wide-short' : 'fa-solid fa-arrow-up-short-wide';
+}
+
+function resetAndRender() {
+    currentPage = 1;
+    renderStudents();
+}
+
+function renderStudents() {
+    const studentTableBody = document.querySelector('#student-table tbody');
+    studentTableBody.innerHTML = '';
+
+    fetch('/api/students/')
+        .then(response => response.json())
+        .then(data => {
+            filteredDataGlobal = filterData(data);
+            totalStudents = filteredDataGlobal.length;
+            totalPages = Math.ceil(totalStudents / studentsPerPage);
+            if (currentPage < 1) currentPage = 1;
+            if (currentPage > totalPages) currentPage = totalPages;
+            const start = (currentPage - 1) * studentsPerPage;
+            const end = start + studentsPerPage;
+            const pageData = filteredDataGlobal.slice(start, end);
+
+            pageData.forEach(student => {
+                const row = document.createElement('tr');
+                row.innerHTML = `
+                    <td>
+                        ${isEditMode ? `<div class="select-circle ${selectedStudents.has(student.id) ? 'selected' : ''}" data-id="${student.id}"></div>` : ''}
+                    </td>
+                    <td>${student.name}</td>
+                    <td>${student.national_id}</td>
+                `;
+                if (isEditMode) {
+                    const circle = row.querySelector('.select-circle');
+                    circle.addEventListener('click', (e) => {
+                        e.stopPropagation();
+                        circle.classList.toggle('selected');
+                        const studentId = parseInt(circle.getAttribute('data-id'));
+                        if (circle.classList.contains('selected')) {
+                            selectedStudents.add(studentId);
+                        } else {
+                            selectedStudents.delete(studentId);
+                        }
+                        isAllSelected = false;
+                        renderSelectedRows();
+                    });
+                } else {
+                    row.addEventListener('click', () => {
+                        window.location.href = `/student-detail/${student.id}/`;
+                    });
+                }
+                studentTableBody.appendChild(row);
+            });
+
+            renderPagination();
+            renderSelectedRows();
+        })
+        .catch(error => {
+            console.error('Error fetching students:', error);
+        });
+}
+
+function renderSelectedRows() {
+    const selectedRowsContainer = document.getElementById('selected-rows-container');
+    const selectedRowsList = document.getElementById('selected-rows-list');
+    selectedRowsList.innerHTML = '';
+
+    if (selectedStudents.size > 0) {
+        selectedRowsContainer.style.display = 'block';
+        filteredDataGlobal.forEach(student => {
+            if (selectedStudents.has(student.id)) {
+                const selectedRow = document.createElement('div');
+                selectedRow.className = 'selected-row';
+                selectedRow.innerHTML = `
+                    <span>${student.name}</span>
+                    <span>${student.national_id}</span>
+                `;
+                selectedRowsList.appendChild(selectedRow);
+            }
+        });
+    } else {
+        selectedRowsContainer.style.display = 'none';
+    }
+}
+
+function renderPagination() {
+    const paginationContainer = document.getElementById('pagination');
+    paginationContainer.innerHTML = '';
+
+    const firstPageButton = createPageButton(1);
+    paginationContainer.appendChild(firstPageButton);
+
+    if (currentPage > 3) {
+        const dotsBefore = document.createElement('span');
+        dotsBefore.className = 'dots';
+        dotsBefore.textContent = '...';
+        paginationContainer.appendChild(dotsBefore);
+    }
+
+    let startPage = Math.max(2, currentPage - 1);
+    let endPage = Math.min(totalPages - 1, currentPage + 1);
+
+    for (let i = startPage; i <= endPage; i++) {
+        const button = createPageButton(i);
+        paginationContainer.appendChild(button);
+    }
+
+    if (currentPage < totalPages - 2) {
+        const dotsAfter = document.createElement('span');
+        dotsAfter.className = 'dots';
+        dotsAfter.textContent = '...';
+        paginationContainer.appendChild(dotsAfter);
+    }
+
+    if (totalPages > 1) {
+        const lastPageButton = createPageButton(totalPages);
+        paginationContainer.appendChild(lastPageButton);
+    }
+
+    if (currentPage > 1) {
+        const leftArrow = document.createElement('img');
+        leftArrow.src = paginationContainer.dataset.previousIcon;
+        leftArrow.alt = 'Previous Page';
+        leftArrow.addEventListener('click', () => {
+            currentPage -= 1;
+            renderStudents();
+        });
+        paginationContainer.insertBefore(leftArrow, paginationContainer.firstChild);
+    }
+
+    if (currentPage < totalPages) {
+        const rightArrow = document.createElement('img');
+        rightArrow.src = paginationContainer.dataset.nextIcon;
+        rightArrow.alt = 'Next Page';
+        rightArrow.addEventListener('click', () => {
+            currentPage += 1;
+            renderStudents();
+        });
+        paginationContainer.appendChild(rightArrow);
+    }
+}
+
+function createPageButton(pageNumber) {
+    const button = document.createElement('button');
+    button.className = 'page-button';
+    if (pageNumber === currentPage) {
+        button.classList.add('active');
+    }
+    button.textContent = pageNumber;
+    button.addEventListener('click', () => {
+        currentPage = pageNumber;
+        renderStudents();
+    });
+    return button;
+}
+
+function filterData(data) {
+    const generalFilter = document.getElementById('general-filter').value.toLowerCase();
+
+    return data.filter(student => {
+        const nameMatch = student.name.toLowerCase().includes(generalFilter);
+        const nationalIdMatch = student.national_id.includes(generalFilter);
+
+        return nameMatch || nationalIdMatch;
+    });
+}
+
+function printTable(tableId) {
+    const table = document.getElementById(tableId);
+    if (!table) {
+        alert('Table not found!');
+        return;
+    }
+
+    let rowsToPrint = [];
+    if (isEditMode && selectedStudents.size > 0) {
+        rowsToPrint = filteredDataGlobal.filter(student => selectedStudents.has(student.id));
+    } else {
+        rowsToPrint = filteredDataGlobal;
+    }
+
+    if (rowsToPrint.length === 0) {
+        alert('No rows selected to print!');
+        return;
+    }
+
+    const w = window.open('', '', 'height=500,width=800');
+    w.document.write('<html><head><title>Print Table</title>');
+    w.document.write('<style>table { width: 100%; border-collapse: collapse; } th, td { border: 1px solid #000; padding: 8px; }</style>');
+    w.document.write('</head><body>');
+    w.document.write('<table>');
+    w.document.write('<thead><tr><th>Name</th><th>National ID</th></tr></thead>');
+    w.document.write('<tbody>');
+    rowsToPrint.forEach(student => {
+        w.document.write(`
+            <tr>
+                <td>${student.name}</td>
+                <td>${student.national_id}</td>
+            </tr>
+        `);
+    });
+    w.document.write('</tbody>');
+    w.document.write('</table>');
+    w.document.write('</body></html>');
+    w.document.close();
+    w.print();
+}
+
+function exportToCSV(tableId) {
+    const table = document.getElementById(tableId);
+    if (!table) {
+        alert('Table not found!');
+        return;
+    }
+
+    let rowsToExport = [];
+    if (isEditMode && selectedStudents.size > 0) {
+        rowsToExport = filteredDataGlobal.filter(student => selectedStudents.has(student.id));
+    } else {
+        rowsToExport = filteredDataGlobal;
+    }
+
+    if (rowsToExport.length === 0) {
+        alert('No rows selected to export!');
+        return;
+    }
+
+    let csv = 'Name,National ID\n';
+    rowsToExport.forEach(student => {
+        csv += `${student.name},${student.national_id}\n`;
+    });
+    const blob = new Blob([csv], { type: 'text/csv;charset=utf-8;' });
+    const link = document.createElement('a');
+    link.href = URL.createObjectURL(blob);
+    link.download = tableId + '_data.csv';
+    link.style.display = 'none';
+    document.body.appendChild(link);
+    link.click();
+    document.body.removeChild(link);
+}
+
+document.getElementById('edit-button').addEventListener('click', () => {
+    isEditMode = !isEditMode;
+    selectedStudents.clear();
+    isAllSelected = false;
+    document.getElementById('select-all-button').style.display = isEditMode ? 'inline-block' : 'none';
+    document.getElementById('selected-rows-container').style.display = isEditMode ? 'block' : 'none';
+    renderStudents();
+});
+
+document.getElementById('select-all-button').addEventListener('click', () => {
+    const currentPageData = filteredDataGlobal.slice(
+        (currentPage - 1) * studentsPerPage,
+        currentPage * studentsPerPage
+    );
+    if (isAllSelected) {
+        currentPageData.forEach(student => selectedStudents.delete(student.id));
+        isAllSelected = false;
+    } else {
+        currentPageData.forEach(student => selectedStudents.add(student.id));
+        isAllSelected = true;
+    }
+    renderStudents();
+});
+
+document.getElementById('general-filter').addEventListener('input', resetAndRender);
+
+renderStudents();
@@ -0,0 +1,82 @@
+function printAllTables() {
+    const teacherDetailTable = document.getElementById('teacher-detail-table');
+    const relatedPaymentsTable = document.getElementById('related-payments-table');
+    const relatedCoursesTable = document.getElementById('related-courses-table');
+    const relatedProductsTable = document.getElementById('related-products-table');
+
+    if (!teacherDetailTable || !relatedPaymentsTable || !relatedCoursesTable || !relatedProductsTable) {
+        alert('Tables not found!');
+        return;
+    }
+
+    const printWindow = window.open('', '', 'height=500,width=800');
+    printWindow.document.write('<html><head><title>Print All Tables</title>');
+    printWindow.document.write('<style>table { width: 100%; border-collapse: collapse; } th, td { border: 1px solid #000; padding: 8px; }</style>');
+    printWindow.document.write('</head><body>');
+    printWindow.document.write('<h1>Teacher Details</h1>');
+    printWindow.document.write(teacherDetailTable.outerHTML);
+    printWindow.document.write('<h1>Related Payments</h1>');
+    printWindow.document.write(relatedPaymentsTable.outerHTML);
+    printWindow.document.write('<h1>Related Courses</h1>');
+    printWindow.document.write(relatedCoursesTable.outerHTML);
+    printWindow.document.write('<h1>Related Products</h1>');
+    printWindow.document.write(relatedProductsTable.outerHTML);
+    printWindow.document.write('</body></html>');
+    printWindow.document.close();
+    printWindow.print();
+}
+
+function exportAllTablesToCSV() {
+    const teacherDetailTable = document.getElementById('teacher-detail-table');
+    const relatedPaymentsTable = document.getElementById('related-payments-table');
+    const relatedCoursesTable = document.getElementById('related-courses-table');
+    const relatedProductsTable = document.getElementById('related-products-table');
+
+    if (!teacherDetailTable || !relatedPaymentsTable || !relatedCoursesTable || !relatedProductsTable) {
+        alert('Tables not found!');
+        return;
+    }
+
+    let csvContent = '';
+
+    csvContent += 'Teacher Details\n';
+    const teacherRows = teacherDetailTable.querySelectorAll('tr');
+    teacherRows.forEach(row => {
+        const cells = row.querySelectorAll('td, th');
+        const rowData = Array.from(cells).map(cell => cell.innerText.replace(/,/g, ';')).join(',');
+        csvContent += rowData + '\n';
+    });
+
+    csvContent += '\nRelated Payments\n';
+    const paymentRows = relatedPaymentsTable.querySelectorAll('tr');
+    paymentRows.forEach(row => {
+        const cells = row.querySelectorAll('td, th');
+        const rowData = Array.from(cells).map(cell => cell.innerText.replace(/,/g, ';')).join(',');
+        csvContent += rowData + '\n';
+    });
+
+    csvContent += '\nRelated Courses\n';
+    const courseRows = relatedCoursesTable.querySelectorAll('tr');
+    courseRows.forEach(row => {
+        const cells = row.querySelectorAll('td, th');
+        const rowData = Array.from(cells).map(cell => cell.innerText.replace(/,/g, ';')).join(',');
+        csvContent += rowData + '\n';
+    });
+
+    csvContent += '\nRelated Products\n';
+    const productRows = relatedProductsTable.querySelectorAll('tr');
+    productRows.forEach(row => {
+        const cells = row.querySelectorAll('td, th');
+        const rowData = Array.from(cells).map(cell => cell.innerText.replace(/,/g, ';')).join(',');
+        csvContent += rowData + '\n';
+    });
+
+    const blob = new Blob([csvContent], { type: 'text/csv;charset=utf-8;' });
+    const link = document.createElement('a');
+    link.href = URL.createObjectURL(blob);
+    link.download = 'all_tables_data.csv';
+    link.style.display = 'none';
+    document.body.appendChild(link);
+    link.click();
+    document.body.removeChild(link);
+}
@@ -0,0 +1,45 @@
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage
+from django.core.files.base import ContentFile
+
+from . import compression
+
+
+class CompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    """Content-hashed static files, plus ``.gz`` and ``.br`` copies of the text ones.
+
+    ``collectstatic`` names every file after a hash of its content (``list.css`` becomes
+    ``list.3f2a9c1e.css``) and records the mapping in ``staticfiles.json`` for the ``{% static %}`` tag.
+    A changed file gets a new URL, so the web server can mark ``STATIC_URL`` cacheable forever. The
+    compressed copies sit next to the hashed files for a server that serves precompressed files
+    (nginx ``gzip_static``/``brotli_static``).
+    """
+
+    def stored_name(self, name):
+        # Before the first collectstatic there is no manifest: use the plain names, as in development.
+        if not self.hashed_files:
+            return name
+        return super().stored_name(name)
+
+    def post_process(self, paths, dry_run=False, **options):
+        yield from super().post_process(paths, dry_run=dry_run, **options)
+        if dry_run:
+            return
+        for name in set(self.hashed_files.values()):
+            if name.endswith(compression.STATIC_EXTENSIONS):
+                yield from self.compress(name)
+
+    def compress(self, name):
+        with self.open(name) as f:
+            content = f.read()
+        if len(content) < compression.min_size():
+            return
+        for encoding, suffix in (('gzip', '.gz'), ('br', '.br')):
+            if encoding not in compression.encodings():
+                continue
+            compressed = compression.compress(content, encoding, compression.STATIC_LEVELS[encoding])
+            if len(compressed) >= len(content):
+                continue
+            if self.exists(name + suffix):
+                self.delete(name + suffix)
+            self._save(name + suffix, ContentFile(compressed))
+            yield name, name + suffix, True
@@ -0,0 +1,60 @@
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import StreamingHttpResponse
+
+JSON = 'application/json'
+NDJSON = 'application/x-ndjson'
+FORMATS = {'json': JSON, 'ndjson': NDJSON}
+
+DEFAULT_CHUNK_SIZE = 2000
+ROWS_PER_WRITE = 500
+
+
+def requested_format(request):
+    """Return ``'json'`` or ``'ndjson'`` if the client asked for one explicitly, else ``None``."""
+    fmt = request.GET.get('format')
+    if fmt in FORMATS:
+        return fmt
+    if NDJSON in request.headers.get('Accept', ''):
+        return 'ndjson'
+    return None
+
+
+def iter_json_array(rows, encoder):
+    yield '['
+    buffer = []
+    first = True
+    for row in rows:
+        buffer.append(encoder.encode(row) if first else ',' + encoder.encode(row))
+        first = False
+        if len(buffer) >= ROWS_PER_WRITE:
+            yield ''.join(buffer)
+            buffer = []
+    buffer.append(']')
+    yield ''.join(buffer)
+
+
+def iter_ndjson(rows, encoder):
+    buffer = []
+    for row in rows:
+        buffer.append(encoder.encode(row) + '\n')
+        if len(buffer) >= ROWS_PER_WRITE:
+            yield ''.join(buffer)
+            buffer = []
+    if buffer:
+        yield ''.join(buffer)
+
+
+def stream_queryset(queryset, fmt='json', chunk_size=DEFAULT_CHUNK_SIZE):
+    """Stream a ``values()`` queryset as a JSON array or NDJSON without materialising it.
+
+    Rows are fetched with ``iterator(chunk_size=...)`` and written in small batches, so memory
+    stays bounded by the chunk size instead of the table size.
+    """
+    return stream_rows(queryset.iterator(chunk_size=chunk_size), fmt)
+
+
+def stream_rows(rows, fmt='json'):
+    """Stream any iterable of dicts, e.g. ``lookups.labelled_values()``, like ``stream_queryset``."""
+    encoder = DjangoJSONEncoder()
+    body = iter_ndjson(rows, encoder) if fmt == 'ndjson' else iter_json_array(rows, encoder)
+    return StreamingHttpResponse(body, content_type=FORMATS.get(fmt, JSON))
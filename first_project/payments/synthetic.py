@@ -0,0 +1,218 @@
+import random
+from contextlib import contextmanager
+from datetime import date, datetime, time, timedelta
+from datetime import timezone as dt_timezone
+from decimal import Decimal
+
+from django.apps import apps
+from django.db import transaction
+from faker import Faker
+
+from . import caching, lookups, rollups
+from .models import (
+    Person, BankAccount, PaymentMethod, PaymentType, Status, PaymentCategory, Payment, Student, Teacher,
+    Olympiad, Product, Course, StudentAgreement, TeacherAgreement, PaymentAgreement, Installment,
+    InstallmentStatus,
+)
+
+DEFAULT_BATCH_SIZE = 5000
+# Distinct names drawn from Faker once; rows combine them, which is far faster than one Faker call per row.
+NAME_POOL_SIZE = 2000
+
+PAYMENT_METHODS = ('cash', 'card', 'transfer', 'cheque')
+PAYMENT_TYPES = ('incoming', 'outgoing')
+STATUSES = ('paid', 'pending', 'failed')
+CATEGORIES = ('Tuition', 'Salary', 'Books', 'Rent', 'Utilities', 'Olympiad fees')
+INSTALLMENT_STATUSES = ('due', 'received', 'overdue')
+
+
+@contextmanager
+def explicit_timestamps(model, *field_names):
+    """Let ``bulk_create`` keep the values set on ``auto_now_add`` fields instead of stamping the current time."""
+    fields = [model._meta.get_field(name) for name in field_names]
+    for field in fields:
+        field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field in fields:
+            field.auto_now_add = True
+
+
+class SyntheticDataset:
+    """Generate a linked dataset of about ``payments`` payments with ``bulk_create``.
+
+    Every other table is sized from the payment count: one person per ten payments (one in twenty of them
+    teachers, the rest students), three products and courses per teacher, one agreement per student and
+    product, three installments per agreement. Dates fall in the ``years`` before ``end`` (default today);
+    with the same ``seed`` and ``end`` the rows are always the same. Payments are written in batches, so
+    memory stays bounded by ``batch_size``.
+
+    ``bulk_create`` bypasses the model signals, so the rollups are rebuilt and the lookup and response
+    caches invalidated at the end; the change log is not written, so delta-sync clients must resync.
+    """
+
+    def __init__(self, payments, seed=0, batch_size=DEFAULT_BATCH_SIZE, progress=None, years=3, end=None):
+        self.payments = payments
+        self.batch_size = batch_size
+        self.progress = progress or (lambda message: None)
+        self.random = random.Random(seed)
+        self.faker = Faker()
+        self.faker.seed_instance(seed)
+        self.end = datetime.combine(end or date.today(), time.min, tzinfo=dt_timezone.utc)
+        self.span = timedelta(days=365 * years)
+        self.counts = {}
+
+    def run(self):
+        first_names = [self.faker.first_name() for _ in range(NAME_POOL_SIZE)]
+        last_names = [self.faker.last_name() for _ in range(NAME_POOL_SIZE)]
+        self.names = [f'{self.random.choice(first_names)} {self.random.choice(last_names)}'
+                      for _ in range(NAME_POOL_SIZE)]
+        self.phrases = [self.faker.bs().capitalize() for _ in range(NAME_POOL_SIZE)]
+        self.sentences = [self.faker.sentence() for _ in range(NAME_POOL_SIZE)]
+
+        with transaction.atomic():
+            dimensions = self.create_dimensions()
+            people = self.create_people()
+            teachers, students = self.create_teachers_and_students(people)
+            products, courses = self.create_products_and_courses(teachers)
+            agreements = self.create_agreements(students, courses, products)
+            self.create_installments(agreements, dimensions[InstallmentStatus])
+            accounts = self.create_bank_accounts()
+            self.create_payments(people, accounts, dimensions)
+            self.progress('Rebuilding rollups')
+            rollups.rebuild()
+        for model in lookups.DIMENSIONS:
+            lookups.dimensions.invalidate(model)
+        for model in apps.get_app_config('payments').get_models():
+            caching.bump(model)
+        return self.counts
+
+    def create(self, model, objects):
+        created = model.objects.bulk_create(objects, batch_size=self.batch_size)
+        self.counts[model._meta.model_name] = self.counts.get(model._meta.model_name, 0) + len(created)
+        return created
+
+    def get_or_create_titles(self, model, field, titles):
+        existing = dict(model.objects.filter(**{f'{field}__in': titles}).values_list(field, 'pk'))
+        missing = [model(**{field: title}) for title in titles if title not in existing]
+        for row in self.create(model, missing):
+            existing[getattr(row, field)] = row.pk
+        return [existing[title] for title in titles]
+
+    def create_dimensions(self):
+        return {
+            PaymentMethod: self.get_or_create_titles(PaymentMethod, 'title', PAYMENT_METHODS),
+            PaymentType: self.get_or_create_titles(PaymentType, 'title', PAYMENT_TYPES),
+            Status: self.get_or_create_titles(Status, 'title', STATUSES),
+            PaymentCategory: self.get_or_create_titles(PaymentCategory, 'name', CATEGORIES),
+            InstallmentStatus: self.get_or_create_titles(InstallmentStatus, 'title', INSTALLMENT_STATUSES),
+        }
+
+    def national_ids(self, model, count):
+        # Continue after the ids already present so repeated runs never collide on the unique column.
+        start = 10 ** 9 + model.objects.count()
+        return [str(start + i) for i in range(count)]
+
+    def create_people(self):
+        count = max(self.payments // 10, 20)
+        self.progress(f'Creating {count} people')
+        return self.create(Person, [
+            Person(name=self.random.choice(self.names), national_id=national_id)
+            for national_id in self.national_ids(Person, count)
+        ])
+
+    def create_teachers_and_students(self, people):
+        split = max(len(people) // 20, 2)
+        teachers = self.create(Teacher, [
+            Teacher(person=person, name=person.name, national_id=person.national_id) for person in people[:split]
+        ])
+        students = self.create(Student, [
+            Student(person=person, name=person.name, national_id=person.national_id) for person in people[split:]
+        ])
+        return teachers, students
+
+    def create_products_and_courses(self, teachers):
+        olympiads = self.create(Olympiad, [Olympiad(title=f'{self.faker.country()} Olympiad') for _ in range(5)])
+        products = self.create(Product, [
+            Product(title=self.faker.catch_phrase(), description=self.random.choice(self.sentences), teacher=teacher,
+                    amount=Decimal(self.random.randrange(50, 500)))
+            for teacher in teachers for _ in range(3)
+        ])
+        courses = []
+        for product in products:
+            start = (self.end - self.random.random() * self.span).date()
+            courses.append(Course(
+                title=product.title, related_product=product, teacher=product.teacher,
+                session_time=time(self.random.randrange(8, 20)), start_date=start,
+                end_date=start + timedelta(weeks=self.random.randrange(4, 40)),
+                olympiad=self.random.choice(olympiads) if self.random.random() < 0.2 else None,
+            ))
+        return products, self.create(Course, courses)
+
+    def create_agreements(self, students, courses, products):
+        student_agreements = []
+        for student in students:
+            course = self.random.choice(courses)
+            student_agreements.append(StudentAgreement(student=student, course=course,
+                                                       amount=course.related_product.amount))
+        student_agreements = self.create(StudentAgreement, student_agreements)
+        teacher_agreements = self.create(TeacherAgreement, [
+            TeacherAgreement(teacher=product.teacher, product=product, amount=product.amount * 10)
+            for product in products
+        ])
+        return self.create(PaymentAgreement, [
+            PaymentAgreement(student_agreement=agreement, payment_direction='in', total_amount=int(agreement.amount))
+            for agreement in student_agreements
+        ] + [
+            PaymentAgreement(teacher_agreement=agreement, payment_direction='out',
+                             total_amount=int(agreement.amount))
+            for agreement in teacher_agreements
+        ])
+
+    def create_installments(self, agreements, statuses):
+        due, received, overdue = statuses
+        installments = []
+        for agreement in agreements:
+            first_due = self.end - self.random.random() * self.span
+            for n in range(3):
+                due_date = first_due + timedelta(days=30 * n)
+                paid = due_date < self.end and self.random.random() < 0.8
+                installments.append(Installment(
+                    payment_agreement=agreement, amount=round(agreement.total_amount / 3, 2), due_date=due_date,
+                    received_date=due_date + timedelta(days=self.random.randrange(0, 10)) if paid else None,
+                    status_id=received if paid else (overdue if due_date < self.end else due),
+                ))
+        self.create(Installment, installments)
+
+    def create_bank_accounts(self):
+        count = max(self.payments // 1000, 3)
+        return self.create(BankAccount, [
+            BankAccount(name=f'{self.faker.company()} Bank', bank_number=national_id)
+            for national_id in self.national_ids(BankAccount, count)
+        ])
+
+    def create_payments(self, people, accounts, dimensions):
+        incoming, outgoing = dimensions[PaymentType]
+        categories = dimensions[PaymentCategory]
+        with explicit_timestamps(Payment, 'datetime'):
+            for start in range(0, self.payments, self.batch_size):
+                size = min(self.batch_size, self.payments - start)
+                self.progress(f'Creating payments {start + 1}-{start + size} of {self.payments}')
+                batch = []
+                for _ in range(size):
+                    person = self.random.choice(people)
+                    category = self.random.choice(categories)
+                    batch.append(Payment(
+                        name=f'{self.random.choice(self.phrases)} - {person.name}',
+                        amount=Decimal(self.random.randrange(100, 500000)) / 100,
+                        datetime=self.end - self.random.random() * self.span,
+                        related_person=person,
+                        payment_method_id=self.random.choice(dimensions[PaymentMethod]),
+                        status_id=self.random.choice(dimensions[Status]),
+                        category_id=category,
+                        payment_type_id=incoming if self.random.random() < 0.6 else outgoing,
+                        related_bank_account=self.random.choice(accounts) if self.random.random() < 0.9 else None,
+                        info_text=self.random.choice(self.sentences) if self.random.random() < 0.3 else None,
+                    ))
+                self.create(Payment, batch)
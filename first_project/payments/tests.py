@@ -1,5 +1,44 @@
-from django.test import TestCase, Client
-from .models import PaymentCategory, Payment, Person, BankAccount
+import asyncio
+import gzip
+import json
+import os
+import tempfile
+import threading
+from datetime import date, datetime, timedelta, timezone as dt_timezone
+from decimal import Decimal
+from importlib import import_module
+from io import BytesIO, StringIO
+from unittest import mock
+
+import brotli
+import pandas as pd
+from openpyxl import load_workbook
+from asgiref.sync import sync_to_async
+from prometheus_client import REGISTRY
+from django.contrib.auth.models import User
+from django.core.cache import cache, caches
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import connection, transaction
+from django.db.migrations.loader import MigrationLoader
+from django.template import engines
+from django.template.loaders.cached import Loader as CachedLoader
+from django.test import SimpleTestCase, TestCase, Client, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.templatetags.static import static
+from django.urls import reverse
+from django.utils import timezone
+from . import aggregation, benchmark, columnar, compression, events, exports, instrumentation, jobs, lookups, \
+    parallel, rollups, workbook
+from .importers import IMPORT_SPECS, ImportResult, import_dataframe
+from .validation import DataFrameValidator, validate_dataframe
+from .pagination import keyset_page
+from .readers import read_chunks
+from .storage import CompressedManifestStaticFilesStorage
+from .synthetic import SyntheticDataset
+from .models import PaymentCategory, Payment, Person, BankAccount, PaymentMethod, PaymentType, Status, \
+    PaymentRollup, Student, Installment, ImportJob, Olympiad, Course, StudentAgreement, PaymentAgreement, Teacher, \
+    Product, InstallmentStatus, ChangeLog
 
 
 class PaymentTests(TestCase):
@@ -7,14 +46,15 @@ class PaymentTests(TestCase):
         self.category = PaymentCategory.objects.create(name='Test Category')
         self.person = Person.objects.create(name='John Doe', national_id='123456')
         self.bank_account = BankAccount.objects.create(name='Test Bank', bank_number='123456789')
+        self.status = Status.objects.create(title='pending')
         self.payment = Payment.objects.create(
             name='Test Payment',
             amount=100.00,
             related_person=self.person,
-            payment_method='cash',
-            status='pending',
+            payment_method=PaymentMethod.objects.create(title='cash'),
+            status=self.status,
             category=self.category,
-            payment_type='out',
+            payment_type=PaymentType.objects.create(title='out'),
             related_bank_account=self.bank_account
         )
 
@@ -26,6 +66,1281 @@ class PaymentTests(TestCase):
 
     def test_filter_payments_view(self):
         client = Client()
-        response = client.get('/filter-payments/?category_id=1&status=pending')
+        client.force_login(User.objects.create_user('staff', password='secret', is_staff=True))
+        response = client.get(f'/api/payments/?category={self.category.pk}&status={self.status.pk}')
         self.assertEqual(response.status_code, 200)
         self.assertContains(response, 'Test Payment')
+
+
+class PaymentFixtureMixin:
+    def setUp(self):
+        self.person = Person.objects.create(name='Jane Roe', national_id='111111')
+        self.other_person = Person.objects.create(name='Max Mustermann', national_id='222222')
+        self.bank_account = BankAccount.objects.create(name='Main Bank', bank_number='987654321')
+        self.method = PaymentMethod.objects.create(title='cash')
+        self.status = Status.objects.create(title='paid')
+        self.category = PaymentCategory.objects.create(name='Tuition')
+        self.incoming = PaymentType.objects.create(title='incoming')
+        self.outgoing = PaymentType.objects.create(title='outgoing')
+        self.user = User.objects.create_user('staff', password='secret', is_staff=True)
+        self.client.force_login(self.user)
+
+    def create_payment(self, name, amount, payment_type, when=None, person=None, **kwargs):
+        fields = {
+            'name': name,
+            'amount': Decimal(amount),
+            'related_person': person or self.person,
+            'payment_method': self.method,
+            'status': self.status,
+            'category': self.category,
+            'payment_type': payment_type,
+            'related_bank_account': self.bank_account,
+        }
+        fields.update(kwargs)
+        payment = Payment.objects.create(**fields)
+        if when is not None:
+            Payment.objects.filter(pk=payment.pk).update(datetime=when)
+            payment.refresh_from_db()
+        return payment
+
+
+class SummaryPaymentsMixin:
+    """Three payments across a month boundary, on top of ``PaymentFixtureMixin``."""
+
+    def setUp(self):
+        super().setUp()
+        self.create_payment('Fee', '100.00', self.incoming, datetime(2024, 1, 30, 10, tzinfo=dt_timezone.utc))
+        self.create_payment('Fee', '50.00', self.incoming, datetime(2024, 2, 1, 10, tzinfo=dt_timezone.utc),
+                            person=self.other_person)
+        self.create_payment('Salary', '30.00', self.outgoing, datetime(2024, 2, 6, 10, tzinfo=dt_timezone.utc))
+
+
+class DashboardSummaryTests(SummaryPaymentsMixin, PaymentFixtureMixin, TestCase):
+    def test_totals_are_aggregated_in_the_database(self):
+        with self.assertNumQueries(5):
+            summary = aggregation.dashboard_summary(Payment.objects.all(), scale='month')
+        self.assertEqual(summary['totals']['incoming'], Decimal('150.00'))
+        self.assertEqual(summary['totals']['outgoing'], Decimal('30.00'))
+        self.assertEqual(summary['totals']['count'], 3)
+        self.assertEqual([row['bucket'] for row in summary['by_period']], ['2024-01-01', '2024-02-01'])
+        self.assertEqual(summary['by_person'][0]['related_person__name'], 'Jane Roe')
+
+    def test_week_buckets_span_month_boundaries(self):
+        rows = aggregation.totals_by_period(Payment.objects.all(), 'week')
+        self.assertEqual([row['bucket'] for row in rows], ['2024-01-29', '2024-02-05'])
+        self.assertEqual(rows[0]['incoming'], Decimal('150.00'))
+
+    def test_summary_endpoint_filters_and_validates(self):
+        response = self.client.get('/api/dashboard/summary/', {'scale': 'Year', 'date_from': '2024-02-01'})
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual(data['totals']['count'], 2)
+        self.assertEqual(len(data['recent']), 2)
+        self.assertEqual(self.client.get('/api/dashboard/summary/', {'scale': 'hour'}).status_code, 400)
+
+
+class ColumnarLayoutTests(SummaryPaymentsMixin, PaymentFixtureMixin, TestCase):
+    def test_encode_builds_arrays_and_dictionaries(self):
+        rows = [{'id': 1, 'amount': Decimal('1.50'), 'status': 'paid'},
+                {'id': 2, 'amount': Decimal('2'), 'status': None},
+                {'id': 3, 'amount': Decimal('3'), 'status': 'paid'}]
+        self.assertEqual(columnar.encode(rows, ('id', 'amount', 'status'), ('status',)), {
+            'count': 3,
+            'columns': {'id': [1, 2, 3], 'amount': [1.5, 2.0, 3.0], 'status': [0, None, 0]},
+            'dictionaries': {'status': ['paid']},
+        })
+
+    def test_payments_page_in_columns(self):
+        response = self.client.get('/api/payments/', {'layout': 'columns', 'sort': 'datetime', 'limit': 2})
+        data = response.json()
+        self.assertEqual(data['count'], 2)
+        self.assertEqual(data['columns']['amount'], [100.0, 50.0])
+        self.assertEqual(data['columns']['datetime'][0], datetime(2024, 1, 30, 10, tzinfo=dt_timezone.utc)
+                         .timestamp() * 1000)
+        self.assertEqual(data['columns']['payment_type__title'], [0, 0])
+        self.assertEqual(data['dictionaries']['payment_type__title'], ['incoming'])
+        self.assertEqual(data['dictionaries']['related_person__name'], ['Jane Roe', 'Max Mustermann'])
+        self.assertIsNotNone(data['next'])
+        self.assertEqual(self.client.get('/api/payments/', {'layout': 'columns', 'format': 'json'}).status_code,
+                         400)
+
+    def test_summary_and_rollup_lists_in_columns(self):
+        rollups.rebuild()
+        data = self.client.get('/api/dashboard/summary/', {'scale': 'month', 'layout': 'columns'}).json()
+        self.assertEqual(data['totals']['count'], 3)
+        self.assertEqual(data['by_period']['columns']['bucket'], ['2024-01-01', '2024-02-01'])
+        self.assertEqual(data['by_period']['columns']['incoming'], [100.0, 50.0])
+        self.assertEqual(data['recent']['dictionaries']['payment_type__title'], ['outgoing', 'incoming'])
+        self.assertEqual(data['recent']['columns']['payment_type__title'], [0, 1, 1])
+        buckets = self.client.get('/api/payments/rollup/', {'scale': 'month', 'layout': 'columns'}).json()['buckets']
+        self.assertEqual(buckets['columns']['outgoing'], [0, 30.0])
+
+    def test_installments_in_columns_and_unknown_layouts(self):
+        received = InstallmentStatus.objects.create(title='received')
+        agreement = PaymentAgreement.objects.create(payment_direction='in', total_amount=100)
+        for day in (1, 2):
+            Installment.objects.create(payment_agreement=agreement, amount=50, status=received,
+                                       due_date=datetime(2024, 3, day, tzinfo=dt_timezone.utc))
+        data = self.client.get('/api/installments/', {'layout': 'columns'}).json()
+        self.assertEqual(data['columns']['status__title'], [0, 0])
+        self.assertEqual(data['dictionaries'], {'status__title': ['received']})
+        self.assertEqual(data['columns']['received_date'], [None, None])
+        for url in ('/api/installments/', '/api/payments/', '/api/dashboard/summary/', '/api/payments/rollup/'):
+            self.assertEqual(self.client.get(url, {'layout': 'table'}).status_code, 400)
+
+
+class PaymentRollupTests(PaymentFixtureMixin, TestCase):
+    def rollup_rows(self, granularity):
+        return list(PaymentRollup.objects.filter(granularity=granularity).order_by('bucket_start', 'payment_type')
+                    .values_list('bucket_start', 'payment_type__title', 'total', 'count'))
+
+    def test_rollups_follow_payment_save_and_delete(self):
+        payment = self.create_payment('Fee', '100.00', self.incoming)
+        payment.datetime = datetime(2024, 3, 31, 12, tzinfo=dt_timezone.utc)
+        payment.save()
+        self.create_payment('Fee', '25.00', self.incoming).delete()
+
+        self.assertEqual(self.rollup_rows('week'), [(date(2024, 3, 25), 'incoming', Decimal('100.00'), 1)])
+        self.assertEqual(self.rollup_rows('month'), [(date(2024, 3, 1), 'incoming', Decimal('100.00'), 1)])
+
+        payment.amount = Decimal('40.00')
+        payment.payment_type = self.outgoing
+        payment.save()
+        self.assertEqual(self.rollup_rows('year'), [(date(2024, 1, 1), 'outgoing', Decimal('40.00'), 1)])
+
+        payment.delete()
+        self.assertFalse(PaymentRollup.objects.exists())
+
+    def test_rebuild_matches_incremental_maintenance(self):
+        for amount, payment_type in (('10.00', self.incoming), ('5.50', self.outgoing), ('2.25', self.incoming)):
+            self.create_payment('Fee', amount, payment_type)
+        incremental = self.rollup_rows('day')
+
+        call_command('rebuild_payment_rollups', stdout=StringIO())
+        self.assertEqual(self.rollup_rows('day'), incremental)
+        self.assertEqual(PaymentRollup.objects.count(), 8)
+
+    def test_backfill_migration_matches_incremental_maintenance(self):
+        for amount, payment_type in (('10.00', self.incoming), ('5.50', self.outgoing), ('2.25', self.incoming)):
+            self.create_payment('Fee', amount, payment_type)
+        incremental = {granularity: self.rollup_rows(granularity) for granularity in rollups.GRANULARITIES}
+
+        # On an existing install the table 0011 created is still empty when 0017 runs.
+        PaymentRollup.objects.all().delete()
+        migration = ('payments', '0017_backfill_payment_rollups')
+        state = MigrationLoader(connection).project_state(migration)
+        import_module('payments.migrations.0017_backfill_payment_rollups').backfill(state.apps, None)
+        self.assertEqual({granularity: self.rollup_rows(granularity) for granularity in rollups.GRANULARITIES},
+                         incremental)
+
+    def test_rollup_endpoint_returns_bucket_series(self):
+        self.create_payment('Fee', '10.00', self.incoming)
+        self.create_payment('Salary', '4.00', self.outgoing)
+        today = timezone.localdate()
+
+        response = self.client.get('/api/payments/rollup/', {'scale': 'month', 'from': today.isoformat()})
+        self.assertEqual(response.status_code, 200)
+        buckets = response.json()['buckets']
+        self.assertEqual(len(buckets), 1)
+        self.assertEqual(buckets[0]['bucket'], today.replace(day=1).isoformat())
+        self.assertEqual(Decimal(buckets[0]['incoming']), Decimal('10.00'))
+        self.assertEqual(Decimal(buckets[0]['outgoing']), Decimal('4.00'))
+        self.assertEqual(buckets[0]['count'], 2)
+        self.assertEqual(self.client.get('/api/payments/rollup/', {'from': 'yesterday'}).status_code, 400)
+
+
+class PaymentListApiTests(PaymentFixtureMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        start = datetime(2024, 5, 1, 9, tzinfo=dt_timezone.utc)
+        self.payments = [
+            self.create_payment(f'Fee {i}', f'{10 + i}.00', self.incoming if i % 2 else self.outgoing,
+                                start + timedelta(days=i // 2))
+            for i in range(7)
+        ]
+
+    def fetch_all(self, **params):
+        ids, cursor = [], None
+        while True:
+            query = dict(params, **({'cursor': cursor} if cursor else {}))
+            data = self.client.get('/api/payments/', query).json()
+            ids.extend(row['id'] for row in data['results'])
+            cursor = data['next']
+            if not cursor:
+                return ids
+
+    def test_keyset_pages_cover_every_row_once(self):
+        expected = [p.id for p in sorted(self.payments, key=lambda p: (p.datetime, p.id), reverse=True)]
+        self.assertEqual(self.fetch_all(limit=2), expected)
+        self.assertEqual(self.fetch_all(limit=3, sort='amount'), [p.id for p in self.payments])
+
+    def test_deep_pages_are_a_single_query(self):
+        cursor = self.client.get('/api/payments/', {'limit': 3}).json()['next']
+        with self.assertNumQueries(1):
+            rows, next_cursor = keyset_page(Payment.objects.all(), '-datetime', cursor=cursor, limit=3)
+        self.assertEqual(len(rows), 3)
+        self.assertIsNotNone(next_cursor)
+
+    def test_filters_are_applied_server_side(self):
+        data = self.client.get('/api/payments/', {
+            'payment_type': self.incoming.id, 'date_from': '2024-05-02', 'amount_max': '14',
+        }).json()
+        self.assertEqual([row['name'] for row in data['results']], ['Fee 3'])
+        self.assertEqual(self.client.get('/api/payments/', {'q': '16.00'}).json()['results'][0]['name'], 'Fee 6')
+        # Amounts match on part of their two-decimal text, as the old in-browser search did.
+        self.assertEqual([row['name'] for row in self.client.get('/api/payments/', {'q': '6.0'}).json()['results']],
+                         ['Fee 6'])
+
+    def test_invalid_parameters_are_rejected(self):
+        for params in ({'cursor': 'not-a-cursor'}, {'sort': 'info_text'}, {'date_to': '2024-13-01'},
+                       {'category': 'abc'}, {'amount_min': 'NaN'}, {'amount_max': 'Infinity'}):
+            self.assertEqual(self.client.get('/api/payments/', params).status_code, 400, params)
+        cursor = self.client.get('/api/payments/', {'limit': 1}).json()['next']
+        self.assertEqual(self.client.get('/api/payments/', {'cursor': cursor, 'sort': 'amount'}).status_code, 400)
+
+
+@override_settings(PAYMENTS_PARALLEL_QUERIES=False)
+class QueryPlanTests(PaymentFixtureMixin, TestCase):
+    """Every payment and installment access path must be served by an index.
+
+    A scan is accepted only when it walks an index in the requested order (no temporary B-tree for the
+    ORDER BY), like the newest-first list pages stopping at their LIMIT; a plain SCAN reads the whole table.
+    """
+    WATCHED_TABLES = ('payments_payment', 'payments_installment')
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        self.user.is_superuser = True
+        self.user.save()
+        # The admin only applies filters that offer more than one choice.
+        PaymentCategory.objects.create(name='Books')
+        Status.objects.create(title='pending')
+        agreement = PaymentAgreement.objects.create(total_amount=100)
+        self.due = InstallmentStatus.objects.create(title='due')
+        InstallmentStatus.objects.create(title='received')
+        Installment.objects.create(payment_agreement=agreement, amount=50, status=self.due,
+                                   due_date=datetime(2024, 5, 1, tzinfo=dt_timezone.utc))
+        self.student = Student.objects.create(name='Jane Roe', national_id='333333', person=self.person)
+        self.create_payment('Fee', '10.00', self.incoming)
+
+    def full_scans(self, sql):
+        with connection.cursor() as cursor:
+            cursor.execute(f'EXPLAIN QUERY PLAN {sql}')
+            plan = [row[-1] for row in cursor.fetchall()]
+        in_order = 'USE TEMP B-TREE FOR ORDER BY' not in plan
+        return [step for step in plan
+                if step.split()[:2] in (['SCAN', table] for table in self.WATCHED_TABLES)
+                and not (in_order and (' USING INDEX ' in step or ' USING COVERING INDEX ' in step))]
+
+    def assertIndexed(self, url, params=None):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url, params)
+            if response.streaming:
+                b''.join(response.streaming_content)
+        self.assertEqual(response.status_code, 200, url)
+        selects = [query['sql'] for query in queries.captured_queries if query['sql'].startswith('SELECT')]
+        self.assertTrue(any(table in sql for sql in selects for table in self.WATCHED_TABLES), url)
+        for sql in selects:
+            self.assertEqual(self.full_scans(sql), [], f'{url} {params}: {sql}')
+
+    def test_plain_scans_are_reported_even_with_a_limit(self):
+        self.assertEqual(self.full_scans("SELECT id FROM payments_payment WHERE info_text = 'Fee' LIMIT 5"),
+                         ['SCAN payments_payment'])
+        self.assertEqual(self.full_scans('SELECT id FROM payments_payment ORDER BY datetime DESC LIMIT 5'), [])
+
+    def test_payment_list_filters(self):
+        for params in ({}, {'sort': 'amount'}, {'sort': 'name'},
+                       {'person': self.person.id, 'date_from': '2024-01-01'},
+                       {'bank_account': self.bank_account.id, 'date_to': '2024-12-31'},
+                       {'category': self.category.id, 'date_from': '2024-01-01', 'date_to': '2024-12-31'},
+                       {'status': self.status.id, 'sort': 'datetime'},
+                       {'payment_type': self.incoming.id, 'date_from': '2024-01-01'}):
+            self.assertIndexed('/api/payments/', params)
+
+    def test_dashboard_and_detail_apis(self):
+        self.assertIndexed('/api/dashboard/summary/', {'category': self.category.id, 'date_from': '2024-01-01'})
+        self.assertIndexed('/api/bank-accounts/', {'payments_limit': 2})
+        self.assertIndexed(f'/api/bank-account-detail/{self.bank_account.id}/')
+        self.assertIndexed(f'/api/student-detail/{self.student.id}/')
+        self.assertIndexed('/api/payments/changes/', {'since': 0})
+
+    def test_admin_list_filters(self):
+        self.assertIndexed('/admin/payments/payment/', {'category__id__exact': self.category.id})
+        self.assertIndexed('/admin/payments/payment/', {'status__id__exact': self.status.id})
+        self.assertIndexed('/admin/payments/installment/', {
+            'status__id__exact': self.due.id, 'due_date__gte': '2024-01-01 00:00:00+00:00',
+        })
+
+
+class LookupCacheTests(PaymentFixtureMixin, TestCase):
+    def test_labels_follow_saves_and_deletes(self):
+        self.assertEqual(lookups.label(Status, self.status.id), 'paid')
+        self.status.title = 'settled'
+        self.status.save()
+        self.assertEqual(lookups.label(Status, self.status.id), 'settled')
+        extra = Status.objects.create(title='void')
+        self.assertIn(extra.id, lookups.ids(Status))
+        extra_id = extra.id
+        extra.delete()
+        self.assertIsNone(lookups.label(Status, extra_id))
+
+    @override_settings(PAYMENTS_LOOKUP_CHECK_SECONDS=0)
+    def test_other_processes_reload_when_the_version_changes(self):
+        other = lookups.DimensionCache()
+        self.assertEqual(other.table(Status)[self.status.id], 'paid')
+        Status.objects.filter(pk=self.status.pk).update(title='settled')
+        self.assertEqual(other.table(Status)[self.status.id], 'paid')
+        lookups.dimensions.invalidate(Status)
+        self.assertEqual(other.table(Status)[self.status.id], 'settled')
+
+    def test_a_table_invalidated_while_warming_is_still_returned(self):
+        # Another thread invalidates Status while this one is still loading the last table.
+        other = lookups.DimensionCache()
+        load = InstallmentStatus.objects.values_list
+
+        def values_list(*fields):
+            other.invalidate(Status)
+            return load(*fields)
+
+        with mock.patch.object(InstallmentStatus.objects, 'values_list', values_list):
+            self.assertEqual(other.table(Status)[self.status.id], 'paid')
+
+    def test_list_api_reads_labels_from_the_cache(self):
+        self.create_payment('Fee', '10.00', self.incoming)
+        lookups.dimensions.warm()
+        with CaptureQueriesContext(connection) as queries:
+            row = self.client.get('/api/payments/').json()['results'][0]
+        sql = queries.captured_queries[-1]['sql']
+        for table in ('payments_status', 'payments_paymentmethod', 'payments_paymentcategory', 'payments_paymenttype'):
+            self.assertNotIn(table, sql)
+        self.assertEqual((row['status__title'], row['payment_method__title'], row['category__name'],
+                          row['payment_type__title']), ('paid', 'cash', 'Tuition', 'incoming'))
+        self.assertEqual(list(row)[:5], ['id', 'name', 'amount', 'datetime', 'status__title'])
+
+
+class ResponseCacheTests(PaymentFixtureMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        self.create_payment('Fee', '10.00', self.incoming)
+
+    def test_unchanged_tables_answer_conditional_requests_with_304(self):
+        first = self.client.get('/api/payments/')
+        self.assertEqual(first.status_code, 200)
+        self.assertIn('Last-Modified', first.headers)
+        with self.assertNumQueries(2):  # session, user
+            repeat = self.client.get('/api/payments/', HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(repeat.status_code, 304)
+        self.assertEqual(repeat['ETag'], first['ETag'])
+        self.assertEqual(self.client.get('/api/payments/', HTTP_IF_MODIFIED_SINCE=first['Last-Modified'])
+                         .status_code, 304)
+
+        self.create_payment('Refund', '4.00', self.outgoing)
+        changed = self.client.get('/api/payments/', HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(changed.status_code, 200)
+        self.assertNotEqual(changed['ETag'], first['ETag'])
+        self.assertEqual(len(changed.json()['results']), 2)
+
+    def test_hot_responses_come_from_the_cache(self):
+        first = self.client.get('/api/payments/?limit=10')
+        with self.assertNumQueries(2):
+            second = self.client.get('/api/payments/?limit=10')
+        self.assertEqual(second.content, first.content)
+        self.assertNotEqual(self.client.get('/api/payments/?limit=5')['ETag'], first['ETag'])
+
+    def test_streamed_lists_are_validated_but_not_stored(self):
+        first = self.client.get('/api/students/')
+        self.assertTrue(first.streaming)
+        self.assertEqual(self.client.get('/api/students/', HTTP_IF_NONE_MATCH=first['ETag']).status_code, 304)
+        Student.objects.create(name='Ann', national_id='333', person=self.person)
+        response = self.client.get('/api/students/', HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(len(json.loads(b''.join(response.streaming_content))), 1)
+
+
+class PaymentChangesApiTests(PaymentFixtureMixin, TestCase):
+    def changes(self, since, **params):
+        return self.client.get('/api/payments/changes/', {'since': since, **params})
+
+    def test_only_rows_changed_after_the_token_are_returned(self):
+        kept = self.create_payment('Kept', '10.00', self.incoming)
+        token = self.client.get('/api/payments/changes/').json()['next']
+
+        edited = self.create_payment('Draft', '5.00', self.incoming)
+        edited.name = 'Final'
+        edited.save()
+        removed = self.create_payment('Mistake', '1.00', self.outgoing)
+        removed_id = removed.id
+        removed.delete()
+
+        data = self.changes(token).json()
+        self.assertEqual([row['name'] for row in data['payments']['upserts']], ['Final'])
+        self.assertEqual(data['payments']['upserts'][0]['status__title'], 'paid')
+        self.assertEqual(data['payments']['deletes'], [removed_id])
+        self.assertNotIn(kept.id, [row['id'] for row in data['payments']['upserts']])
+        self.assertFalse(data['more'])
+        self.assertEqual(self.changes(data['next']).json()['payments'], {'upserts': [], 'deletes': []})
+
+    def test_limit_pages_through_the_log_and_imports_are_logged(self):
+        token = self.client.get('/api/payments/changes/').json()['next']
+        import_dataframe(Payment, pd.DataFrame([{
+            'name': f'Imported {i}', 'amount': 3, 'related_person': self.person.id,
+            'payment_method': self.method.id, 'status': self.status.id, 'category': self.category.id,
+            'payment_type': self.incoming.id,
+        } for i in range(3)]))
+        first = self.changes(token, limit=2).json()
+        self.assertTrue(first['more'])
+        second = self.changes(first['next'], limit=2).json()
+        self.assertFalse(second['more'])
+        names = [row['name'] for page in (first, second) for row in page['payments']['upserts']]
+        self.assertEqual(names, ['Imported 0', 'Imported 1', 'Imported 2'])
+
+    def test_bad_and_pruned_tokens_are_rejected(self):
+        self.assertEqual(self.changes('abc').status_code, 400)
+        token = self.client.get('/api/payments/changes/').json()['next']
+        self.create_payment('Old', '1.00', self.incoming)
+        self.create_payment('Older', '1.00', self.incoming)
+        call_command('prune_payment_changes', days=-1, stdout=StringIO())
+        self.create_payment('New', '1.00', self.incoming)
+        self.assertEqual(self.changes(token).status_code, 410)
+
+    def test_tokens_are_rejected_once_the_whole_log_is_pruned(self):
+        token = self.client.get('/api/payments/changes/').json()['next']
+        self.create_payment('Old', '1.00', self.incoming)
+        call_command('prune_payment_changes', days=-1, stdout=StringIO())
+        self.assertFalse(ChangeLog.objects.exists())
+        self.assertEqual(self.changes(token).status_code, 410)
+        # A fresh token starts after the pruned entries and is accepted.
+        fresh = self.client.get('/api/payments/changes/').json()['next']
+        self.assertGreater(int(fresh), int(token))
+        self.assertEqual(self.changes(fresh).status_code, 200)
+
+
+class EventStreamTests(PaymentFixtureMixin, TestCase):
+    async def test_broadcaster_fans_out_events_published_from_other_threads(self):
+        broadcaster = events.Broadcaster(max_queued=2)
+        first, second = broadcaster.subscribe(), broadcaster.subscribe()
+        thread = threading.Thread(target=lambda: [broadcaster.publish({'type': 'change', 'n': n}) for n in range(3)])
+        thread.start()
+        thread.join()
+        for queue in (first, second):
+            # The slow subscriber keeps only the newest events.
+            received = [await asyncio.wait_for(queue.get(), 1) for _ in range(2)]
+            self.assertEqual([event['n'] for event in received], [1, 2])
+        broadcaster.unsubscribe(first)
+        self.assertEqual(len(broadcaster.subscribers), 1)
+
+    def test_committed_payment_writes_are_announced(self):
+        published = []
+        with mock.patch.object(events.Broadcaster, 'listening', new_callable=mock.PropertyMock, return_value=True), \
+                mock.patch.object(events.broadcaster, 'publish', published.append), \
+                override_settings(PAYMENTS_EVENTS_TOTALS_DELAY=0):
+            with self.captureOnCommitCallbacks(execute=True):
+                payment = self.create_payment('Fee', '10.00', self.incoming)
+        change, totals = published
+        self.assertEqual((change['table'], change['action'], change['ids']), ('payment', 'upsert', [payment.id]))
+        self.assertEqual(change['token'], self.client.get('/api/payments/changes/').json()['next'])
+        self.assertEqual(totals['totals']['incoming'], Decimal('10.00'))
+
+    @override_settings(PAYMENTS_EVENTS_TOTALS_DELAY=0)
+    async def test_stream_sends_hello_then_pushed_events(self):
+        # The test client does not disconnect the way a server does, so drop the subscription afterwards.
+        self.addCleanup(setattr, events.broadcaster, 'subscribers', set())
+        await self.async_client.aforce_login(self.user)
+        response = await self.async_client.get('/api/events/')
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+        content = aiter(response.streaming_content)
+        self.assertEqual(await anext(content), b'retry: 5000\n\n')
+        self.assertTrue((await anext(content)).startswith(b'event: hello\n'))
+
+        await sync_to_async(events.publish_change)('payment', [7], token='42')
+        change = (await asyncio.wait_for(anext(content), 1)).decode()
+        self.assertTrue(change.startswith('event: change\nid: 42\ndata: '))
+        self.assertEqual(json.loads(change.split('data: ', 1)[1])['ids'], [7])
+        self.assertTrue((await asyncio.wait_for(anext(content), 1)).startswith(b'event: totals\n'))
+        await content.aclose()
+
+    def test_wsgi_requests_are_refused(self):
+        self.assertEqual(self.client.get('/api/events/').status_code, 501)
+
+
+# Test data lives in an uncommitted transaction, so keep the sub-queries on the test's own connection.
+@override_settings(PAYMENTS_PARALLEL_QUERIES=False)
+class AsyncDetailApiTests(PaymentFixtureMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        self.teacher = Teacher.objects.create(name='Jane Roe', national_id='111111', person=self.person)
+        self.create_payment('Salary', '50.00', self.outgoing)
+
+    async def test_teacher_detail_gathers_payments_courses_and_products(self):
+        await self.async_client.aforce_login(self.user)
+        product = await Product.objects.acreate(title='Book', amount=Decimal('12.00'), teacher=self.teacher)
+        course = await Course.objects.acreate(title='Algebra', start_date=date(2024, 1, 1), end_date=date(2024, 6, 1),
+                                              teacher=self.teacher, related_product=product)
+        response = await self.async_client.get(f'/api/teacher-detail/{self.teacher.id}/')
+        self.assertEqual(response.status_code, 200)
+        data = json.loads(response.content)
+        self.assertEqual([row['name'] for row in data['payments']], ['Salary'])
+        self.assertEqual(data['payments'][0]['status__title'], 'paid')
+        self.assertEqual([row['title'] for row in data['courses']], [course.title])
+        self.assertEqual([row['title'] for row in data['products']], ['Book'])
+
+        repeat = await self.async_client.get(f'/api/teacher-detail/{self.teacher.id}/',
+                                             headers={'If-None-Match': response['ETag']})
+        self.assertEqual(repeat.status_code, 304)
+
+    async def test_missing_objects_and_anonymous_users(self):
+        self.assertEqual((await self.async_client.get(f'/api/bank-account-detail/{self.bank_account.id}/'))
+                         .status_code, 302)
+        await self.async_client.aforce_login(self.user)
+        self.assertEqual((await self.async_client.get('/api/payment-detail/999999/')).status_code, 404)
+        account = await self.async_client.get(f'/api/bank-account-detail/{self.bank_account.id}/')
+        self.assertEqual(json.loads(account.content)['payments'][0]['related_person__name'], 'Jane Roe')
+
+
+@override_settings(PAYMENTS_PARALLEL_QUERIES=False)
+class BatchDetailApiTests(PaymentFixtureMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        self.fee = self.create_payment('Fee', '100.00', self.incoming,
+                                       datetime(2024, 1, 30, 10, tzinfo=dt_timezone.utc))
+        self.salary = self.create_payment('Salary', '50.00', self.outgoing)
+
+    def test_single_payment_keeps_its_shape(self):
+        data = self.client.get(f'/api/payment-detail/{self.fee.id}/').json()
+        self.assertEqual(data, {
+            'id': self.fee.id, 'name': 'Fee', 'amount': '100.00', 'datetime': '2024-01-30 10:00:00',
+            'status': 'paid', 'payment_method': 'cash', 'category': 'Tuition', 'payment_type': 'incoming',
+            'related_person': 'Jane Roe', 'related_bank_account': 'Main Bank', 'info_text': None,
+        })
+
+    def test_many_payments_in_one_query_with_sparse_fields(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get('/api/payment-detail/', {
+                'ids': f'{self.salary.id},999999,{self.fee.id}', 'fields': 'name,payment_type,related_person',
+            })
+        payment_queries = [query['sql'] for query in queries if 'FROM "payments_payment"' in query['sql']]
+        self.assertEqual(len(payment_queries), 1)
+        self.assertNotIn('info_text', payment_queries[0])
+        self.assertEqual(response.json(), {
+            'results': [
+                {'id': self.salary.id, 'name': 'Salary', 'payment_type': 'outgoing', 'related_person': 'Jane Roe'},
+                {'id': self.fee.id, 'name': 'Fee', 'payment_type': 'incoming', 'related_person': 'Jane Roe'},
+            ],
+            'missing': [999999],
+        })
+
+    def test_installments_by_ids(self):
+        agreement = PaymentAgreement.objects.create(payment_direction='in', total_amount=100)
+        installment = Installment.objects.create(payment_agreement=agreement, amount=50,
+                                                 due_date=datetime(2024, 3, 1, tzinfo=dt_timezone.utc))
+        data = self.client.get('/api/installment-detail/', {'ids': installment.id}).json()
+        self.assertEqual(data['results'], [{
+            'id': installment.id, 'amount': 50.0, 'due_date': '2024-03-01 00:00:00', 'received_date': None,
+            'status': None, 'payment_agreement_id': agreement.id,
+        }])
+        single = self.client.get(f'/api/installment-detail/{installment.id}/', {'fields': 'amount'})
+        self.assertEqual(single.json(), {'id': installment.id, 'amount': 50.0})
+
+    def test_bad_requests(self):
+        for params in ({}, {'ids': 'a,b'}, {'ids': '1', 'fields': 'name,secret'},
+                       {'ids': ','.join(str(i) for i in range(1, 502))}):
+            self.assertEqual(self.client.get('/api/payment-detail/', params).status_code, 400)
+        self.assertEqual(self.client.get('/api/installment-detail/999999/').status_code, 404)
+
+
+class ParallelEvaluateTests(SimpleTestCase):
+    @override_settings(PAYMENTS_PARALLEL_QUERIES=True)
+    async def test_gathered_evaluations_overlap(self):
+        # Each iterable waits for the other to start, which only works if they run at the same time.
+        barrier = threading.Barrier(2, timeout=5)
+
+        def rows(value):
+            barrier.wait()
+            yield value
+
+        self.assertEqual(await asyncio.gather(parallel.evaluate(rows(1)), parallel.evaluate(rows(2))), [[1], [2]])
+
+
+class SearchApiTests(PaymentFixtureMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        self.student = Student.objects.create(name='Jane Roe', national_id='333333', person=self.person)
+        self.fee = self.create_payment('Tuition fee', '10.00', self.incoming, info_text='Paid by Jane in cash')
+        self.create_payment('Office rent', '900.00', self.outgoing)
+
+    def search(self, **params):
+        return self.client.get('/api/search/', params)
+
+    def test_hits_are_ranked_across_types(self):
+        results = self.search(q='jan').json()['results']
+        self.assertEqual({(hit['type'], hit['id']) for hit in results},
+                         {('person', self.person.id), ('student', self.student.id), ('payment', self.fee.id)})
+        # A title match outranks a match in the payment's notes.
+        self.assertEqual(results[-1]['type'], 'payment')
+        self.assertEqual(results[-1]['url'], f'/payment-detail/{self.fee.id}/')
+        self.assertEqual([hit['id'] for hit in self.search(q='tuition fee', type='payment').json()['results']],
+                         [self.fee.id])
+
+    def test_index_follows_saves_updates_and_deletes(self):
+        self.fee.name = 'Exam fee'
+        self.fee.save()
+        self.assertEqual(self.search(q='tuition').json()['results'], [])
+        Payment.objects.filter(pk=self.fee.pk).update(info_text='Refunded')
+        self.assertEqual(self.search(q='refund').json()['results'][0]['title'], 'Exam fee')
+        self.fee.delete()
+        self.assertEqual(self.search(q='exam').json()['results'], [])
+        call_command('rebuild_search_index', stdout=StringIO())
+        self.assertEqual(len(self.search(q='rent').json()['results']), 1)
+
+    def test_paging_and_bad_input(self):
+        for i in range(3):
+            self.create_payment(f'Rent {i}', '1.00', self.outgoing)
+        first = self.search(q='rent', limit=3).json()
+        self.assertEqual(first['next_offset'], 3)
+        second = self.search(q='rent', limit=3, offset=3).json()
+        self.assertIsNone(second['next_offset'])
+        self.assertEqual(len({hit['id'] for hit in first['results'] + second['results']}), 4)
+        self.assertEqual(self.search(q='"rent" OR').status_code, 200)
+        self.assertEqual(self.search(q='  ').status_code, 400)
+        self.assertEqual(self.search(q='rent', type='invoice').status_code, 400)
+
+
+class RequestMetricsTests(PaymentFixtureMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        instrumentation.request_log.clear()
+        self.create_payment('Fee', '10.00', self.incoming)
+
+    def test_requests_are_timed_and_logged(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get('/api/payments/')
+        self.assertIn(f'desc="{len(queries)} queries"', response['Server-Timing'])
+        self.assertIn('serialize;dur=', response['Server-Timing'])
+        entry = instrumentation.request_log.recent(view='api_payments')[0]
+        self.assertEqual(entry['queries'], len(queries))
+        self.assertEqual(entry['bytes'], len(response.content))
+        self.assertEqual((entry['method'], entry['status']), ('GET', 200))
+        self.assertGreaterEqual(entry['total_ms'], entry['db_ms'])
+
+    def test_streamed_responses_are_logged_when_sent(self):
+        Student.objects.create(name='Ann', national_id='333', person=self.person)
+        response = self.client.get('/api/students/')
+        self.assertEqual(instrumentation.request_log.recent(view='api_students'), [])
+        body = b''.join(response.streaming_content)
+        entry = instrumentation.request_log.recent(view='api_students')[0]
+        self.assertEqual(entry['bytes'], len(body))
+        self.assertGreaterEqual(entry['queries'], 1)
+
+    def test_metrics_endpoint_is_staff_only(self):
+        self.client.get('/api/payments/')
+        data = self.client.get('/api/metrics/requests/', {'view': 'api_payments'}).json()
+        self.assertEqual([entry['view'] for entry in data['recent']], ['api_payments'])
+        self.assertIn('api_payments', [row['view'] for row in data['by_view']])
+        User.objects.create_user('clerk', password='secret')
+        self.client.login(username='clerk', password='secret')
+        self.assertEqual(self.client.get('/api/metrics/requests/').status_code, 302)
+
+
+@override_settings(PAYMENTS_COMPRESSION_MIN_SIZE=200)
+class CompressionTests(PaymentFixtureMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        for i in range(20):
+            self.create_payment(f'Fee {i}', '10.00', self.incoming)
+
+    def test_json_is_gzip_or_brotli_encoded_when_accepted(self):
+        plain = self.client.get('/api/payments/')
+        self.assertFalse(plain.has_header('Content-Encoding'))
+        self.assertIn('Accept-Encoding', plain['Vary'])
+
+        gzipped = self.client.get('/api/payments/', HTTP_ACCEPT_ENCODING='gzip, deflate')
+        self.assertEqual(gzipped['Content-Encoding'], 'gzip')
+        self.assertEqual(gzip.decompress(gzipped.content), plain.content)
+        self.assertEqual(gzipped['Content-Length'], str(len(gzipped.content)))
+        self.assertEqual(gzipped['ETag'], 'W/' + plain['ETag'])
+
+        encoded = self.client.get('/api/payments/', HTTP_ACCEPT_ENCODING='gzip, br')
+        self.assertEqual(encoded['Content-Encoding'], 'br')
+        self.assertEqual(brotli.decompress(encoded.content), plain.content)
+
+    def test_html_keeps_gzip_with_random_filename_padding(self):
+        response = self.client.get('/payments/', HTTP_ACCEPT_ENCODING='gzip, br')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        # GZipMiddleware's BREACH mitigation: a random-length file name in the gzip header.
+        self.assertTrue(response.content[3] & gzip.FNAME)
+        self.assertIn(b'Payment List', gzip.decompress(response.content))
+        self.assertFalse(self.client.get('/payments/', HTTP_ACCEPT_ENCODING='br').has_header('Content-Encoding'))
+
+    def test_small_and_refused_responses_are_left_alone(self):
+        with override_settings(PAYMENTS_COMPRESSION_MIN_SIZE=100000):
+            self.assertFalse(self.client.get('/api/payments/', HTTP_ACCEPT_ENCODING='gzip')
+                             .has_header('Content-Encoding'))
+        self.assertFalse(self.client.get('/api/payments/', HTTP_ACCEPT_ENCODING='gzip;q=0, br;q=0')
+                         .has_header('Content-Encoding'))
+
+    def test_streamed_exports_are_compressed_chunk_by_chunk(self):
+        response = self.client.get('/api/payments/export/', HTTP_ACCEPT_ENCODING='gzip')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertFalse(response.has_header('Content-Length'))
+        csv = gzip.decompress(b''.join(response.streaming_content)).decode('utf-8-sig')
+        self.assertEqual(len(csv.splitlines()), 21)
+
+    def test_encoding_negotiation(self):
+        self.assertEqual(compression.negotiate('gzip, deflate, br'), 'br')
+        self.assertEqual(compression.negotiate('br;q=0, gzip;q=0.5'), 'gzip')
+        self.assertEqual(compression.negotiate('*'), 'br')
+        self.assertIsNone(compression.negotiate('identity'))
+        self.assertIsNone(compression.negotiate(''))
+
+
+class StaticStorageTests(SimpleTestCase):
+    def test_collectstatic_writes_hashed_and_precompressed_files(self):
+        with tempfile.TemporaryDirectory() as root, override_settings(STATIC_ROOT=root):
+            self.assertEqual(static('CSS/list.css'), '/static/CSS/list.css')
+            call_command('collectstatic', interactive=False, verbosity=0)
+            storage = CompressedManifestStaticFilesStorage()
+            hashed = storage.stored_name('CSS/list.css')
+            self.assertRegex(hashed, r'^CSS/list\.[0-9a-f]{12}\.css$')
+            with open(os.path.join(root, hashed), 'rb') as f:
+                content = f.read()
+            with open(os.path.join(root, hashed + '.gz'), 'rb') as f:
+                self.assertEqual(gzip.decompress(f.read()), content)
+            with open(os.path.join(root, hashed + '.br'), 'rb') as f:
+                self.assertEqual(brotli.decompress(f.read()), content)
+            self.assertFalse(os.path.exists(os.path.join(root, 'images', 'left to right.png.gz')))
+
+
+class PageLayoutTests(PaymentFixtureMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        caches['template_fragments'].clear()
+
+    def test_pages_share_the_base_layout(self):
+        response = self.client.get('/payments/')
+        self.assertTemplateUsed(response, 'payments/base.html')
+        self.assertContains(response, '<a href="/payments/" class="sidebar-button active">', html=False)
+        self.assertContains(response, '<a href="/dashboard/" class="sidebar-button ">', html=False)
+        self.assertContains(response, static('CSS/base.css'))
+        self.assertContains(response, static('CSS/list.css'))
+
+    def test_sidebar_is_rendered_once_per_page(self):
+        # The eight navigation links are only resolved on the first render.
+        with mock.patch('django.urls.reverse', wraps=reverse) as resolved:
+            self.client.get('/payments/')
+            first = resolved.call_count
+            self.client.force_login(User.objects.create_user('auditor', password='secret', is_staff=True))
+            self.client.get('/payments/')
+            self.assertEqual(first - (resolved.call_count - first), 8)
+        response = self.client.get('/products/')
+        self.assertContains(response, '<a href="/products/" class="sidebar-button active">', html=False)
+
+    def test_templates_are_compiled_once(self):
+        self.assertIsInstance(engines['django'].engine.template_loaders[0], CachedLoader)
+
+
+class PrometheusMetricsTests(PaymentFixtureMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        self.create_payment('Fee', '10.00', self.incoming)
+
+    def sample(self, name, **labels):
+        return REGISTRY.get_sample_value(name, labels) or 0
+
+    def test_requests_are_counted_per_route(self):
+        before = self.sample('payments_http_requests_total', route='api_payments', method='GET', status='200')
+        self.client.get('/api/payments/')
+        self.assertEqual(self.sample('payments_http_requests_total', route='api_payments', method='GET',
+                                     status='200'), before + 1)
+        self.assertGreaterEqual(self.sample('payments_http_request_queries_count', route='api_payments'), 1)
+
+        body = self.client.get('/metrics').content.decode()
+        self.assertIn('payments_http_request_duration_seconds_bucket{le="0.005",route="api_payments"}', body)
+        self.assertIn('payments_table_rows{table="payment"} 1.0', body)
+
+    @override_settings(MEDIA_ROOT=tempfile.mkdtemp())
+    def test_import_jobs_are_counted(self):
+        before = self.sample('payments_import_rows_total', model='person', outcome='created')
+        df = pd.DataFrame({'person_name': ['A', 'B'], 'person_national_id': ['101', '102']})
+        job = ImportJob.objects.create(model_name='person', file=SimpleUploadedFile('people.csv', df.to_csv(
+            index=False).encode()))
+        jobs.run_job(job.id)
+        self.assertEqual(self.sample('payments_import_rows_total', model='person', outcome='created'), before + 2)
+        self.assertGreaterEqual(self.sample('payments_import_duration_seconds_count', model='person'), 1)
+
+    @override_settings(PAYMENTS_METRICS_TOKEN='s3cret')
+    def test_scrapers_need_the_token(self):
+        self.client.logout()
+        self.assertEqual(self.client.get('/metrics').status_code, 403)
+        self.assertEqual(self.client.get('/metrics', HTTP_AUTHORIZATION='Bearer wrong').status_code, 403)
+        response = self.client.get('/metrics', HTTP_AUTHORIZATION='Bearer s3cret')
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response['Content-Type'].startswith('text/plain'))
+
+
+class StreamingApiTests(PaymentFixtureMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        for i in range(3):
+            self.create_payment(f'Fee {i}', '10.00', self.incoming)
+            Student.objects.create(person=self.person, name=f'Student {i}', national_id=f'90{i}')
+
+    def test_list_api_streams_json_array_by_default(self):
+        response = self.client.get('/api/students/')
+        self.assertTrue(response.streaming)
+        self.assertEqual(response['Content-Type'], 'application/json')
+        rows = json.loads(b''.join(response.streaming_content))
+        self.assertEqual(sorted(row['name'] for row in rows), ['Student 0', 'Student 1', 'Student 2'])
+
+    def test_ndjson_is_selected_by_accept_header_or_format(self):
+        for response in (self.client.get('/api/students/', HTTP_ACCEPT='application/x-ndjson'),
+                         self.client.get('/api/students/', {'format': 'ndjson'})):
+            self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+            lines = b''.join(response.streaming_content).decode().splitlines()
+            self.assertEqual(len(lines), 3)
+            self.assertIn('national_id', json.loads(lines[0]))
+
+    def test_payments_stream_whole_filtered_set_when_format_requested(self):
+        response = self.client.get('/api/payments/', {'format': 'json', 'sort': 'name', 'limit': 1})
+        rows = json.loads(b''.join(response.streaming_content))
+        self.assertEqual([row['name'] for row in rows], ['Fee 0', 'Fee 1', 'Fee 2'])
+        self.assertFalse(self.client.get('/api/payments/').streaming)
+
+    def test_empty_tables_stream_an_empty_array(self):
+        Installment.objects.all().delete()
+        response = self.client.get('/api/installments/')
+        self.assertEqual(json.loads(b''.join(response.streaming_content)), [])
+
+
+class PaymentExportTests(PaymentFixtureMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.payments = [
+            self.create_payment(f'Fee {i}', f'{i}0.00', self.incoming,
+                                datetime(2024, 3, i + 1, 9, tzinfo=dt_timezone.utc))
+            for i in range(3)
+        ]
+        self.create_payment('Salary', '500.00', self.outgoing)
+
+    def export(self, **params):
+        response = self.client.get('/api/payments/export/', params)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        return response, b''.join(response.streaming_content)
+
+    def test_csv_export_applies_the_list_filters(self):
+        response, body = self.export(payment_type=self.incoming.pk, sort='name')
+        self.assertEqual(response['Content-Type'], 'text/csv; charset=utf-8')
+        self.assertIn('attachment; filename="payments-', response['Content-Disposition'])
+        lines = body.decode('utf-8-sig').splitlines()
+        self.assertEqual(lines[0], 'ID,Name,Amount,Date,Status,Payment method,Category,Payment type,Person,'
+                                   'Bank account')
+        self.assertEqual(lines[1], f'{self.payments[0].pk},Fee 0,0.00,2024-03-01 09:00:00,paid,cash,Tuition,'
+                                   'incoming,Jane Roe,Main Bank')
+        self.assertEqual(len(lines), 4)
+
+    def test_selected_ids_are_exported(self):
+        _, body = self.export(id=f'{self.payments[1].pk},{self.payments[2].pk}', sort='-amount')
+        names = [line.split(',')[1] for line in body.decode('utf-8-sig').splitlines()[1:]]
+        self.assertEqual(names, ['Fee 2', 'Fee 1'])
+
+    def test_xlsx_export_splits_sheets_at_the_row_limit(self):
+        with mock.patch('payments.exports.XLSX_SHEET_ROWS', 3):
+            response, body = self.export(format='xlsx', sort='name')
+        self.assertEqual(response['Content-Type'], exports.XLSX)
+        workbook = load_workbook(BytesIO(body), read_only=True)
+        self.assertEqual(workbook.sheetnames, ['Payments', 'Payments 2'])
+        first, second = (list(sheet.values) for sheet in workbook.worksheets)
+        self.assertEqual(first[0][:4], ('ID', 'Name', 'Amount', 'Date'))
+        self.assertEqual(first[1][1:4], ('Fee 0', 0, datetime(2024, 3, 1, 9)))
+        self.assertEqual([row[1] for row in first[1:] + second[1:]], ['Fee 0', 'Fee 1', 'Fee 2', 'Salary'])
+
+    def test_empty_export_has_only_the_header(self):
+        _, body = self.export(format='xlsx', q='nothing matches')
+        rows = list(load_workbook(BytesIO(body), read_only=True).active.values)
+        self.assertEqual(len(rows), 1)
+
+    def test_bad_parameters_are_rejected(self):
+        self.assertEqual(self.client.get('/api/payments/export/', {'format': 'pdf'}).status_code, 400)
+        self.assertEqual(self.client.get('/api/payments/export/', {'id': 'x'}).status_code, 400)
+        self.assertEqual(self.client.get('/api/payments/export/', {'sort': 'person'}).status_code, 400)
+
+
+class BankAccountApiTests(PaymentFixtureMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.second_account = BankAccount.objects.create(name='Savings', bank_number='555')
+        BankAccount.objects.create(name='Empty', bank_number='556')
+        for i in range(3):
+            self.create_payment(f'Fee {i}', '10.00', self.incoming, datetime(2024, 1, 1 + i, tzinfo=dt_timezone.utc))
+        self.create_payment('Rent', '4.00', self.outgoing, related_bank_account=self.second_account)
+
+    def test_accounts_are_served_with_a_constant_number_of_queries(self):
+        BankAccount.objects.bulk_create(BankAccount(name=f'Extra {i}', bank_number=f'7{i}') for i in range(20))
+        lookups.dimensions.warm()
+        with self.assertNumQueries(4):  # session, user, accounts, payments
+            response = self.client.get('/api/bank-accounts/')
+        self.assertEqual(len(response.json()), 23)
+
+    def test_summaries_and_payment_limit(self):
+        data = {row['name']: row for row in self.client.get('/api/bank-accounts/', {'payments_limit': 2}).json()}
+        main = data['Main Bank']
+        self.assertEqual(main['summary']['count'], 3)
+        self.assertEqual(Decimal(main['summary']['incoming']), Decimal('30.00'))
+        self.assertEqual([p['name'] for p in main['payments']], ['Fee 2', 'Fee 1'])
+        self.assertEqual(Decimal(data['Savings']['summary']['outgoing']), Decimal('4.00'))
+        self.assertEqual(data['Empty']['payments'], [])
+        self.assertEqual(data['Empty']['summary']['count'], 0)
+
+    def test_zero_limit_skips_payments(self):
+        with self.assertNumQueries(3):
+            rows = self.client.get('/api/bank-accounts/', {'payments_limit': 0}).json()
+        self.assertTrue(all(row['payments'] == [] for row in rows))
+
+
+class BulkImporterTests(PaymentFixtureMixin, TestCase):
+    def payment_rows(self, count, **overrides):
+        row = {
+            'name': 'Imported', 'amount': 12.5, 'related_person': self.person.id, 'payment_method': self.method.id,
+            'status': self.status.id, 'category': self.category.id, 'payment_type': self.incoming.id,
+            'related_bank_account': None,
+        }
+        row.update(overrides)
+        return [dict(row, name=f"{row['name']} {i}") for i in range(count)]
+
+    def count_import_queries(self, df):
+        with CaptureQueriesContext(connection) as queries:
+            result = import_dataframe(Payment, df)
+        return result, len(queries)
+
+    def test_query_count_does_not_grow_with_rows(self):
+        small, small_queries = self.count_import_queries(pd.DataFrame(self.payment_rows(5)))
+        Payment.objects.all().delete()
+        with self.captureOnCommitCallbacks(execute=True):
+            large, large_queries = self.count_import_queries(pd.DataFrame(self.payment_rows(300)))
+        self.assertEqual((small.created, large.created), (5, 300))
+        # Only the INSERT count grows, by SQLite's bound-parameter limit per statement.
+        self.assertLessEqual(large_queries, small_queries + 3)
+        self.assertEqual(PaymentRollup.objects.get(granularity='year').count, 300)
+
+    def test_rolled_back_import_leaves_rollups_alone(self):
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            with self.assertRaises(RuntimeError), transaction.atomic():
+                import_dataframe(Payment, pd.DataFrame(self.payment_rows(3)))
+                raise RuntimeError
+        self.assertEqual(callbacks, [])
+        self.assertFalse(Payment.objects.exists())
+        self.assertFalse(PaymentRollup.objects.exists())
+
+    def test_bad_rows_are_reported_without_aborting_the_batch(self):
+        self.create_payment('Imported 0', '12.50', self.incoming, related_bank_account=None)
+        rows = self.payment_rows(2) + self.payment_rows(1, name='Ghost', related_person=999) + \
+            self.payment_rows(1, name='Untyped', payment_type=None) + self.payment_rows(1, name='Broken', amount='x')
+        result = import_dataframe(Payment, pd.DataFrame(rows))
+
+        self.assertEqual((result.created, result.skipped, result.failed), (1, 1, 3))
+        self.assertEqual([error['row'] for error in result.errors], [4, 5, 6])
+        self.assertIn('Person 999 does not exist', result.errors[0]['error'])
+        self.assertIn('payment_type is required', result.errors[1]['error'])
+        self.assertEqual(Payment.objects.filter(name__startswith='Imported').count(), 2)
+
+    def test_people_are_validated_and_deduplicated(self):
+        df = pd.DataFrame({
+            'person_name': ['Jane Roe', 'New Person', 'New Person', 'Clash', 'Letters', None],
+            'person_national_id': ['111111', '333333', '333333', '222222', '12ab', None],
+        })
+        result = import_dataframe(Person, df)
+        self.assertEqual((result.created, result.skipped, result.failed), (1, 2, 2))
+        self.assertEqual([error['row'] for error in result.errors], [5, 6])
+        self.assertTrue(Person.objects.filter(national_id='333333').exists())
+
+    def test_missing_required_columns_abort_the_import(self):
+        with self.assertRaisesMessage(ValueError, 'Missing columns: person_national_id'):
+            import_dataframe(Person, pd.DataFrame({'person_name': ['Nobody']}))
+
+    def test_dry_run_predicts_the_import_without_writing(self):
+        self.create_payment('Imported 0', '12.50', self.incoming, related_bank_account=None)
+        cases = [
+            (Person, pd.DataFrame({
+                'person_name': ['Jane Roe', 'New Person', 'New Person', 'Clash', 'Letters', None],
+                'person_national_id': ['111111', '333333', '333333', '222222', '12ab', None],
+            })),
+            (Payment, pd.DataFrame(self.payment_rows(2) + self.payment_rows(1, name='Ghost', related_person=999)
+                                   + self.payment_rows(1, name='Untyped', payment_type=None)
+                                   + self.payment_rows(1, name='Broken', amount='x'))),
+        ]
+        for model, df in cases:
+            before = model.objects.count()
+            with CaptureQueriesContext(connection) as queries:
+                report = validate_dataframe(model, df)
+            # At most one query per foreign key column, one for existing rows and one per unique column.
+            self.assertLessEqual(len(queries), len(IMPORT_SPECS[model].foreign_keys) + 2)
+            self.assertEqual(model.objects.count(), before)
+            result = import_dataframe(model, df)
+            self.assertEqual(report.as_dict(), result.as_dict(), model.__name__)
+
+    def test_rows_with_errors_do_not_count_as_duplicates(self):
+        teacher = Teacher.objects.create(name='Jane Roe', national_id='111111', person=self.person)
+        cases = [
+            # The first row fails on its amount; the second has the same lookup key and is created.
+            (Product, pd.DataFrame({'title': ['Algebra', 'Algebra'], 'teacher': [teacher.id, teacher.id],
+                                    'amount': ['x', '10']})),
+            # The first row fails on its name; the second reuses its unique national id and is created.
+            (Person, pd.DataFrame({'person_name': [None, 'B'], 'person_national_id': ['777', '777']})),
+        ]
+        for model, df in cases:
+            report = validate_dataframe(model, df)
+            self.assertEqual((report.created, report.skipped, report.failed), (1, 0, 1), model.__name__)
+            self.assertEqual(import_dataframe(model, df).as_dict(), report.as_dict(), model.__name__)
+
+    def test_dry_run_checks_amounts_and_duplicates_across_chunks(self):
+        validator = DataFrameValidator(Person)
+        first = validator.validate(pd.DataFrame({'person_name': ['A'], 'person_national_id': ['555']}))
+        second = validator.validate(pd.DataFrame({'person_name': ['B'], 'person_national_id': ['555']},
+                                                 index=[1]))
+        self.assertEqual(first.created, 1)
+        self.assertEqual(second.errors, [{'row': 3, 'error': 'national_id 555 already exists'}])
+
+        df = pd.DataFrame(
+            self.payment_rows(1, amount=-5) + self.payment_rows(1, amount=10 ** 9) + self.payment_rows(1, amount=7)
+        )
+        report = validate_dataframe(Payment, df)
+        self.assertEqual(report.errors, [
+            {'row': 2, 'error': 'amount must not be negative'},
+            {'row': 3, 'error': 'amount must be less than 100000000'},
+        ])
+        self.assertEqual(report.created, 1)
+        self.assertEqual(import_dataframe(Payment, df).as_dict(), report.as_dict())
+
+
+@override_settings(MEDIA_ROOT=tempfile.mkdtemp())
+class ImportJobTests(PaymentFixtureMixin, TestCase):
+    def upload(self, df, model_name='person'):
+        buffer = BytesIO()
+        df.to_excel(buffer, index=False)
+        upload = SimpleUploadedFile('people.xlsx', buffer.getvalue())
+        return self.client.post(f'/admin/payments/{model_name}/upload-excel/', {'file': upload},
+                                HTTP_X_REQUESTED_WITH='XMLHttpRequest')
+
+    def test_upload_enqueues_a_job_and_returns_immediately(self):
+        df = pd.DataFrame({'person_name': ['A', 'B'], 'person_national_id': ['101', '102']})
+        with self.captureOnCommitCallbacks() as callbacks:
+            data = self.upload(df).json()
+        self.assertTrue(data['success'])
+        self.assertEqual(len(callbacks), 1)
+        job = ImportJob.objects.get(id=data['job_id'])
+        self.assertEqual(job.status, 'queued')
+        self.assertFalse(Person.objects.filter(national_id='101').exists())
+
+    def test_jobs_cannot_be_added_or_repointed_from_the_admin(self):
+        self.client.force_login(User.objects.create_superuser('admin', 'admin@example.com', 'secret'))
+        job = ImportJob.objects.create(model_name='person', file='files_record/import_jobs/people.xlsx')
+        self.assertEqual(self.client.get(reverse('admin:payments_importjob_add')).status_code, 403)
+        response = self.client.get(reverse('admin:payments_importjob_change', args=[job.pk]))
+        self.assertNotContains(response, 'name="file"')
+        self.assertNotContains(response, 'name="model_name"')
+        self.assertNotContains(response, 'name="dry_run"')
+
+    def test_upload_form_renders(self):
+        response = self.client.get(reverse('admin:person_upload_excel'))
+        self.assertContains(response, 'accept=".csv,.xlsx,.xlsm"')
+
+    @override_settings(PAYMENTS_IMPORT_CHUNK_SIZE=2)
+    def test_worker_reports_progress_through_the_status_endpoint(self):
+        df = pd.DataFrame({'person_name': ['A', 'B', 'C', 'D', 'E'],
+                           'person_national_id': ['101', '102', '1x3', '104', '105']})
+        job_id = self.upload(df).json()['job_id']
+        jobs.run_job(job_id)
+
+        status = self.client.get(f'/api/import-jobs/{job_id}/').json()
+        self.assertEqual(status['status'], 'done')
+        self.assertEqual((status['rows_processed'], status['rows_created'], status['rows_failed']), (5, 4, 1))
+        self.assertEqual(status['errors'], [{'row': 4, 'error': 'National ID must contain only digits.'}])
+        self.assertGreater(status['throughput'], 0)
+        self.assertIsNone(jobs.run_job(job_id))
+
+    def test_csv_uploads_are_imported(self):
+        upload = SimpleUploadedFile('people.csv', b'person_name,person_national_id\nA,0101\nB,0102\n')
+        job_id = self.client.post('/admin/payments/person/upload-excel/', {'file': upload},
+                                  HTTP_X_REQUESTED_WITH='XMLHttpRequest').json()['job_id']
+        self.assertEqual(jobs.run_job(job_id).rows_created, 2)
+        self.assertTrue(Person.objects.filter(national_id='0101').exists())
+
+    def test_dry_run_jobs_validate_without_importing(self):
+        df = pd.DataFrame({'person_name': ['A', 'B'], 'person_national_id': ['101', 'x']})
+        buffer = BytesIO()
+        df.to_excel(buffer, index=False)
+        response = self.client.post('/admin/payments/person/upload-excel/',
+                                    {'file': SimpleUploadedFile('people.xlsx', buffer.getvalue()), 'dry_run': '1'},
+                                    HTTP_X_REQUESTED_WITH='XMLHttpRequest')
+        job = jobs.run_job(response.json()['job_id'])
+        self.assertTrue(job.dry_run)
+        self.assertEqual((job.status, job.rows_created, job.rows_failed), ('done', 1, 1))
+        self.assertTrue(job.message.startswith('Dry run, nothing was saved'))
+        self.assertFalse(Person.objects.filter(national_id='101').exists())
+
+    def test_failed_jobs_keep_the_error_message(self):
+        job_id = self.upload(pd.DataFrame({'person_name': ['A']})).json()['job_id']
+        with self.assertLogs('payments.jobs', 'ERROR'):
+            jobs.run_job(job_id)
+        job = ImportJob.objects.get(id=job_id)
+        self.assertEqual(job.status, 'failed')
+        self.assertIn('Missing columns: person_national_id', job.message)
+
+
+class ChunkedReaderTests(SimpleTestCase):
+    def write(self, suffix, df):
+        handle = tempfile.NamedTemporaryFile(suffix=suffix, delete=False)
+        handle.close()
+        self.addCleanup(os.remove, handle.name)
+        if suffix == '.csv':
+            df.to_csv(handle.name, index=False)
+        else:
+            df.to_excel(handle.name, index=False)
+        return handle.name
+
+    def test_csv_and_xlsx_are_read_in_bounded_chunks(self):
+        df = pd.DataFrame({'person_name': [f'P{i}' for i in range(7)],
+                           'person_national_id': [f'00{i}' for i in range(7)]})
+        for suffix in ('.csv', '.xlsx'):
+            chunks = list(read_chunks(self.write(suffix, df), chunk_size=3))
+            self.assertEqual([len(chunk) for chunk in chunks], [3, 3, 1], suffix)
+            self.assertEqual(list(chunks[-1].index), [6], suffix)
+            self.assertEqual(chunks[0]['person_national_id'].tolist(), ['000', '001', '002'], suffix)
+
+    def test_unsupported_files_are_rejected(self):
+        with self.assertRaisesMessage(ValueError, "Unsupported file type '.txt'"):
+            list(read_chunks('payments.txt'))
+
+
+class WorkbookImportTests(PaymentFixtureMixin, TestCase):
+    def write_workbook(self, sheets):
+        handle = tempfile.NamedTemporaryFile(suffix='.xlsx', delete=False)
+        handle.close()
+        self.addCleanup(os.remove, handle.name)
+        with pd.ExcelWriter(handle.name) as writer:
+            for name, df in sheets.items():
+                df.to_excel(writer, sheet_name=name, index=False)
+        return handle.name
+
+    def sample_workbook(self):
+        return self.write_workbook({
+            'Students': pd.DataFrame({'name': ['Ann'], 'national_id': ['333'], 'person': [self.person.id]}),
+            'Persons': pd.DataFrame({'person_name': ['Bob'], 'person_national_id': ['444']}),
+            'Olympiad': pd.DataFrame({'title': ['Math']}),
+        })
+
+    def test_sheet_names_and_foreign_keys_define_the_load_order(self):
+        self.assertIs(workbook.model_for_sheet('Payment Agreements'), PaymentAgreement)
+        self.assertIs(workbook.model_for_sheet('student_agreement'), StudentAgreement)
+        self.assertIsNone(workbook.model_for_sheet('Notes'))
+
+        graph = workbook.dependencies({Person, Student, Course, StudentAgreement, PaymentAgreement, Installment})
+        self.assertEqual(graph[Student], {Person})
+        self.assertEqual(graph[Installment], {PaymentAgreement})
+        order = workbook.topological_order(graph)
+        for parent, child in ((Person, Student), (Student, StudentAgreement), (Course, StudentAgreement),
+                              (StudentAgreement, PaymentAgreement), (PaymentAgreement, Installment)):
+            self.assertLess(order.index(parent), order.index(child))
+
+    def test_independent_sheets_run_concurrently_and_children_wait(self):
+        barrier = threading.Barrier(2, timeout=5)
+        finished = []
+
+        def import_sheet(sheet, model):
+            if model in (Person, Olympiad):
+                # Only passes if both root sheets are running at the same time.
+                barrier.wait()
+            else:
+                self.assertIn(Person, finished)
+            finished.append(model)
+            return ImportResult()
+
+        loader = workbook.WorkbookLoader(self.sample_workbook(), max_workers=2, import_sheet=import_sheet)
+        loader.run()
+        self.assertLess(finished.index(Person), finished.index(Student))
+        self.assertEqual({outcome['status'] for outcome in loader.sheet_results.values()}, {'done'})
+
+    def test_failed_sheets_skip_their_dependents(self):
+        def import_sheet(sheet, model):
+            if model is Person:
+                raise ValueError('Missing columns: person_name')
+            return ImportResult()
+
+        loader = workbook.WorkbookLoader(self.sample_workbook(), import_sheet=import_sheet)
+        result = loader.run()
+        self.assertEqual(loader.sheet_results['Persons']['status'], 'failed')
+        self.assertEqual(loader.sheet_results['Students'],
+                         {'status': 'skipped', 'error': 'Depends on failed sheet(s): Person'})
+        self.assertEqual(loader.sheet_results['Olympiad']['status'], 'done')
+        self.assertEqual(sorted(loader.failed_sheets), ['Persons', 'Students'])
+        self.assertEqual(len(result.errors), 2)
+
+    def test_each_sheet_is_imported_into_its_model(self):
+        loader = workbook.WorkbookLoader(self.sample_workbook())
+        sheets = loader.plan()
+        for model in workbook.topological_order(workbook.dependencies(set(sheets.values()))):
+            sheet = next(name for name, target in sheets.items() if target is model)
+            loader.import_rows(sheet, model)
+        self.assertEqual(loader.result.created, 3)
+        self.assertTrue(Person.objects.filter(name='Bob').exists())
+        self.assertEqual(Student.objects.get(national_id='333').person, self.person)
+        self.assertTrue(Olympiad.objects.filter(title='Math').exists())
+
+    def test_unknown_sheets_are_rejected(self):
+        path = self.write_workbook({'Notes': pd.DataFrame({'text': ['x']})})
+        with self.assertRaisesMessage(ValueError, "Sheet 'Notes' does not match any model"):
+            workbook.WorkbookLoader(path).run()
+
+
+class SyntheticDatasetTests(TestCase):
+    def test_generates_a_linked_dataset_with_rollups(self):
+        counts = SyntheticDataset(500, seed=1, batch_size=200, end=date(2024, 6, 1)).run()
+        self.assertEqual(counts['payment'], 500)
+        self.assertEqual(Payment.objects.count(), 500)
+        self.assertEqual(Person.objects.count(), 50)
+        self.assertEqual(Student.objects.count() + Teacher.objects.count(), 50)
+        self.assertEqual(Installment.objects.count(), 3 * PaymentAgreement.objects.count())
+        self.assertFalse(Payment.objects.filter(datetime__gte=datetime(2024, 6, 1, tzinfo=dt_timezone.utc)).exists())
+        self.assertEqual(sum(PaymentRollup.objects.filter(granularity='year').values_list('count', flat=True)), 500)
+
+    def test_same_seed_gives_the_same_payments_and_reruns_add_rows(self):
+        def payments():
+            return list(Payment.objects.order_by('pk').values_list('name', 'amount', 'datetime'))
+
+        SyntheticDataset(100, seed=3, end=date(2024, 6, 1)).run()
+        first = payments()
+        call_command('generate_payments', payments=100, seed=3, stdout=StringIO())
+        self.assertEqual(Payment.objects.count(), 200)
+        self.assertEqual(Person.objects.count(), 40)
+        SyntheticDataset(100, seed=3, end=date(2024, 6, 1)).run()
+        self.assertEqual(first, payments()[200:])
+
+    def test_benchmark_routes_get_arguments_from_the_data(self):
+        SyntheticDataset(100).run()
+        routes = {name: (kwargs, query) for name, kwargs, query in benchmark.timed_routes()}
+        self.assertEqual(routes['api_payment_detail'][0], {'payment_id': Payment.objects.order_by('pk')[0].pk})
+        self.assertIn('q', routes['api_search'][1])
+        self.assertNotIn('api_import_job', routes)
+        self.assertNotIn('login', routes)
+
+    @override_settings(PAYMENTS_PARALLEL_QUERIES=False)
+    def test_benchmark_counts_the_queries_of_each_route(self):
+        SyntheticDataset(100).run()
+        endpoints = benchmark.Benchmark([100], repeat=1).time_endpoints()
+        self.client.force_login(User.objects.get(username='benchmark'))
+        # The export streams its body, so it is only logged once the body has been read.
+        for name in ('api_payments', 'api_payment_export'):
+            cache.clear()
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.get(endpoints[name]['url'])
+                if response.streaming:
+                    b''.join(response.streaming_content)
+            self.assertEqual(endpoints[name]['status'], 200)
+            self.assertEqual(endpoints[name]['queries'], len(queries), name)
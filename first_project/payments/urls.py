@@ -21,13 +21,30 @@ urlpatterns = [
     path('course-detail/<int:course_id>/', views.course_detail_page, name='course_detail'),
     path('product-detail/<int:product_id>/', views.product_detail_page, name='product_detail'),
     path('bank-account-detail/<int:bank_account_id>/', views.bank_account_detail_page, name='bank_account_detail'),
+    path('api/student-detail/<int:student_id>/', views.api_student_detail, name='api_student_detail'),
+    path('api/teacher-detail/<int:teacher_id>/', views.api_teacher_detail, name='api_teacher_detail'),
+    path('api/course-detail/<int:course_id>/', views.api_course_detail, name='api_course_detail'),
+    path('api/product-detail/<int:product_id>/', views.api_product_detail, name='api_product_detail'),
+    path('api/bank-account-detail/<int:bank_account_id>/', views.api_bank_account_detail,
+         name='api_bank_account_detail'),
     path('payments/', views.payment_list, name='payment_list'),
     path('payment-detail/<int:payment_id>/', views.payment_detail, name='payment_detail'),
     path('api/payments/', views.api_payments, name='api_payments'),
+    path('api/payments/export/', views.api_payment_export, name='api_payment_export'),
+    path('api/payments/rollup/', views.api_payment_rollup, name='api_payment_rollup'),
+    path('api/payments/changes/', views.api_payment_changes, name='api_payment_changes'),
+    path('api/events/', views.api_events, name='api_events'),
+    path('api/search/', views.api_search, name='api_search'),
+    path('api/metrics/requests/', views.api_request_metrics, name='api_request_metrics'),
+    path('metrics', views.metrics_view, name='metrics'),
+    path('api/dashboard/summary/', views.api_dashboard_summary, name='api_dashboard_summary'),
+    path('api/payment-detail/', views.api_payment_detail, name='api_payment_details'),
     path('api/payment-detail/<int:payment_id>/', views.api_payment_detail, name='api_payment_detail'),
     path('installments/', views.installment_list, name='installment_list'),
     path('api/installments/', views.api_installments, name='api_installments'),
     path('installment-detail/<int:installment_id>/', views.installment_detail_page, name='installment_detail'),
+    path('api/installment-detail/', views.api_installment_detail, name='api_installment_details'),
     path('api/installment-detail/<int:installment_id>/', views.api_installment_detail, name='api_installment_detail'),
+    path('api/import-jobs/<int:job_id>/', views.api_import_job, name='api_import_job'),
     path('admin/upload-excel/', ExcelUploadAdmin.upload_excel, name='upload_excel'),
 ]
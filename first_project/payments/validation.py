@@ -0,0 +1,161 @@
+from collections import defaultdict
+from decimal import Decimal
+
+import pandas as pd
+from django.db import models
+
+from . import lookups
+from .importers import (
+    IMPORT_SPECS, LOOKUP_CHUNK_SIZE, ImportResult, decimal_rules, existing_keys, existing_unique_values, sheet_row
+)
+from .models import Person, BankAccount, Student, Teacher
+
+# The digit-only rules enforced row by row in ``Model.clean()``.
+DIGIT_FIELDS = {
+    Person: {'national_id': 'National ID must contain only digits.'},
+    BankAccount: {'bank_number': 'Bank number must contain only digits.'},
+    Student: {'national_id': 'National ID must contain only digits.'},
+    Teacher: {'national_id': 'National ID must contain only digits.'},
+}
+
+
+def as_text(series):
+    # Excel hands back ``111.0`` for a numeric id cell; the importer stores it as ``'111'``.
+    return series.astype('string').str.strip().str.replace(r'^(-?\d+)\.0+$', r'\1', regex=True)
+
+
+def existing_pks(model, ids):
+    if model in lookups.DIMENSIONS:
+        return lookups.ids(model)
+    found = set()
+    ids = sorted(ids)
+    for start in range(0, len(ids), LOOKUP_CHUNK_SIZE):
+        found.update(model.objects.filter(pk__in=ids[start:start + LOOKUP_CHUNK_SIZE]).values_list('pk', flat=True))
+    return found
+
+
+class DataFrameValidator:
+    """Check a sheet against the rules ``BulkImporter`` applies, without writing anything.
+
+    Every rule is a pandas operation over whole columns plus at most one query per column, so a dry
+    run over a large file costs a fraction of a real import. The returned ``ImportResult`` counts the
+    rows that would be created (``created``) or skipped as already present (``skipped``). Validate the
+    chunks of one file with the same instance so duplicates are caught across chunk boundaries.
+    """
+
+    def __init__(self, model):
+        if model not in IMPORT_SPECS:
+            raise ValueError(f'Excel import is not supported for {model.__name__}')
+        self.spec = IMPORT_SPECS[model]
+        self.seen_keys = set()
+        self.seen_unique = defaultdict(set)
+
+    def check_columns(self, df):
+        missing = [column for field, column in self.spec.columns.items()
+                   if column not in df.columns and field in self.spec.required]
+        if missing:
+            raise ValueError(f"Missing columns: {', '.join(missing)}")
+
+    def normalize(self, field, series):
+        """Return ``(values, invalid)``: the column as Python values (``None`` when blank) and a mask of bad cells."""
+        present = series.notna()
+        if field.is_relation or isinstance(field, (models.IntegerField, models.DecimalField)):
+            numbers = pd.to_numeric(series, errors='coerce')
+            invalid = present & numbers.isna()
+            if isinstance(field, models.DecimalField):
+                values = numbers.map(lambda number: None if pd.isna(number) else Decimal(str(number)))
+            else:
+                invalid |= present & numbers.notna() & (numbers % 1 != 0)
+                values = numbers.map(lambda number: None if pd.isna(number) else int(number))
+        elif isinstance(field, (models.DateField, models.DateTimeField)):
+            stamps = pd.to_datetime(series, errors='coerce')
+            invalid = present & stamps.isna()
+            if isinstance(field, models.DateTimeField):
+                values = stamps.map(lambda stamp: None if pd.isna(stamp) else stamp.to_pydatetime())
+            else:
+                values = stamps.map(lambda stamp: None if pd.isna(stamp) else stamp.date())
+        else:
+            text = as_text(series)
+            invalid = pd.Series(False, index=series.index)
+            if field.choices:
+                invalid = present & ~text.isin([str(choice) for choice, _ in field.flatchoices])
+            values = text.astype(object).where(present, None)
+        return values.astype(object).where(present & ~invalid, None), invalid
+
+    def validate(self, df):
+        self.check_columns(df)
+        df = df.dropna(how='all')
+        result = ImportResult()
+        if df.empty:
+            return result
+        problems = defaultdict(list)
+
+        def flag(mask, message):
+            for index in df.index[mask.to_numpy(dtype=bool, na_value=False)]:
+                problems[index].append(message(index) if callable(message) else message)
+
+        values = {}
+        for name, column in self.spec.columns.items():
+            field = self.spec.field(name)
+            if column not in df.columns:
+                values[name] = pd.Series(None, index=df.index, dtype=object)
+                continue
+            series = df[column]
+            values[name], invalid = self.normalize(field, series)
+            flag(invalid, lambda index, column=column, series=series: f'{column}: invalid value {series[index]!r}')
+
+            if name in self.spec.required and name not in self.spec.defaults:
+                flag(series.isna(), f'{column} is required')
+
+            if field.is_relation:
+                ids = values[name]
+                known = existing_pks(field.related_model, set(ids.dropna()))
+                flag(ids.notna() & ~ids.isin(list(known)),
+                     lambda index, column=column, ids=ids, field=field:
+                     f'{column}: {field.related_model.__name__} {ids[index]} does not exist')
+
+            if isinstance(field, models.DecimalField):
+                numbers = pd.to_numeric(series, errors='coerce')
+                for test, message in decimal_rules(field, column):
+                    flag(test(numbers), message)
+
+            rule = DIGIT_FIELDS.get(self.spec.model, {}).get(name)
+            if rule:
+                flag(series.notna() & ~as_text(series).str.fullmatch(r'\d+').fillna(False), rule)
+
+        if 'student_agreement' in values and 'teacher_agreement' in values:
+            flag(values['student_agreement'].isna() & values['teacher_agreement'].isna(),
+                 'student_agreement or teacher_agreement is required')
+
+        # Like BulkImporter, only rows without errors take part in the duplicate checks. Rows that repeat an
+        # existing row (or an earlier row) are skipped, not errors.
+        keys = pd.Series(list(zip(*(values[name] for name in self.spec.lookup))), index=df.index)
+        clean_keys = keys[~df.index.isin(list(problems))]
+        in_db = existing_keys(self.spec, set(clean_keys)) if len(clean_keys) else set()
+        repeated = (clean_keys.duplicated() | clean_keys.isin(list(self.seen_keys | in_db))).to_numpy()
+        skip = df.index.isin(clean_keys.index[repeated])
+        self.seen_keys.update(clean_keys[~repeated])
+
+        pending = ~df.index.isin(list(problems)) & ~skip
+        for name in self.spec.columns:
+            field = self.spec.field(name)
+            if not field.unique or field.primary_key:
+                continue
+            candidates = values[name][pending].dropna()
+            taken = existing_unique_values(self.spec, field.attname, set(candidates)) | self.seen_unique[name]
+            collides = (candidates.isin(list(taken)) | candidates.duplicated()).to_numpy()
+            colliding = df.index.isin(candidates.index[collides])
+            flag(pd.Series(colliding, index=df.index),
+                 lambda index, field=field, name=name: f'{field.attname} {values[name][index]} already exists')
+            self.seen_unique[name].update(candidates[~collides])
+            pending &= ~colliding
+
+        for index in sorted(problems):
+            result.add_error(sheet_row(index), '; '.join(problems[index]))
+        result.skipped = int((skip & ~df.index.isin(list(problems))).sum())
+        result.created = len(df) - result.skipped - result.failed
+        return result
+
+
+def validate_dataframe(model, df):
+    return DataFrameValidator(model).validate(df)
@@ -1,16 +1,108 @@
-from django.shortcuts import render, redirect, get_object_or_404
-from django.http import JsonResponse
+import asyncio
+import hmac
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.shortcuts import aget_object_or_404, render, redirect, get_object_or_404
+from django.http import Http404, HttpResponse, StreamingHttpResponse
 from django.contrib.auth.decorators import login_required, user_passes_test
 from django.contrib.auth import authenticate, login, logout
 from django.views.decorators.csrf import csrf_protect
+from django.db.models import F, Window
+from django.db.models.functions import RowNumber
+from django.utils import timezone
+from . import aggregation, changes, columnar, events, exports, fieldsets, filters, instrumentation, jobs, lookups, \
+    metrics, parallel, rollups, search, streaming
+from .caching import PAYMENT_TABLES, cached_response
+from .instrumentation import JsonResponse
+from .pagination import MAX_PAGE_SIZE, CursorError, keyset_page, page_size
 from .models import Payment, PaymentCategory, Course, Product, Student, Teacher, \
-    BankAccount, Installment
+    BankAccount, Installment, ImportJob, Olympiad, InstallmentStatus, Person
+
+
+PAYMENT_LIST_FIELDS = ('id', 'name', 'amount', 'datetime', 'status__title', 'payment_method__title',
+                       'category__name', 'payment_type__title', 'related_person__name',
+                       'related_bank_account__name')
+# Repeating string columns sent as codes plus a lookup table with ``?layout=columns``.
+PAYMENT_LIST_DICTIONARY = ('status__title', 'payment_method__title', 'category__name', 'payment_type__title',
+                           'related_person__name', 'related_bank_account__name')
+RECENT_PAYMENT_FIELDS = ('id', 'name', 'amount', 'datetime', 'payment_type__title')
+PERIOD_FIELDS = ('bucket', 'incoming', 'outgoing', 'other', 'count')
+# Columns of each list in the dashboard summary; grouped lists hold each label once, so only ``recent``
+# has a dictionary.
+SUMMARY_COLUMNS = {
+    'by_payment_type': (('payment_type_id', 'payment_type__title', 'total', 'count'), ()),
+    'by_category': (('category_id', 'category__name', 'total', 'count'), ()),
+    'by_person': (('related_person_id', 'related_person__name', 'total', 'count'), ()),
+    'by_period': (PERIOD_FIELDS, ()),
+    'recent': (RECENT_PAYMENT_FIELDS, ('payment_type__title',)),
+}
+INSTALLMENT_FIELDS = ('id', 'amount', 'due_date', 'received_date', 'status__title', 'payment_agreement__id')
+# Fields of the payment and installment detail APIs, by output name.
+PAYMENT_DETAIL = fieldsets.Fieldset({
+    'name': 'name',
+    'amount': 'amount',
+    'datetime': 'datetime',
+    'status': 'status__title',
+    'payment_method': 'payment_method__title',
+    'category': 'category__name',
+    'payment_type': 'payment_type__title',
+    'related_person': 'related_person__name',
+    'related_bank_account': 'related_bank_account__name',
+    'info_text': 'info_text',
+}, formatters={'datetime': fieldsets.format_datetime})
+INSTALLMENT_DETAIL = fieldsets.Fieldset({
+    'amount': 'amount',
+    'due_date': 'due_date',
+    'received_date': 'received_date',
+    'status': 'status__title',
+    'payment_agreement_id': 'payment_agreement_id',
+}, formatters={'due_date': fieldsets.format_datetime, 'received_date': fieldsets.format_datetime})
+MAX_DETAIL_IDS = MAX_PAGE_SIZE
+PAYMENT_EXPORT_HEADER = ('ID', 'Name', 'Amount', 'Date', 'Status', 'Payment method', 'Category', 'Payment type',
+                         'Person', 'Bank account')
+# Payment fields of the person and bank account APIs. Dimension labels (status__title, ...) are filled in
+# from ``lookups`` instead of joined.
+PERSON_PAYMENT_FIELDS = ('name', 'amount', 'datetime', 'status__title', 'payment_method__title', 'category__name',
+                         'payment_type__title', 'related_bank_account__name')
+ACCOUNT_PAYMENT_FIELDS = ('name', 'amount', 'datetime', 'status__title', 'payment_method__title', 'category__name',
+                          'payment_type__title', 'related_person__name')
+PAYMENT_SORT_FIELDS = ('datetime', 'amount', 'name')
 
 
 def is_staff_or_superuser(user):
     return user.is_staff or user.is_superuser
 
 
+async def detail_response(request, queryset, fieldset, pk=None):
+    """One record for ``pk``, or ``{'results': [...], 'missing': [...]}`` for ``?ids=1,2,3``.
+
+    Either way ``?fields=`` limits the fields returned and the records are read with a single query.
+    """
+    try:
+        names = fieldset.select(request.GET.get('fields'))
+        ids = [pk] if pk is not None else filters.parse_ids(request.GET.get('ids', ''), 'ids')
+    except (fieldsets.FieldsetError, filters.FilterError) as e:
+        return JsonResponse({'error': str(e)}, status=400)
+    ids = list(dict.fromkeys(ids))
+    if not ids:
+        return JsonResponse({'error': 'ids is required'}, status=400)
+    if len(ids) > MAX_DETAIL_IDS:
+        return JsonResponse({'error': f'At most {MAX_DETAIL_IDS} ids per request'}, status=400)
+
+    rows = await parallel.evaluate(fieldset.rows(queryset.filter(pk__in=ids), names))
+    if pk is not None:
+        if not rows:
+            raise Http404(f'No {queryset.model._meta.verbose_name} matches the given query.')
+        return JsonResponse(rows[0])
+    found = {row['id']: row for row in rows}
+    return JsonResponse({
+        'results': [found[i] for i in ids if i in found],
+        'missing': [i for i in ids if i not in found],
+    })
+
+
 @login_required
 @user_passes_test(is_staff_or_superuser, login_url='login')
 def dashboard_view(request):
@@ -77,9 +169,10 @@ def student_list(request):
 
 @login_required
 @user_passes_test(is_staff_or_superuser, login_url='login')
+@cached_response(Student)
 def api_students(request):
     students = Student.objects.all().values('name', 'national_id', 'id')
-    return JsonResponse(list(students), safe=False)
+    return streaming.stream_queryset(students, streaming.requested_format(request))
 
 
 @login_required
@@ -90,9 +183,10 @@ def teacher_list(request):
 
 @login_required
 @user_passes_test(is_staff_or_superuser, login_url='login')
+@cached_response(Teacher)
 def api_teachers(request):
     teachers = Teacher.objects.all().values('name', 'national_id', 'id')
-    return JsonResponse(list(teachers), safe=False)
+    return streaming.stream_queryset(teachers, streaming.requested_format(request))
 
 
 @login_required
@@ -109,9 +203,10 @@ def product_list(request):
 
 @login_required
 @user_passes_test(is_staff_or_superuser, login_url='login')
+@cached_response(Product, Teacher)
 def api_products(request):
     products = Product.objects.all().values('title', 'amount', 'teacher__name', 'id')
-    return JsonResponse(list(products), safe=False)
+    return streaming.stream_queryset(products, streaming.requested_format(request))
 
 
 @login_required
@@ -122,17 +217,181 @@ def course_list(request):
 
 @login_required
 @user_passes_test(is_staff_or_superuser, login_url='login')
+@cached_response(Course, Teacher, Olympiad)
 def api_courses(request):
     courses = Course.objects.all().values('title', 'session_time', 'start_date', 'end_date', 'teacher__name',
                                           'olympiad__title', 'id')
-    return JsonResponse(list(courses), safe=False)
+    return streaming.stream_queryset(courses, streaming.requested_format(request))
+
+
+@login_required
+@user_passes_test(is_staff_or_superuser, login_url='login')
+@cached_response(*PAYMENT_TABLES)
+def api_dashboard_summary(request):
+    scale = request.GET.get('scale', 'week').lower()
+    if scale not in aggregation.SCALES:
+        return JsonResponse({'error': f'Unknown scale: {scale}'}, status=400)
+
+    try:
+        payments = filters.filter_payments(Payment.objects.all(), request.GET)
+        top_people = int(request.GET.get('top', 5))
+        recent = int(request.GET.get('recent', 20))
+        layout = columnar.requested_layout(request)
+    except (filters.FilterError, columnar.LayoutError) as e:
+        return JsonResponse({'error': str(e)}, status=400)
+    except ValueError:
+        return JsonResponse({'error': 'top and recent must be integers'}, status=400)
+
+    # Unfiltered bucket totals come straight from the rollup table instead of scanning payments.
+    by_period = None if filters.has_payment_filters(request.GET) else rollups.series(scale)
+    summary = aggregation.dashboard_summary(payments, scale=scale, top_people=top_people, by_period=by_period)
+    summary['recent'] = list(lookups.labelled_values(
+        payments.order_by('-datetime', '-id')[:max(recent, 0)], RECENT_PAYMENT_FIELDS,
+    ))
+    if layout == columnar.COLUMNS:
+        for key, (fields, dictionary) in SUMMARY_COLUMNS.items():
+            summary[key] = columnar.encode(summary[key], fields, dictionary)
+    return JsonResponse(summary)
+
+
+@login_required
+@user_passes_test(is_staff_or_superuser, login_url='login')
+@cached_response(*PAYMENT_TABLES)
+def api_payment_rollup(request):
+    scale = request.GET.get('scale', 'week').lower()
+    if scale not in rollups.GRANULARITIES:
+        return JsonResponse({'error': f'Unknown scale: {scale}'}, status=400)
+
+    params = request.GET
+    try:
+        layout = columnar.requested_layout(request)
+        buckets = rollups.series(
+            scale,
+            start=filters.parse_day(params['from'], 'from') if params.get('from') else None,
+            end=filters.parse_day(params['to'], 'to') if params.get('to') else None,
+            payment_types=filters.parse_ids(params.get('payment_type', ''), 'payment_type'),
+            categories=filters.parse_ids(params.get('category', ''), 'category'),
+        )
+    except (filters.FilterError, columnar.LayoutError) as e:
+        return JsonResponse({'error': str(e)}, status=400)
+    if layout == columnar.COLUMNS:
+        buckets = columnar.encode(buckets, PERIOD_FIELDS)
+    return JsonResponse({'scale': scale, 'buckets': buckets})
+
+
+@login_required
+@user_passes_test(is_staff_or_superuser, login_url='login')
+def api_payment_changes(request):
+    """Payments and installments inserted, updated or deleted after ``?since=<token>``.
+
+    Without ``since`` only the current token is returned: take it, load the full lists, then poll with it.
+    Keep polling with ``next`` while ``more`` is true. A token older than the pruned log answers 410.
+    """
+    if 'since' not in request.GET:
+        return JsonResponse({'next': changes.current_token()})
+    try:
+        since = changes.parse_token(request.GET['since'])
+        limit = min(int(request.GET.get('limit', changes.DEFAULT_LIMIT)), changes.MAX_LIMIT)
+    except changes.TokenError as e:
+        return JsonResponse({'error': str(e)}, status=400)
+    except ValueError:
+        return JsonResponse({'error': 'limit must be an integer'}, status=400)
+    if limit < 1:
+        return JsonResponse({'error': 'limit must be positive'}, status=400)
+    try:
+        return JsonResponse(changes.changes_since(since, limit))
+    except changes.TokenExpired as e:
+        return JsonResponse({'error': str(e)}, status=410)
+
+
+@login_required
+@user_passes_test(is_staff_or_superuser, login_url='login')
+@cached_response(Payment, Person, Student, Teacher, Course)
+def api_search(request):
+    """Full-text search: ``?q=`` words (prefix matches, all required), optional ``type=payment,course``.
+
+    Hits are ranked best first; page with ``limit`` and ``offset``.
+    """
+    try:
+        limit = page_size(request.GET.get('limit'))
+        offset = max(int(request.GET.get('offset') or 0), 0)
+        kinds = search.parse_kinds(request.GET.get('type'))
+        hits, more = search.search(request.GET.get('q'), kinds, limit, offset)
+    except (search.SearchError, CursorError) as e:
+        return JsonResponse({'error': str(e)}, status=400)
+    except ValueError:
+        return JsonResponse({'error': 'offset must be an integer'}, status=400)
+    return JsonResponse({'results': hits, 'next_offset': offset + limit if more else None})
+
+
+@login_required
+@user_passes_test(is_staff_or_superuser, login_url='login')
+def api_request_metrics(request):
+    """Timings of the most recent requests in this process and a per-view summary of them.
+
+    ``?view=<url name>`` narrows ``recent`` to one view; ``?limit=`` caps it (default 50).
+    """
+    try:
+        limit = page_size(request.GET.get('limit'))
+    except CursorError as e:
+        return JsonResponse({'error': str(e)}, status=400)
+    log = instrumentation.request_log
+    return JsonResponse({
+        'by_view': log.summary(),
+        'recent': log.recent(view=request.GET.get('view'), limit=limit),
+    })
+
+
+def metrics_view(request):
+    """Prometheus scrape endpoint. Open to staff sessions, or to ``Authorization: Bearer <token>`` when
+    ``PAYMENTS_METRICS_TOKEN`` is set.
+    """
+    token = getattr(settings, 'PAYMENTS_METRICS_TOKEN', None)
+    authorization = request.headers.get('Authorization', '')
+    allowed = is_staff_or_superuser(request.user) or (
+        bool(token) and hmac.compare_digest(authorization.encode(), f'Bearer {token}'.encode())
+    )
+    if not allowed:
+        return HttpResponse('Forbidden', status=403, content_type='text/plain')
+    body, content_type = metrics.exposition()
+    return HttpResponse(body, content_type=content_type)
 
 
 @login_required
 @user_passes_test(is_staff_or_superuser, login_url='login')
-def api_payments(request):
-    payments = Payment.objects.all().values('name', 'amount', 'id')
-    return JsonResponse(list(payments), safe=False)
+async def api_events(request):
+    """Server-Sent Events: ``change`` events for payment/installment writes and coalesced ``totals``.
+
+    Needs the ASGI entry point (``first_project.asgi``); a WSGI worker would hold the stream forever.
+    """
+    if not isinstance(request, ASGIRequest):
+        return JsonResponse({'error': 'Live updates are only served by the ASGI application'}, status=501)
+
+    keepalive = getattr(settings, 'PAYMENTS_EVENTS_KEEPALIVE', 15)
+
+    async def stream():
+        queue = events.broadcaster.subscribe()
+        try:
+            yield 'retry: 5000\n\n'
+            yield events.format_event({
+                'type': 'hello',
+                'token': await sync_to_async(changes.current_token)(),
+                'totals': await sync_to_async(events.current_totals)(),
+            })
+            while True:
+                try:
+                    event = await asyncio.wait_for(queue.get(), timeout=keepalive)
+                except asyncio.TimeoutError:
+                    yield ': keepalive\n\n'
+                    continue
+                yield events.format_event(event)
+        finally:
+            events.broadcaster.unsubscribe(queue)
+
+    response = StreamingHttpResponse(stream(), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'
+    return response
 
 
 @csrf_protect
@@ -176,51 +435,46 @@ def logout_view(request):
 
 @login_required
 @user_passes_test(is_staff_or_superuser, login_url='login')
-def api_student_detail(request, student_id):
-    student = get_object_or_404(Student, id=student_id)
-
-    person = student.person
-
-    payments = Payment.objects.filter(related_person=person).values(
-        'name', 'amount', 'datetime', 'status__title',
-        'payment_method__title', 'category__name',
-        'payment_type__title', 'related_bank_account__name'
-    )
+@cached_response(Student, *PAYMENT_TABLES)
+async def api_student_detail(request, student_id):
+    student = await aget_object_or_404(Student, id=student_id)
+    payments = await parallel.evaluate(lookups.labelled_values(
+        Payment.objects.filter(related_person_id=student.person_id), PERSON_PAYMENT_FIELDS
+    ))
 
     student_data = {
         'name': student.name,
         'national_id': student.national_id,
-        'payments': list(payments)
+        'payments': payments
     }
     return JsonResponse(student_data, safe=False)
 
 
 @login_required
 @user_passes_test(is_staff_or_superuser, login_url='login')
-def api_teacher_detail(request, teacher_id):
-    teacher = get_object_or_404(Teacher, id=teacher_id)
-
-    person = teacher.person
+@cached_response(Teacher, Course, Olympiad, Product, *PAYMENT_TABLES)
+async def api_teacher_detail(request, teacher_id):
+    teacher = await aget_object_or_404(Teacher, id=teacher_id)
 
-    payments = Payment.objects.filter(related_person=person).values(
-        'name', 'amount', 'datetime', 'status__title',
-        'payment_method__title', 'category__name',
-        'payment_type__title', 'related_bank_account__name'
-    )
-
-    courses = Course.objects.filter(teacher=teacher).values(
-        'title', 'session_time', 'start_date', 'end_date', 'olympiad__title'
-    )
-    products = Product.objects.filter(teacher=teacher).values(
-        'title', 'amount', 'description'
+    # The three lists are independent, so fetch them at the same time.
+    payments, courses, products = await asyncio.gather(
+        parallel.evaluate(lookups.labelled_values(
+            Payment.objects.filter(related_person_id=teacher.person_id), PERSON_PAYMENT_FIELDS
+        )),
+        parallel.evaluate(Course.objects.filter(teacher=teacher).values(
+            'title', 'session_time', 'start_date', 'end_date', 'olympiad__title'
+        )),
+        parallel.evaluate(Product.objects.filter(teacher=teacher).values(
+            'title', 'amount', 'description'
+        )),
     )
 
     teacher_data = {
         'name': teacher.name,
         'national_id': teacher.national_id,
-        'payments': list(payments),
-        'courses': list(courses),
-        'products': list(products)
+        'payments': payments,
+        'courses': courses,
+        'products': products
     }
 
     return JsonResponse(teacher_data, safe=False)
@@ -228,9 +482,12 @@ def api_teacher_detail(request, teacher_id):
 
 @login_required
 @user_passes_test(is_staff_or_superuser, login_url='login')
-def api_course_detail(request, course_id):
-    course = get_object_or_404(Course, id=course_id)
-    products = Product.objects.filter(teacher=course.teacher).values('title', 'amount', 'description')
+@cached_response(Course, Teacher, Olympiad, Product)
+async def api_course_detail(request, course_id):
+    course = await aget_object_or_404(Course.objects.select_related('teacher', 'olympiad'), id=course_id)
+    products = await parallel.evaluate(
+        Product.objects.filter(teacher_id=course.teacher_id).values('title', 'amount', 'description')
+    )
 
     course_data = {
         'title': course.title,
@@ -239,23 +496,25 @@ def api_course_detail(request, course_id):
         'end_date': course.end_date,
         'teacher': course.teacher.name,
         'olympiad': course.olympiad.title if course.olympiad else 'None',
-        'products': list(products)
+        'products': products
     }
     return JsonResponse(course_data, safe=False)
 
 
 @login_required
 @user_passes_test(is_staff_or_superuser, login_url='login')
-def api_product_detail(request, product_id):
-    product = get_object_or_404(Product, id=product_id)
-    courses = Course.objects.filter(teacher=product.teacher).values('title', 'session_time', 'start_date', 'end_date',
-                                                                    'olympiad__title')
+@cached_response(Product, Teacher, Course, Olympiad)
+async def api_product_detail(request, product_id):
+    product = await aget_object_or_404(Product.objects.select_related('teacher'), id=product_id)
+    courses = await parallel.evaluate(Course.objects.filter(teacher_id=product.teacher_id).values(
+        'title', 'session_time', 'start_date', 'end_date', 'olympiad__title'
+    ))
 
     product_data = {
         'title': product.title,
         'amount': product.amount,
         'teacher': product.teacher.name,
-        'courses': list(courses)
+        'courses': courses
     }
     return JsonResponse(product_data, safe=False)
 
@@ -277,54 +536,57 @@ def bank_account_detail_page(request, bank_account_id):
 
 @login_required
 @user_passes_test(is_staff_or_superuser, login_url='login')
+@cached_response(*PAYMENT_TABLES)
 def api_bank_accounts(request):
-    bank_accounts = BankAccount.objects.all().values('id', 'name', 'bank_number')
-    bank_accounts_list = list(bank_accounts)
-
-    # Add related payments to each bank account
-    for bank_account in bank_accounts_list:
-        payments = Payment.objects.filter(related_bank_account_id=bank_account['id']).values(
-            'name', 'amount', 'datetime', 'status__title',
-            'payment_method__title', 'category__name',
-            'payment_type__title', 'related_person__name'
+    try:
+        payments_limit = request.GET.get('payments_limit')
+        payments_limit = max(int(payments_limit), 0) if payments_limit else None
+    except ValueError:
+        return JsonResponse({'error': 'payments_limit must be an integer'}, status=400)
+
+    bank_accounts = BankAccount.objects.annotate(**aggregation.direction_sums('payments__')).values(
+        'id', 'name', 'bank_number', 'count', 'incoming', 'outgoing', 'other'
+    ).order_by('id')
+    bank_accounts_list = [{
+        'id': account['id'],
+        'name': account['name'],
+        'bank_number': account['bank_number'],
+        'summary': {key: account[key] for key in ('count', 'incoming', 'outgoing', 'other')},
+        'payments': [],
+    } for account in bank_accounts]
+
+    # Fetch the related payments of every account in one query, newest first, and group them in Python.
+    if payments_limit != 0:
+        payments = Payment.objects.filter(related_bank_account__isnull=False)
+        if payments_limit:
+            payments = payments.annotate(row_number=Window(
+                RowNumber(),
+                partition_by=F('related_bank_account_id'),
+                order_by=[F('datetime').desc(), F('id').desc()],
+            )).filter(row_number__lte=payments_limit)
+        payments = lookups.labelled_values(
+            payments.order_by('related_bank_account_id', '-datetime', '-id'),
+            ('related_bank_account_id',) + ACCOUNT_PAYMENT_FIELDS,
         )
-        bank_account['payments'] = list(payments)
+        by_account = {account['id']: account['payments'] for account in bank_accounts_list}
+        for payment in payments:
+            by_account[payment.pop('related_bank_account_id')].append(payment)
 
     return JsonResponse(bank_accounts_list, safe=False)
 
 
 @login_required
 @user_passes_test(is_staff_or_superuser, login_url='login')
-def api_payment_detail(request, payment_id):
-    payment = get_object_or_404(Payment, id=payment_id)
-
-    payment_data = {
-        'name': payment.name,
-        'amount': payment.amount,
-        'datetime': payment.datetime,
-        'status': payment.status.title,
-        'payment_method': payment.payment_method.title,
-        'category': payment.category.name,
-        'payment_type': payment.payment_type.title,
-        'related_person': payment.related_person.name,
-        'related_bank_account': payment.related_bank_account.name if payment.related_bank_account else None
-    }
-    return JsonResponse(payment_data, safe=False)
-
-
-@login_required
-@user_passes_test(is_staff_or_superuser, login_url='login')
-def api_bank_account_detail(request, bank_account_id):
-    bank_account = get_object_or_404(BankAccount, id=bank_account_id)
-    payments = Payment.objects.filter(related_bank_account=bank_account).values(
-        'name', 'amount', 'datetime', 'status__title',
-        'payment_method__title', 'category__name',
-        'payment_type__title', 'related_person__name'
-    )
+@cached_response(*PAYMENT_TABLES)
+async def api_bank_account_detail(request, bank_account_id):
+    bank_account = await aget_object_or_404(BankAccount, id=bank_account_id)
+    payments = await parallel.evaluate(lookups.labelled_values(
+        Payment.objects.filter(related_bank_account=bank_account), ACCOUNT_PAYMENT_FIELDS
+    ))
     data = {
         'name': bank_account.name,
         'bank_number': bank_account.bank_number,
-        'payments': list(payments)
+        'payments': payments
     }
     return JsonResponse(data, safe=False)
 
@@ -422,31 +684,58 @@ def payment_detail(request, payment_id):
 
 @login_required
 @user_passes_test(is_staff_or_superuser, login_url='login')
+@cached_response(*PAYMENT_TABLES)
 def api_payments(request):
-    payments = Payment.objects.all().values('id', 'name', 'amount', 'datetime', 'status__title',
-                                            'payment_method__title', 'category__name', 'payment_type__title',
-                                            'related_person__name', 'related_bank_account__name')
-    return JsonResponse(list(payments), safe=False)
+    sort = request.GET.get('sort', '-datetime')
+    if sort.lstrip('-') not in PAYMENT_SORT_FIELDS:
+        return JsonResponse({'error': f'Unknown sort: {sort}'}, status=400)
+    try:
+        payments = filters.filter_payments(Payment.objects.all(), request.GET)
+        fmt = streaming.requested_format(request)
+        layout = columnar.requested_layout(request)
+        if fmt and layout == columnar.COLUMNS:
+            return JsonResponse({'error': 'layout=columns is paged and cannot be combined with format'}, status=400)
+        if fmt:
+            # An explicit format asks for the whole filtered set as one stream instead of a page.
+            payments = payments.order_by(sort, '-id' if sort.startswith('-') else 'id')
+            return streaming.stream_rows(lookups.labelled_values(payments, PAYMENT_LIST_FIELDS), fmt)
+        selected, labels = lookups.split_fields(Payment, PAYMENT_LIST_FIELDS)
+        rows, next_cursor = keyset_page(
+            payments, sort,
+            cursor=request.GET.get('cursor'),
+            limit=page_size(request.GET.get('limit')),
+            fields=selected,
+        )
+    except (filters.FilterError, CursorError, columnar.LayoutError) as e:
+        return JsonResponse({'error': str(e)}, status=400)
+    results = lookups.attach_labels(rows, PAYMENT_LIST_FIELDS, labels)
+    if layout == columnar.COLUMNS:
+        return JsonResponse({**columnar.encode(results, PAYMENT_LIST_FIELDS, PAYMENT_LIST_DICTIONARY),
+                             'next': next_cursor})
+    return JsonResponse({'results': list(results), 'next': next_cursor})
 
 
 @login_required
 @user_passes_test(is_staff_or_superuser, login_url='login')
-def api_payment_detail(request, payment_id):
-    payment = get_object_or_404(Payment, id=payment_id)
-    payment_data = {
-        'id': payment.id,
-        'name': payment.name,
-        'amount': payment.amount,
-        'datetime': payment.datetime.strftime('%Y-%m-%d %H:%M:%S'),
-        'status': payment.status.title,
-        'payment_method': payment.payment_method.title,
-        'category': payment.category.name,
-        'payment_type': payment.payment_type.title,
-        'related_person': payment.related_person.name,
-        'related_bank_account': payment.related_bank_account.name if payment.related_bank_account else None,
-        'info_text': payment.info_text
-    }
-    return JsonResponse(payment_data, safe=False)
+def api_payment_export(request):
+    sort = request.GET.get('sort', '-datetime')
+    if sort.lstrip('-') not in PAYMENT_SORT_FIELDS:
+        return JsonResponse({'error': f'Unknown sort: {sort}'}, status=400)
+    try:
+        fmt = exports.requested_format(request)
+        payments = filters.filter_payments(Payment.objects.all(), request.GET)
+    except (filters.FilterError, exports.ExportError) as e:
+        return JsonResponse({'error': str(e)}, status=400)
+    payments = payments.order_by(sort, '-id' if sort.startswith('-') else 'id')
+    return exports.export_queryset(payments, PAYMENT_LIST_FIELDS, PAYMENT_EXPORT_HEADER, fmt,
+                                   f'payments-{timezone.localdate():%Y%m%d}')
+
+
+@login_required
+@user_passes_test(is_staff_or_superuser, login_url='login')
+@cached_response(*PAYMENT_TABLES)
+async def api_payment_detail(request, payment_id=None):
+    return await detail_response(request, Payment.objects.all(), PAYMENT_DETAIL, payment_id)
 
 
 @login_required
@@ -457,11 +746,17 @@ def installment_list(request):
 
 @login_required
 @user_passes_test(is_staff_or_superuser, login_url='login')
+@cached_response(Installment, InstallmentStatus)
 def api_installments(request):
-    installments = Installment.objects.all().values(
-        'id', 'amount', 'due_date', 'received_date', 'status__title', 'payment_agreement__id'
-    )
-    return JsonResponse(list(installments), safe=False)
+    try:
+        layout = columnar.requested_layout(request)
+    except columnar.LayoutError as e:
+        return JsonResponse({'error': str(e)}, status=400)
+    installments = lookups.labelled_values(Installment.objects.all(), INSTALLMENT_FIELDS)
+    if layout == columnar.COLUMNS:
+        # Columns cannot be streamed; the arrays of plain values are still far smaller than the rows.
+        return JsonResponse(columnar.encode(installments, INSTALLMENT_FIELDS, ('status__title',)))
+    return streaming.stream_rows(installments, streaming.requested_format(request))
 
 
 @login_required
@@ -475,14 +770,13 @@ def installment_detail_page(request, installment_id):
 
 @login_required
 @user_passes_test(is_staff_or_superuser, login_url='login')
-def api_installment_detail(request, installment_id):
-    installment = get_object_or_404(Installment, id=installment_id)
-    installment_data = {
-        'id': installment.id,
-        'amount': installment.amount,
-        'due_date': installment.due_date.strftime('%Y-%m-%d %H:%M:%S'),
-        'received_date': installment.received_date.strftime('%Y-%m-%d %H:%M:%S') if installment.received_date else None,
-        'status': installment.status.title if installment.status else None,
-        'payment_agreement_id': installment.payment_agreement.id,
-    }
-    return JsonResponse(installment_data, safe=False)
+@cached_response(Installment, InstallmentStatus)
+async def api_installment_detail(request, installment_id=None):
+    return await detail_response(request, Installment.objects.all(), INSTALLMENT_DETAIL, installment_id)
+
+
+@login_required
+@user_passes_test(is_staff_or_superuser, login_url='login')
+def api_import_job(request, job_id):
+    job = get_object_or_404(ImportJob, id=job_id)
+    return JsonResponse(jobs.job_status(job))
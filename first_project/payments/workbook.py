@@ -0,0 +1,149 @@
+import threading
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from django.db import connection
+
+from .importers import IMPORT_SPECS, BulkImporter, ImportResult
+from .readers import DEFAULT_CHUNK_SIZE, read_chunks, sheet_names
+
+WORKBOOK = 'workbook'
+
+
+def normalize(name):
+    return ''.join(ch for ch in name.lower() if ch.isalnum())
+
+
+def model_for_sheet(name):
+    """Match a sheet name against model names, e.g. ``Payment Agreements`` or ``paymentagreement``."""
+    key = normalize(name)
+    for model in IMPORT_SPECS:
+        opts = model._meta
+        if key in (opts.model_name, normalize(str(opts.verbose_name)), normalize(str(opts.verbose_name_plural))):
+            return model
+    return None
+
+
+def dependencies(models):
+    """Map each model to the models in ``models`` that its foreign keys point at."""
+    graph = {}
+    for model in models:
+        parents = set()
+        for field in model._meta.get_fields():
+            if field.concrete and (field.many_to_one or field.one_to_one) and field.related_model in models:
+                if field.related_model is not model:
+                    parents.add(field.related_model)
+        graph[model] = parents
+    return graph
+
+
+def topological_order(graph):
+    order = []
+    done = set()
+    remaining = dict(graph)
+    while remaining:
+        ready = sorted((model for model, parents in remaining.items() if parents <= done),
+                       key=lambda model: model.__name__)
+        if not ready:
+            cycle = ', '.join(sorted(model.__name__ for model in remaining))
+            raise ValueError(f'Circular foreign keys between sheets: {cycle}')
+        for model in ready:
+            order.append(model)
+            done.add(model)
+            del remaining[model]
+    return order
+
+
+class WorkbookLoader:
+    """Import every sheet of a workbook, each sheet into the model it is named after.
+
+    Sheets are scheduled on a thread pool as soon as the sheets for all the models they reference have
+    finished, so independent sheets (say ``Olympiad`` and ``Person``) load concurrently while
+    ``Installment`` waits for ``PaymentAgreement``. A sheet whose parent failed is not loaded.
+    """
+
+    def __init__(self, path, max_workers=4, chunk_size=DEFAULT_CHUNK_SIZE, progress=None, import_sheet=None):
+        self.path = path
+        self.max_workers = max_workers
+        self.chunk_size = chunk_size
+        self.progress = progress
+        self.import_sheet = import_sheet or self.import_rows
+        self.lock = threading.Lock()
+        self.result = ImportResult()
+        self.sheet_results = {}
+
+    def plan(self):
+        sheets = {}
+        for name in sheet_names(self.path):
+            model = model_for_sheet(name)
+            if model is None:
+                raise ValueError(f"Sheet '{name}' does not match any model")
+            if model in sheets.values():
+                raise ValueError(f"More than one sheet maps to {model.__name__}")
+            sheets[name] = model
+        return sheets
+
+    def import_rows(self, sheet, model):
+        importer = BulkImporter(model)
+        result = ImportResult()
+        for chunk in read_chunks(self.path, self.chunk_size, sheet_name=sheet):
+            chunk_result = importer.run(chunk)
+            result.merge(chunk_result)
+            self.record(sheet, chunk_result)
+        return result
+
+    def run_sheet(self, sheet, model):
+        try:
+            return self.import_sheet(sheet, model)
+        finally:
+            connection.close()
+
+    def record(self, sheet, result):
+        with self.lock:
+            self.result.merge(result, sheet=sheet)
+            if self.progress:
+                self.progress(self.result)
+
+    def run(self):
+        sheets = self.plan()
+        graph = dependencies(set(sheets.values()))
+        topological_order(graph)
+        sheet_of = {model: sheet for sheet, model in sheets.items()}
+        finished, failed = set(), set()
+        pending = dict(graph)
+
+        with ThreadPoolExecutor(max_workers=max(self.max_workers, 1), thread_name_prefix='payments-sheet') as pool:
+            running = {}
+            while pending or running:
+                for model, parents in list(pending.items()):
+                    if parents & failed:
+                        del pending[model]
+                        failed.add(model)
+                        blocked = ', '.join(sorted(parent.__name__ for parent in parents & failed))
+                        self.fail(sheet_of[model], 'skipped', f'Depends on failed sheet(s): {blocked}')
+                    elif parents <= finished:
+                        del pending[model]
+                        running[pool.submit(self.run_sheet, sheet_of[model], model)] = model
+                if not running:
+                    continue
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    model = running.pop(future)
+                    sheet = sheet_of[model]
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        failed.add(model)
+                        self.fail(sheet, 'failed', str(e))
+                    else:
+                        finished.add(model)
+                        self.sheet_results[sheet] = {'status': 'done', **result.as_dict()}
+        return self.result
+
+    def fail(self, sheet, status, message):
+        self.sheet_results[sheet] = {'status': status, 'error': message}
+        with self.lock:
+            self.result.errors.insert(0, {'sheet': sheet, 'row': None, 'error': message})
+
+    @property
+    def failed_sheets(self):
+        return [sheet for sheet, outcome in self.sheet_results.items() if outcome['status'] != 'done']